@@ -1,18 +1,26 @@
 """
 Utilitaires pour l'authentification JWT et le hashage des mots de passe
 """
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Any, Callable, Dict, Optional
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 
+from app.cache import TTLCache
 from app.config import settings
+from app.tracing import traced
 
 # Configuration du hashage des mots de passe avec bcrypt
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# Claims des tokens déjà décodés (évite de revérifier la signature à chaque requête)
+token_claims_cache = TTLCache(settings.auth_cache_ttl, max_entries=settings.auth_cache_max_entries)
+
 # Configuration OAuth2 avec le schéma Bearer Token
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
 
@@ -24,7 +32,7 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     Args:
         plain_password: Mot de passe en clair
         hashed_password: Mot de passe hashé
-        
+    
     Returns:
         True si le mot de passe correspond, False sinon
     """
@@ -37,13 +45,133 @@ def get_password_hash(password: str) -> str:
     
     Args:
         password: Mot de passe en clair
-        
+    
     Returns:
         Mot de passe hashé
     """
     return pwd_context.hash(password)
 
 
+class PasswordHashingOverloaded(Exception):
+    """Trop de hachages de mots de passe en attente (converti en 503)"""
+
+
+class PasswordHasher:
+    """
+    Exécute bcrypt sur un pool de threads dédié, hors de la boucle d'événements
+    
+    bcrypt libère le GIL pendant le calcul : les threads du pool travaillent
+    en parallèle sur plusieurs cœurs. Le nombre de calculs simultanés est
+    borné ; au-delà, les demandes attendent une place au plus `queue_timeout`
+    secondes, et sont refusées d'emblée si `max_waiting` demandes attendent déjà.
+    """
+    
+    def __init__(self, workers: int = 4, queue_timeout: float = 2.0, max_waiting: int = 64):
+        """
+        Args:
+            workers: Hachages bcrypt simultanés (threads du pool)
+            queue_timeout: Attente maximale d'une place (secondes)
+            max_waiting: Nombre maximal de demandes en attente
+        """
+        self.workers = max(1, workers)
+        self.queue_timeout = queue_timeout
+        self.max_waiting = max_waiting
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="password-hash")
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._slots_loop: Optional[asyncio.AbstractEventLoop] = None
+        
+        # Métriques
+        self._in_flight = 0
+        self._waiting = 0
+        self._completed = 0
+        self._rejected = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+    
+    def _get_slots(self) -> asyncio.Semaphore:
+        """Sémaphore propre à la boucle d'événements courante"""
+        loop = asyncio.get_running_loop()
+        if self._slots is None or self._slots_loop is not loop:
+            self._slots = asyncio.Semaphore(self.workers)
+            self._slots_loop = loop
+        return self._slots
+    
+    async def run(self, func: Callable[..., Any], *args) -> Any:
+        """
+        Exécute une fonction de hachage sur le pool
+        
+        Raises:
+            PasswordHashingOverloaded: Si aucune place ne se libère à temps
+        """
+        slots = self._get_slots()
+        if slots.locked() and self._waiting >= self.max_waiting:
+            self._rejected += 1
+            raise PasswordHashingOverloaded("File d'attente du hachage pleine")
+        
+        started = time.perf_counter()
+        self._waiting += 1
+        try:
+            await asyncio.wait_for(slots.acquire(), timeout=self.queue_timeout)
+        except asyncio.TimeoutError:
+            self._rejected += 1
+            raise PasswordHashingOverloaded("Délai d'attente du hachage dépassé")
+        finally:
+            self._waiting -= 1
+        
+        waited = time.perf_counter() - started
+        self._wait_total += waited
+        self._wait_max = max(self._wait_max, waited)
+        self._in_flight += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+        finally:
+            self._in_flight -= 1
+            self._completed += 1
+            slots.release()
+    
+    def stats(self) -> Dict[str, Any]:
+        """Retourne l'occupation du pool et les refus"""
+        return {
+            "workers": self.workers,
+            "in_flight": self._in_flight,
+            "waiting": self._waiting,
+            "completed": self._completed,
+            "rejected": self._rejected,
+            "avg_wait_ms": 1000 * self._wait_total / self._completed if self._completed else 0.0,
+            "max_wait_ms": 1000 * self._wait_max,
+        }
+
+
+# Pool global de hachage des mots de passe
+password_hasher = PasswordHasher(
+    workers=settings.password_hash_workers,
+    queue_timeout=settings.password_hash_queue_timeout,
+    max_waiting=settings.password_hash_max_waiting
+)
+
+
+@traced("password.verify")
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """
+    Vérifie un mot de passe sur le pool de hachage, sans bloquer la boucle
+    
+    Raises:
+        PasswordHashingOverloaded: Si le pool est saturé
+    """
+    return await password_hasher.run(verify_password, plain_password, hashed_password)
+
+
+@traced("password.hash")
+async def get_password_hash_async(password: str) -> str:
+    """
+    Hash un mot de passe sur le pool de hachage, sans bloquer la boucle
+    
+    Raises:
+        PasswordHashingOverloaded: Si le pool est saturé
+    """
+    return await password_hasher.run(get_password_hash, password)
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """
     Crée un token JWT
@@ -51,7 +179,7 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     Args:
         data: Données à encoder dans le token (ex: {"sub": user_email})
         expires_delta: Durée de validité du token (par défaut: 30 minutes)
-        
+    
     Returns:
         Token JWT encodé
     """
@@ -78,19 +206,29 @@ def decode_access_token(token: str) -> Optional[dict]:
     
     Args:
         token: Token JWT à décoder
-        
+    
+    Les claims d'un token valide sont mis en cache, jamais au-delà de son
+    expiration.
+    
     Returns:
         Données décodées du token ou None si invalide
     """
+    cached = token_claims_cache.get(token)
+    if cached is not None:
+        return cached
+    
     try:
         payload = jwt.decode(
             token, 
             settings.secret_key, 
             algorithms=[settings.algorithm]
         )
-        return payload
     except JWTError:
         return None
+    
+    expires_in = payload["exp"] - time.time() if "exp" in payload else settings.auth_cache_ttl
+    token_claims_cache.set(token, payload, ttl=expires_in)
+    return payload
 
 
 async def get_current_user_email(token: str = Depends(oauth2_scheme)) -> str:
@@ -99,10 +237,10 @@ async def get_current_user_email(token: str = Depends(oauth2_scheme)) -> str:
     
     Args:
         token: Token JWT
-        
+    
     Returns:
         Email de l'utilisateur
-        
+    
     Raises:
         HTTPException: Si le token est invalide
     """
@@ -130,7 +268,7 @@ async def get_optional_current_user_email(token: Optional[str] = Depends(oauth2_
     
     Args:
         token: Token JWT (optionnel)
-        
+    
     Returns:
         Email de l'utilisateur ou None
     """
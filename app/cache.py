@@ -0,0 +1,345 @@
+"""
+Cache de réponses pour les lectures publiques du catalogue
+
+Les réponses sont indexées par portée et paramètres normalisés, avec un
+TTL et un compteur de génération : toute écriture dans le catalogue
+incrémente la génération, ce qui rend obsolètes d'un coup toutes les
+entrées précédentes sans avoir à les énumérer.
+
+Le stockage est interchangeable : en mémoire par défaut, ou Redis (ou tout
+client exposant la même interface asynchrone get / set(ex=, nx=) / incr / delete).
+"""
+import hashlib
+import json
+import random
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from app.config import settings
+
+
+class CacheBackend:
+    """Interface de stockage (sous-ensemble asynchrone de l'API Redis)"""
+    
+    async def get(self, key: str) -> Optional[bytes]:
+        raise NotImplementedError
+    
+    async def set(self, key: str, value: bytes, ex: Optional[int] = None):
+        """Enregistre une valeur, expirant après `ex` secondes si fourni"""
+        raise NotImplementedError
+    
+    async def incr(self, key: str) -> int:
+        """Incrémente un compteur (créé à 0) et retourne sa nouvelle valeur"""
+        raise NotImplementedError
+    
+    async def setnx(self, key: str, value: int):
+        """Initialise un compteur s'il n'existe pas encore"""
+        raise NotImplementedError
+    
+    async def delete(self, key: str):
+        raise NotImplementedError
+    
+    async def close(self):
+        pass
+
+
+class InMemoryCacheBackend(CacheBackend):
+    """Stockage LRU en mémoire du processus, avec expiration"""
+    
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max(1, max_entries)
+        self._entries: "OrderedDict[str, Tuple[bytes, Optional[float]]]" = OrderedDict()
+        # Compteurs hors LRU : une génération ne doit jamais être évincée
+        self._counters: Dict[str, int] = {}
+        self._lock = threading.Lock()
+    
+    async def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            if key in self._counters:
+                return str(self._counters[key]).encode()
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+    
+    async def set(self, key: str, value: bytes, ex: Optional[int] = None):
+        expires_at = time.monotonic() + ex if ex else None
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    async def incr(self, key: str) -> int:
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + 1
+            return self._counters[key]
+    
+    async def setnx(self, key: str, value: int):
+        with self._lock:
+            self._counters.setdefault(key, value)
+    
+    async def delete(self, key: str):
+        with self._lock:
+            self._entries.pop(key, None)
+            self._counters.pop(key, None)
+
+
+class RedisCacheBackend(CacheBackend):
+    """Stockage Redis partagé entre les workers"""
+    
+    def __init__(self, url: str = "", client: Any = None):
+        """
+        Args:
+            url: URL Redis (ex: redis://localhost:6379/0)
+            client: Client asynchrone déjà construit (redis.asyncio ou compatible)
+        """
+        if client is None:
+            try:
+                import redis.asyncio as redis
+            except ImportError as e:
+                raise RuntimeError(
+                    "Le cache 'redis' nécessite le paquet redis (pip install redis)"
+                ) from e
+            client = redis.from_url(url)
+        self.client = client
+    
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self.client.get(key)
+    
+    async def set(self, key: str, value: bytes, ex: Optional[int] = None):
+        await self.client.set(key, value, ex=ex)
+    
+    async def incr(self, key: str) -> int:
+        return int(await self.client.incr(key))
+    
+    async def setnx(self, key: str, value: int):
+        await self.client.set(key, value, nx=True)
+    
+    async def delete(self, key: str):
+        await self.client.delete(key)
+    
+    async def close(self):
+        close = getattr(self.client, "aclose", None) or getattr(self.client, "close", None)
+        if close:
+            await close()
+
+
+class TTLCache:
+    """Cache clé → objet en mémoire, avec expiration et taille bornée (synchrone)"""
+    
+    def __init__(self, ttl: float, max_entries: int = 1024):
+        """
+        Args:
+            ttl: Durée de vie par défaut en secondes (0 = cache désactivé)
+            max_entries: Nombre maximal d'entrées (les plus anciennes sont évincées)
+        """
+        self.ttl = ttl
+        self.max_entries = max(1, max_entries)
+        self._entries: "OrderedDict[Any, Tuple[Any, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+    
+    def get(self, key: Any) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] > time.monotonic():
+                self._hits += 1
+                return entry[0]
+            if entry is not None:
+                del self._entries[key]
+            self._misses += 1
+            return None
+    
+    def set(self, key: Any, value: Any, ttl: Optional[float] = None):
+        """Enregistre une valeur pour `ttl` secondes (par défaut self.ttl)"""
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        if ttl <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    def discard(self, key: Any):
+        with self._lock:
+            self._entries.pop(key, None)
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+    
+    def stats(self) -> Dict[str, Any]:
+        lookups = self._hits + self._misses
+        return {
+            "size": len(self._entries),
+            "hits": self._hits,
+            "misses": self._misses,
+            "hit_ratio": self._hits / lookups if lookups else 0.0,
+        }
+
+
+class ResponseCache:
+    """Cache de réponses sérialisées, invalidé par compteur de génération"""
+    
+    def __init__(self, backend: CacheBackend, ttl: int = 60, namespace: str = "catalog"):
+        """
+        Args:
+            backend: Stockage des entrées
+            ttl: Durée de vie d'une entrée en secondes (0 = cache désactivé)
+            namespace: Préfixe des clés
+        """
+        self.backend = backend
+        self.ttl = ttl
+        self.namespace = namespace
+        self._generation_key = f"{namespace}:generation"
+        
+        # Métriques
+        self._hits = 0
+        self._misses = 0
+        self._writes = 0
+        self._invalidations = 0
+        self._errors = 0
+    
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0
+    
+    @staticmethod
+    def normalize_params(params: Dict[str, Any]) -> str:
+        """Sérialise des paramètres de requête de façon canonique (ordre, absents ignorés)"""
+        cleaned = {key: value for key, value in params.items() if value is not None}
+        return json.dumps(cleaned, sort_keys=True, separators=(",", ":"), default=str)
+    
+    async def generation(self) -> int:
+        """
+        Génération courante du catalogue
+        
+        Une génération absente (premier démarrage, Redis vidé) est amorcée à
+        une valeur aléatoire : les versions émises avant une remise à zéro ne
+        peuvent pas correspondre à la nouvelle numérotation.
+        """
+        value = await self.backend.get(self._generation_key)
+        if value is None:
+            await self.backend.setnx(self._generation_key, random.randint(1, 2 ** 31))
+            value = await self.backend.get(self._generation_key)
+        return int(value)
+    
+    async def version(self, scope: str, params: Dict[str, Any]) -> Optional[str]:
+        """
+        Version d'une réponse : génération du catalogue et empreinte des paramètres
+        
+        La version est lue une seule fois par requête, avant la lecture en
+        base : une réponse calculée pendant une invalidation est rangée sous
+        l'ancienne génération et ne sera jamais servie.
+        
+        Args:
+            scope: Type de réponse (ex: "products:list")
+            params: Paramètres de la requête
+        
+        Returns:
+            Version, ou None si la génération est illisible
+        """
+        try:
+            generation = await self.generation()
+        except Exception as e:
+            self._errors += 1
+            print(f"✗ Lecture de la génération du cache impossible: {e}")
+            return None
+        digest = hashlib.sha1(f"{scope}:{self.normalize_params(params)}".encode("utf-8")).hexdigest()
+        return f"{generation}-{digest[:16]}"
+    
+    def key(self, version: Optional[str]) -> Optional[str]:
+        """Clé de stockage d'une version (None si le cache est désactivé)"""
+        if not self.enabled or version is None:
+            return None
+        return f"{self.namespace}:{version}"
+    
+    async def get(self, key: Optional[str]) -> Optional[Any]:
+        """Retourne la valeur désérialisée en cache, ou None si absente"""
+        if key is None:
+            return None
+        try:
+            raw = await self.backend.get(key)
+        except Exception as e:
+            self._errors += 1
+            print(f"✗ Lecture du cache impossible: {e}")
+            return None
+        
+        if raw is None:
+            self._misses += 1
+            return None
+        self._hits += 1
+        return json.loads(raw)
+    
+    async def set(self, key: Optional[str], value: Any):
+        """Enregistre une réponse (valeur sérialisable en JSON)"""
+        if key is None:
+            return
+        try:
+            payload = json.dumps(value, separators=(",", ":")).encode("utf-8")
+            await self.backend.set(key, payload, ex=self.ttl)
+            self._writes += 1
+        except Exception as e:
+            self._errors += 1
+            print(f"✗ Écriture du cache impossible: {e}")
+    
+    async def invalidate(self):
+        """Rend obsolètes toutes les entrées (incrémente la génération)"""
+        try:
+            await self.backend.incr(self._generation_key)
+            self._invalidations += 1
+        except Exception as e:
+            self._errors += 1
+            print(f"✗ Invalidation du cache impossible: {e}")
+    
+    def stats(self) -> Dict[str, Any]:
+        """Retourne les compteurs et le taux de succès du cache"""
+        lookups = self._hits + self._misses
+        return {
+            "enabled": self.enabled,
+            "backend": type(self.backend).__name__,
+            "ttl_seconds": self.ttl,
+            "hits": self._hits,
+            "misses": self._misses,
+            "hit_ratio": self._hits / lookups if lookups else 0.0,
+            "writes": self._writes,
+            "invalidations": self._invalidations,
+            "errors": self._errors,
+        }
+
+
+def create_backend(name: str, url: str = "", max_entries: int = 1024) -> CacheBackend:
+    """
+    Instancie un stockage de cache
+    
+    Args:
+        name: "memory" ou "redis"
+        url: URL Redis (stockage redis)
+        max_entries: Nombre maximal d'entrées (stockage memory)
+    """
+    if name == "memory":
+        return InMemoryCacheBackend(max_entries=max_entries)
+    if name == "redis":
+        return RedisCacheBackend(url)
+    raise ValueError(f"Stockage de cache inconnu: {name}")
+
+
+# Instance globale du cache des réponses du catalogue
+response_cache = ResponseCache(
+    create_backend(
+        settings.response_cache_backend,
+        url=settings.response_cache_url,
+        max_entries=settings.response_cache_max_entries
+    ),
+    ttl=settings.response_cache_ttl
+)
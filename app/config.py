@@ -12,15 +12,67 @@ class Settings(BaseSettings):
     # JWT Authentication
     algorithm: str = "HS256"
     access_token_expire_minutes: int = 30
+    refresh_token_expire_days: int = 30
+    
+    # Cache des claims de token décodés et des utilisateurs authentifiés
+    auth_cache_ttl: float = 30.0  # Secondes (0 = désactivé)
+    auth_cache_max_entries: int = 4096
+    
+    # Hachage des mots de passe (bcrypt sur un pool de threads dédié)
+    password_hash_workers: int = 4  # Hachages simultanés
+    password_hash_queue_timeout: float = 2.0  # Attente maximale d'une place (secondes), 503 au-delà
+    password_hash_max_waiting: int = 64  # Demandes en attente avant refus immédiat
     
     # Neo4j
     neo4j_uri: str = "bolt://localhost:7687"
     neo4j_user: str = "neo4j"
     neo4j_password: str = "testpassword"
+    neo4j_max_connection_pool_size: int = 100  # Connexions par driver (valeur par défaut du driver)
+    
+    # Journal des requêtes lentes
+    slow_query_threshold_ms: float = 200.0  # Au-delà, la requête est journalisée (0 = désactivé)
+    slow_query_max_entries: int = 200  # Requêtes lentes conservées (GET /api/admin/slow-queries)
+    slow_query_profile: bool = False  # Rejouer chaque forme lente sous PROFILE (activation explicite, mode debug seulement)
     
     # Embeddings
     embedding_model: str = "sentence-transformers/all-MiniLM-L6-v2"
     embedding_dimension: int = 384
+    embedding_backend: str = "torch"  # "torch" (PyTorch) ou "onnx" (ONNX Runtime int8, CPU)
+    embedding_onnx_path: str = "models/all-MiniLM-L6-v2-int8"
+    embedding_onnx_threads: int = 0  # 0 = valeur par défaut d'ONNX Runtime
+    embedding_batch_max_size: int = 32
+    embedding_batch_window_ms: float = 5.0
+    embedding_cache_size: int = 1024
+    embedding_cache_path: str = ""  # Fichier SQLite du cache persistant (vide = désactivé)
+    
+    # Recherche vectorielle
+    vector_search_engine: str = "neo4j"  # "neo4j" (index HNSW) ou "local" (matrice NumPy en mémoire)
+    vector_search_oversample_factor: int = 4
+    vector_search_max_candidates: int = 1000
+    search_rrf_k: int = 60  # Constante k de la Reciprocal Rank Fusion (recherche hybride)
+    
+    # Stockage des produits
+    product_store: str = "neo4j"  # "neo4j" ou "memory" (catalogue complet en mémoire, écritures répercutées dans Neo4j)
+    product_store_max_products: int = 20000  # Au-delà, le catalogue n'est pas chargé en mémoire
+    product_store_reload_interval: float = 60.0  # Rechargement du catalogue en mémoire (s, 0 = jamais)
+    
+    # Cache des réponses du catalogue (GET /api/products)
+    response_cache_backend: str = "memory"  # "memory" (par processus) ou "redis" (partagé)
+    response_cache_url: str = "redis://localhost:6379/0"
+    response_cache_ttl: int = 60  # Secondes (0 = cache désactivé)
+    response_cache_max_entries: int = 1024
+    
+    # Import en masse
+    import_chunk_size: int = 500  # Produits encodés et écrits par transaction
+    
+    # Traçage des requêtes
+    tracing_sample_rate: float = 0.0  # Proportion des requêtes tracées (0 = désactivé, 1 = toutes)
+    tracing_exporter: str = "memory"  # "memory" (dernières traces, /api/admin/traces) ou "file" (JSON Lines)
+    tracing_file_path: str = "traces.jsonl"
+    tracing_max_traces: int = 100  # Traces conservées par l'exportateur memory
+    
+    # Retard de la boucle d'événements (histogramme event_loop_lag_seconds de /metrics)
+    event_loop_monitor_interval_ms: float = 100.0  # Période de mesure (0 = désactivé)
     
     # Paiement
     payment_api_key: str = ""
@@ -1,36 +1,115 @@
 """
 Module de connexion et gestion de Neo4j avec support des embeddings vectoriels
+
+Les drivers et le modèle d'embeddings sont créés à la demande : importer ce
+module (via app.models ou app.services) ne coûte ni connexion réseau ni
+chargement du modèle. L'application les prépare en arrière-plan au
+démarrage (voir warmup_async).
 """
-from typing import List, Optional, Dict, Any
-from neo4j import GraphDatabase, Driver
-from sentence_transformers import SentenceTransformer
+import asyncio
+import threading
+import time
+from datetime import datetime
+from typing import List, Optional, Dict, Any, Set
+from neo4j import GraphDatabase, Driver, AsyncGraphDatabase, AsyncDriver
 import numpy as np
 from app.config import settings
+from app import metrics
+from app.query_log import slow_query_log
+from app.tracing import tracer
+from app.embeddings import EmbeddingBatcher, EmbeddingCache
+from app.embeddings.backends import EmbeddingBackend, load_backend
+from app.models.product import PRODUCT_SEARCH_FIELDS
 
 
 class Neo4jConnection:
     """Gestionnaire de connexion Neo4j avec support des embeddings"""
     
     def __init__(self):
-        self.driver: Optional[Driver] = None
-        self.embedding_model: Optional[SentenceTransformer] = None
-        self._initialize()
-    
-    def _initialize(self):
-        """Initialise la connexion et le modèle d'embeddings"""
-        # Connexion à Neo4j
-        self.driver = GraphDatabase.driver(
-            settings.neo4j_uri,
-            auth=(settings.neo4j_user, settings.neo4j_password)
-        )
+        self._driver: Optional[Driver] = None
+        self._async_driver: Optional[AsyncDriver] = None
+        self._embedding_backend: Optional[EmbeddingBackend] = None
+        self._lock = threading.Lock()
+        self._model_lock = threading.Lock()
         
-        # Charger le modèle d'embeddings
-        print(f"Chargement du modèle d'embeddings: {settings.embedding_model}")
-        self.embedding_model = SentenceTransformer(settings.embedding_model)
-        print(f"Modèle chargé. Dimension: {self.embedding_model.get_sentence_embedding_dimension()}")
+        # PROFILE des requêtes lentes en cours (référence conservée jusqu'à la fin)
+        self._profile_tasks: Set[asyncio.Task] = set()
         
-        # Vérifier la connexion
-        self.verify_connection()
+        # État de préparation (exposé par /readyz)
+        self.db_ready = False
+        self.warmup_error: Optional[str] = None
+        
+        self.embedding_batcher = EmbeddingBatcher(
+            self._encode_batch,
+            max_batch_size=settings.embedding_batch_max_size,
+            max_wait_ms=settings.embedding_batch_window_ms
+        )
+        self.embedding_cache = EmbeddingCache(
+            f"{settings.embedding_model}@{settings.embedding_backend}",
+            max_size=settings.embedding_cache_size,
+            path=settings.embedding_cache_path or None
+        )
+        for driver in ("sync", "async"):
+            metrics.neo4j_pool_max_size.set(settings.neo4j_max_connection_pool_size, driver=driver)
+    
+    @property
+    def driver(self) -> Driver:
+        """Driver synchrone, créé à la première utilisation"""
+        if self._driver is None:
+            with self._lock:
+                if self._driver is None:
+                    self._driver = GraphDatabase.driver(
+                        settings.neo4j_uri,
+                        auth=(settings.neo4j_user, settings.neo4j_password),
+                        max_connection_pool_size=settings.neo4j_max_connection_pool_size
+                    )
+        return self._driver
+    
+    @property
+    def async_driver(self) -> AsyncDriver:
+        """Driver asynchrone utilisé par les services, créé à la première utilisation"""
+        if self._async_driver is None:
+            with self._lock:
+                if self._async_driver is None:
+                    self._async_driver = AsyncGraphDatabase.driver(
+                        settings.neo4j_uri,
+                        auth=(settings.neo4j_user, settings.neo4j_password),
+                        max_connection_pool_size=settings.neo4j_max_connection_pool_size
+                    )
+        return self._async_driver
+    
+    @property
+    def embedding_backend(self) -> EmbeddingBackend:
+        """Backend d'embeddings (torch ou onnx), chargé à la première utilisation"""
+        if self._embedding_backend is None:
+            self.load_embedding_model()
+        return self._embedding_backend
+    
+    @property
+    def model_ready(self) -> bool:
+        """Indique si le modèle d'embeddings est chargé"""
+        return self._embedding_backend is not None
+    
+    @property
+    def is_ready(self) -> bool:
+        """Indique si le modèle et la base sont prêts à servir la recherche"""
+        return self.model_ready and self.db_ready
+    
+    def load_embedding_model(self):
+        """Charge le modèle d'embeddings (sans effet s'il est déjà chargé)"""
+        with self._model_lock:
+            if self._embedding_backend is not None:
+                return
+            
+            print(f"Chargement du modèle d'embeddings: {settings.embedding_model} ({settings.embedding_backend})")
+            backend = load_backend(
+                settings.embedding_backend,
+                settings.embedding_model,
+                onnx_path=settings.embedding_onnx_path,
+                num_threads=settings.embedding_onnx_threads
+            )
+            print(f"Modèle chargé. Dimension: {backend.dimension}")
+            self._embedding_backend = backend
     
     def verify_connection(self) -> bool:
         """Vérifie que la connexion à Neo4j fonctionne"""
@@ -40,25 +119,75 @@ class Neo4jConnection:
                 record = result.single()
                 if record and record["test"] == 1:
                     print("✓ Connexion à Neo4j établie")
+                    self.db_ready = True
                     return True
             return False
         except Exception as e:
             print(f"✗ Erreur de connexion à Neo4j: {e}")
             return False
     
+    async def verify_connection_async(self) -> bool:
+        """Vérifie la connexion à Neo4j via le driver asynchrone"""
+        try:
+            await self.async_driver.verify_connectivity()
+            self.db_ready = True
+            return True
+        except Exception as e:
+            print(f"✗ Erreur de connexion à Neo4j: {e}")
+            self.db_ready = False
+            return False
+    
+    async def warmup_async(self, retry_delay: float = 2.0):
+        """
+        Prépare la base (index) puis le modèle, sans bloquer la boucle
+        
+        Réessaie la connexion tant que Neo4j n'est pas joignable, ce qui permet
+        de démarrer l'application avant la base.
+        
+        Args:
+            retry_delay: Délai entre deux tentatives de connexion (secondes)
+        """
+        while not await self.verify_connection_async():
+            await asyncio.sleep(retry_delay)
+        print("✓ Connexion à Neo4j établie")
+        
+        await asyncio.to_thread(self.create_user_indexes)
+        await asyncio.to_thread(self.create_product_indexes)
+        await asyncio.to_thread(self.create_vector_index, "Product", "embedding")
+        await asyncio.to_thread(self.create_fulltext_index, "Product", list(PRODUCT_SEARCH_FIELDS))
+        
+        await asyncio.to_thread(self.load_embedding_model)
+        self.embedding_batcher.start()
+    
     def close(self):
         """Ferme la connexion à Neo4j"""
-        if self.driver:
-            self.driver.close()
+        if self._driver:
+            self._driver.close()
+            self._driver = None
             print("Connexion à Neo4j fermée")
     
-    def create_vector_index(self, label: str, property_name: str = "embedding"):
+    async def close_async(self):
+        """Ferme les connexions synchrone et asynchrone à Neo4j"""
+        self.embedding_batcher.stop()
+        self.embedding_cache.close()
+        if self._async_driver:
+            await self._async_driver.close()
+            self._async_driver = None
+        self.close()
+    
+    def create_vector_index(
+        self,
+        label: str,
+        property_name: str = "embedding",
+        dimension: Optional[int] = None
+    ):
         """
         Crée un index vectoriel pour les recherches de similarité
         
         Args:
             label: Label du nœud (ex: "Product")
             property_name: Nom de la propriété contenant l'embedding
+            dimension: Dimension des vecteurs (par défaut settings.embedding_dimension)
         """
         index_name = f"{label.lower()}_vector_index"
         
@@ -84,7 +213,7 @@ class Neo4jConnection:
             ON (n.{property_name})
             OPTIONS {{
                 indexConfig: {{
-                    `vector.dimensions`: {settings.embedding_dimension},
+                    `vector.dimensions`: {dimension or settings.embedding_dimension},
                     `vector.similarity_function`: 'cosine'
                 }}
             }}
@@ -92,6 +221,84 @@ class Neo4jConnection:
             session.run(create_query)
             print(f"✓ Index vectoriel '{index_name}' créé pour {label}.{property_name}")
     
+    def vector_index_dimension(self, label: str) -> Optional[int]:
+        """
+        Retourne la dimension configurée de l'index vectoriel d'un label
+        
+        Returns:
+            Dimension, ou None si l'index n'existe pas
+        """
+        query = """
+        SHOW INDEXES
+        YIELD name, options
+        WHERE name = $index_name
+        RETURN options.indexConfig.`vector.dimensions` AS dimension
+        """
+        result = self.execute_query(query, {"index_name": f"{label.lower()}_vector_index"}, name="index.vector_dimension")
+        return result[0]["dimension"] if result else None
+    
+    def rebuild_vector_index(
+        self,
+        label: str,
+        property_name: str = "embedding",
+        dimension: Optional[int] = None
+    ) -> bool:
+        """
+        Recrée l'index vectoriel si sa dimension ne correspond plus au modèle
+        
+        Args:
+            label: Label du nœud (ex: "Product")
+            property_name: Nom de la propriété contenant l'embedding
+            dimension: Dimension attendue (par défaut settings.embedding_dimension)
+        
+        Returns:
+            True si l'index a été (re)créé
+        """
+        dimension = dimension or settings.embedding_dimension
+        current = self.vector_index_dimension(label)
+        if current == dimension:
+            print(f"Index vectoriel de {label} déjà en dimension {dimension}")
+            return False
+        
+        if current is not None:
+            self.execute_query(f"DROP INDEX {label.lower()}_vector_index IF EXISTS", name="index.vector_drop")
+            print(f"✓ Index vectoriel de {label} supprimé (dimension {current})")
+        self.create_vector_index(label, property_name, dimension=dimension)
+        return True
+    
+    def create_fulltext_index(
+        self,
+        label: str,
+        properties: List[str],
+        analyzer: str = "french"
+    ):
+        """
+        Crée un index plein texte (Lucene) pour la recherche lexicale
+        
+        L'analyseur français gère la casse, les accents, les mots vides et
+        les pluriels (racinisation), et les résultats sont classés par BM25.
+        
+        Args:
+            label: Label du nœud (ex: "Product")
+            properties: Propriétés textuelles indexées
+            analyzer: Analyseur Lucene
+        """
+        index_name = f"{label.lower()}_fulltext_index"
+        fields = ", ".join(f"n.{name}" for name in properties)
+        
+        with self.driver.session() as session:
+            session.run(f"""
+            CREATE FULLTEXT INDEX {index_name} IF NOT EXISTS
+            FOR (n:{label})
+            ON EACH [{fields}]
+            OPTIONS {{
+                indexConfig: {{
+                    `fulltext.analyzer`: '{analyzer}'
+                }}
+            }}
+            """)
+            print(f"✓ Index plein texte '{index_name}' ({analyzer}) prêt pour {label}")
+    
     def create_user_indexes(self):
         """
         Crée les index pour optimiser les requêtes utilisateurs
@@ -116,38 +323,301 @@ class Neo4jConnection:
                 print("✓ Index utilisateur créé : user_email_index")
             except Exception:
                 pass  # Index existe déjà
+            
+            try:
+                # Index sur l'empreinte des refresh tokens
+                session.run("""
+                    CREATE INDEX refresh_token_hash_index IF NOT EXISTS
+                    FOR (t:RefreshToken) ON (t.token_hash)
+                """)
+                print("✓ Index utilisateur créé : refresh_token_hash_index")
+            except Exception:
+                pass  # Index existe déjà
+            
+            try:
+                # Index sur la famille (révocation d'une session)
+                session.run("""
+                    CREATE INDEX refresh_token_family_index IF NOT EXISTS
+                    FOR (t:RefreshToken) ON (t.family_id)
+                """)
+                print("✓ Index utilisateur créé : refresh_token_family_index")
+            except Exception:
+                pass  # Index existe déjà
+    
+    def create_product_indexes(self):
+        """
+        Crée les index de range pour la pagination du catalogue
+        
+        L'index composite (created_at, id) permet un parcours ordonné pour
+        ORDER BY p.created_at DESC, p.id DESC et la reprise par curseur.
+        
+        Les produits antérieurs à updated_at reçoivent aussi une date de
+        modification (created_at, à défaut l'instant présent) : sans elle,
+        leur ETag serait calculé sur la valeur par défaut du modèle, qui
+        change à chaque lecture.
+        """
+        indexes = {
+            "product_id_index": "FOR (p:Product) ON (p.id)",
+            "product_created_at_index": "FOR (p:Product) ON (p.created_at, p.id)",
+            "product_status_created_at_index": "FOR (p:Product) ON (p.status, p.created_at)",
+        }
+        with self.driver.session() as session:
+            for name, definition in indexes.items():
+                try:
+                    session.run(f"CREATE RANGE INDEX {name} IF NOT EXISTS {definition}")
+                    print(f"✓ Index produit créé : {name}")
+                except Exception:
+                    pass  # Index existe déjà (ou couvert par une contrainte)
+            
+            result = session.run("""
+                MATCH (p:Product)
+                WHERE p.updated_at IS NULL
+                CALL {
+                    WITH p
+                    SET p.updated_at = coalesce(p.created_at, $now)
+                } IN TRANSACTIONS OF 10000 ROWS
+                RETURN count(p) AS backfilled
+            """, now=datetime.now().isoformat())
+            backfilled = result.single()["backfilled"]
+            if backfilled:
+                print(f"✓ updated_at renseigné sur {backfilled} produits")
     
-    def generate_embedding(self, text: str) -> List[float]:
+    def generate_embedding(self, text: str, use_cache: bool = True) -> List[float]:
         """
         Génère un embedding vectoriel pour un texte
         
         Args:
             text: Texte à transformer en embedding
+            use_cache: Consulter et alimenter le cache des requêtes
+            
+        Returns:
+            Liste de floats représentant l'embedding
+        """
+        with tracer.span("embedding.generate", source="single") as span:
+            if use_cache:
+                cached = self.embedding_cache.get(text)
+                if cached is not None:
+                    if span:
+                        span.set_attribute("cached", True)
+                    return cached
+            
+            with metrics.embedding_encode_duration.time(source="single"):
+                embedding = self.embedding_backend.encode([text])[0].tolist()
+            metrics.embedding_batch_size.observe(1, source="single")
+            
+            if use_cache:
+                self.embedding_cache.put(text, embedding)
+            return embedding
+    
+    def _encode_batch(self, texts: List[str], source: str = "batcher") -> np.ndarray:
+        """Encode un lot de textes en un seul appel au modèle"""
+        with metrics.embedding_encode_duration.time(source=source):
+            vectors = self.embedding_backend.encode(texts)
+        metrics.embedding_batch_size.observe(len(texts), source=source)
+        return vectors
+    
+    async def generate_embedding_async(self, text: str, use_cache: bool = True) -> List[float]:
+        """
+        Génère un embedding via le micro-batcher, sans bloquer la boucle
+        
+        Args:
+            text: Texte à transformer en embedding
+            use_cache: Consulter et alimenter le cache des requêtes
             
         Returns:
             Liste de floats représentant l'embedding
         """
-        if not self.embedding_model:
-            raise RuntimeError("Modèle d'embeddings non chargé")
+        with tracer.span("embedding.generate", source="batcher") as span:
+            if use_cache:
+                cached = await self.embedding_cache.get_async(text)
+                if cached is not None:
+                    if span:
+                        span.set_attribute("cached", True)
+                    return cached
+            
+            embedding = await self.embedding_batcher.embed(text)
+            
+            if use_cache:
+                self.embedding_cache.put(text, embedding)
+            return embedding
+    
+    async def generate_embeddings_async(self, texts: List[str]) -> List[List[float]]:
+        """
+        Encode un grand lot de textes sur un thread, sans passer par le micro-batcher
         
-        embedding = self.embedding_model.encode(text, convert_to_numpy=True)
-        return embedding.tolist()
+        Destiné aux traitements en masse (import, ré-encodage), qui forment
+        déjà leurs propres lots.
+        
+        Args:
+            texts: Textes à transformer en embeddings
+            
+        Returns:
+            Liste d'embeddings, dans l'ordre des textes
+        """
+        if not texts:
+            return []
+        with tracer.span("embedding.generate", source="bulk", texts=len(texts)):
+            vectors = await asyncio.to_thread(self._encode_batch, texts, "bulk")
+            return vectors.tolist()
     
-    def execute_query(self, query: str, parameters: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+    def execute_query(
+        self,
+        query: str,
+        parameters: Optional[Dict[str, Any]] = None,
+        name: str = "other"
+    ) -> List[Dict[str, Any]]:
         """
         Exécute une requête Cypher
         
         Args:
             query: Requête Cypher
             parameters: Paramètres de la requête
+            name: Nom court de la requête (métriques, traces, journal des requêtes lentes)
             
         Returns:
             Liste de dictionnaires avec les résultats
         """
+        metrics.neo4j_queries_in_flight.inc(driver="sync")
+        error = None
+        started = time.perf_counter()
+        try:
+            with tracer.span("neo4j.query", query=name) as span:
+                records = self._run_query(query, parameters, name)
+                if span:
+                    span.set_attribute("rows", len(records))
+                return records
+        except Exception as e:
+            error = type(e).__name__
+            metrics.neo4j_query_errors.inc(query=name)
+            raise
+        finally:
+            duration = time.perf_counter() - started
+            metrics.neo4j_queries_in_flight.dec(driver="sync")
+            metrics.neo4j_query_duration.observe(duration, query=name)
+            if slow_query_log.is_slow(duration):
+                self._record_slow_query(name, query, parameters, duration, error)
+    
+    async def execute_query_async(
+        self,
+        query: str,
+        parameters: Optional[Dict[str, Any]] = None,
+        name: str = "other"
+    ) -> List[Dict[str, Any]]:
+        """
+        Exécute une requête Cypher sans bloquer la boucle d'événements
+        
+        Args:
+            query: Requête Cypher
+            parameters: Paramètres de la requête
+            name: Nom court de la requête (métriques, traces, journal des requêtes lentes)
+            
+        Returns:
+            Liste de dictionnaires avec les résultats
+        """
+        metrics.neo4j_queries_in_flight.inc(driver="async")
+        error = None
+        started = time.perf_counter()
+        try:
+            with tracer.span("neo4j.query", query=name) as span:
+                records = await self._run_query_async(query, parameters, name)
+                if span:
+                    span.set_attribute("rows", len(records))
+                return records
+        except Exception as e:
+            error = type(e).__name__
+            metrics.neo4j_query_errors.inc(query=name)
+            raise
+        finally:
+            duration = time.perf_counter() - started
+            metrics.neo4j_queries_in_flight.dec(driver="async")
+            metrics.neo4j_query_duration.observe(duration, query=name)
+            if slow_query_log.is_slow(duration):
+                self._record_slow_query_async(name, query, parameters, duration, error)
+    
+    def _run_query(self, query: str, parameters: Optional[Dict[str, Any]], name: str) -> List[Dict[str, Any]]:
+        """Exécute une requête sur le driver synchrone (remplacé par les doublures des benchmarks)"""
         with self.driver.session() as session:
             result = session.run(query, parameters or {})
             return [dict(record) for record in result]
     
+    async def _run_query_async(
+        self,
+        query: str,
+        parameters: Optional[Dict[str, Any]],
+        name: str
+    ) -> List[Dict[str, Any]]:
+        """Exécute une requête sur le driver asynchrone (remplacé par les doublures des benchmarks)"""
+        async with self.async_driver.session() as session:
+            result = await session.run(query, parameters or {})
+            return [dict(record) async for record in result]
+    
+    def _record_slow_query(
+        self,
+        name: str,
+        query: str,
+        parameters: Optional[Dict[str, Any]],
+        duration: float,
+        error: Optional[str]
+    ):
+        """Journalise une requête lente et, en mode debug, capture son plan PROFILE"""
+        if slow_query_log.record(name, query, parameters, duration, error):
+            self._profile_query(name, query, parameters)
+    
+    def _record_slow_query_async(
+        self,
+        name: str,
+        query: str,
+        parameters: Optional[Dict[str, Any]],
+        duration: float,
+        error: Optional[str]
+    ):
+        """Variante asynchrone : le PROFILE s'exécute en tâche de fond"""
+        if slow_query_log.record(name, query, parameters, duration, error):
+            task = asyncio.create_task(self._profile_query_async(name, query, parameters))
+            self._profile_tasks.add(task)
+            task.add_done_callback(self._profile_tasks.discard)
+    
+    def _profile_query(self, name: str, query: str, parameters: Optional[Dict[str, Any]]):
+        """Rejoue une requête sous PROFILE dans une transaction annulée (aucune écriture conservée)"""
+        try:
+            with self.driver.session() as session:
+                tx = session.begin_transaction()
+                try:
+                    summary = tx.run(f"PROFILE {query}", parameters or {}).consume()
+                finally:
+                    tx.rollback()
+            slow_query_log.store_profile(name, query, summary.profile)
+        except Exception as e:
+            slow_query_log.store_profile(name, query, None, error=str(e))
+    
+    async def _profile_query_async(self, name: str, query: str, parameters: Optional[Dict[str, Any]]):
+        """Rejoue une requête sous PROFILE dans une transaction annulée (aucune écriture conservée)"""
+        try:
+            async with self.async_driver.session() as session:
+                tx = await session.begin_transaction()
+                try:
+                    result = await tx.run(f"PROFILE {query}", parameters or {})
+                    summary = await result.consume()
+                finally:
+                    await tx.rollback()
+            slow_query_log.store_profile(name, query, summary.profile)
+        except Exception as e:
+            slow_query_log.store_profile(name, query, None, error=str(e))
+    
+    def _vector_search_query(self, label: str) -> str:
+        """Construit la requête Cypher de recherche vectorielle pour un label"""
+        return f"""
+        CALL db.index.vector.queryNodes(
+            '{label.lower()}_vector_index',
+            $top_k,
+            $query_embedding
+        )
+        YIELD node, score
+        WHERE score >= $min_score
+        RETURN node, score
+        ORDER BY score DESC
+        """
+    
     def vector_search(
         self,
         query_text: str,
@@ -170,29 +640,175 @@ class Neo4jConnection:
         # Générer l'embedding de la requête
         query_embedding = self.generate_embedding(query_text)
         
-        # Recherche vectorielle
-        cypher_query = f"""
+        return self.execute_query(
+            self._vector_search_query(label),
+            {
+                "query_embedding": query_embedding,
+                "top_k": top_k,
+                "min_score": min_score
+            },
+            name=f"{label.lower()}.vector_search"
+        )
+    
+    def _filtered_vector_search_query(
+        self,
+        label: str,
+        where: Optional[str],
+        projection: Optional[str] = None
+    ) -> str:
+        """
+        Construit la requête de recherche vectorielle filtrée
+        
+        Les filtres (sur la variable `node`) sont appliqués dans Cypher après
+        l'appel à l'index. La requête renvoie toujours une ligne contenant le
+        nombre de candidats et le score le plus faible, qui permettent de
+        décider s'il est utile de sur-échantillonner davantage.
+        `projection` (ex: "node {.id, .name}") évite de renvoyer tout le nœud.
+        """
+        filters = "score >= $min_score"
+        if where:
+            filters += f" AND ({where})"
+        
+        return f"""
         CALL db.index.vector.queryNodes(
             '{label.lower()}_vector_index',
-            $top_k,
+            $candidates,
             $query_embedding
         )
         YIELD node, score
-        WHERE score >= $min_score
-        RETURN node, score
+        WITH count(*) AS candidate_count,
+             min(score) AS lowest_score,
+             collect({{node: node, score: score}}) AS hits
+        CALL {{
+            WITH hits
+            UNWIND hits AS hit
+            WITH hit.node AS node, hit.score AS score
+            WHERE {filters}
+            WITH node, score
+            ORDER BY score DESC
+            LIMIT $top_k
+            RETURN collect({{node: {projection or "node"}, score: score}}) AS matches
+        }}
+        RETURN candidate_count, lowest_score, matches
+        """
+    
+    async def vector_search_async(
+        self,
+        query_text: str,
+        label: str,
+        top_k: int = 10,
+        min_score: float = 0.0,
+        where: Optional[str] = None,
+        parameters: Optional[Dict[str, Any]] = None,
+        projection: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Recherche vectorielle par similarité, avec filtres et sur-échantillonnage
+        
+        Si les filtres éliminent trop de candidats, le nombre de voisins
+        demandés à l'index est multiplié par `vector_search_oversample_factor`
+        jusqu'à obtenir `top_k` résultats, épuiser l'index, passer sous
+        `min_score` ou atteindre `vector_search_max_candidates`.
+        
+        Args:
+            query_text: Texte de recherche
+            label: Label des nœuds à rechercher
+            top_k: Nombre de résultats à retourner
+            min_score: Score minimum de similarité (0-1)
+            where: Condition Cypher supplémentaire portant sur `node`
+            parameters: Paramètres référencés par `where`
+            projection: Expression Cypher retournée à la place du nœud complet
+            
+        Returns:
+            Liste de résultats ({"node", "score"}) triés par score décroissant
+        """
+        query_embedding = await self.generate_embedding_async(query_text)
+        query = self._filtered_vector_search_query(label, where, projection)
+        
+        max_candidates = max(top_k, settings.vector_search_max_candidates)
+        factor = max(2, settings.vector_search_oversample_factor)
+        candidates = min(top_k * factor, max_candidates) if where else top_k
+        
+        while True:
+            result = await self.execute_query_async(
+                query,
+                {
+                    **(parameters or {}),
+                    "query_embedding": query_embedding,
+                    "candidates": candidates,
+                    "top_k": top_k,
+                    "min_score": min_score
+                },
+                name=f"{label.lower()}.vector_search"
+            )
+            if not result:
+                return []
+            
+            row = result[0]
+            matches = row["matches"]
+            exhausted = row["candidate_count"] < candidates
+            below_threshold = row["lowest_score"] is not None and row["lowest_score"] < min_score
+            
+            if (len(matches) >= top_k or exhausted or below_threshold
+                    or candidates >= max_candidates):
+                return matches
+            
+            candidates = min(candidates * factor, max_candidates)
+
+
+    @staticmethod
+    def escape_lucene(text: str) -> str:
+        """Échappe les caractères spéciaux de la syntaxe de requête Lucene"""
+        special = set('+-&|!(){}[]^"~*?:\\/')
+        return "".join(f"\\{char}" if char in special else char for char in text)
+    
+    async def fulltext_search_async(
+        self,
+        query_text: str,
+        label: str,
+        top_k: int = 10,
+        where: Optional[str] = None,
+        parameters: Optional[Dict[str, Any]] = None,
+        projection: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Recherche plein texte classée par BM25
+        
+        L'index renvoie les nœuds par score décroissant : les filtres sont
+        appliqués au fil de l'eau et LIMIT interrompt le parcours dès que
+        `top_k` résultats sont trouvés.
+        
+        Args:
+            query_text: Texte saisi (la syntaxe Lucene est neutralisée)
+            label: Label des nœuds à rechercher
+            top_k: Nombre de résultats à retourner
+            where: Condition Cypher supplémentaire portant sur `node`
+            parameters: Paramètres référencés par `where`
+            projection: Expression Cypher retournée à la place du nœud complet
+            
+        Returns:
+            Liste de résultats ({"node", "score"}) avec le score BM25 brut
+        """
+        # Minuscules : AND/OR/NOT saisis par un client ne sont pas des opérateurs
+        terms = self.escape_lucene(query_text.lower()).strip()
+        if not terms:
+            return []
+        
+        where_clause = f"WHERE {where}" if where else ""
+        query = f"""
+        CALL db.index.fulltext.queryNodes('{label.lower()}_fulltext_index', $search_terms)
+        YIELD node, score
+        {where_clause}
+        RETURN {projection or "node"} AS node, score
         ORDER BY score DESC
+        LIMIT $top_k
         """
         
-        results = self.execute_query(
-            cypher_query,
-            {
-                "query_embedding": query_embedding,
-                "top_k": top_k,
-                "min_score": min_score
-            }
+        return await self.execute_query_async(
+            query,
+            {**(parameters or {}), "search_terms": terms, "top_k": top_k},
+            name=f"{label.lower()}.fulltext_search"
         )
-        
-        return results
 
 
 # Instance globale
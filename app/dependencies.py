@@ -0,0 +1,52 @@
+"""
+Dépendances FastAPI partagées par les routes
+"""
+from fastapi import Depends, HTTPException, status
+
+from app.auth import get_current_user_email
+from app.models.user import User
+from app.services.user import user_service
+
+
+async def get_current_user(email: str = Depends(get_current_user_email)) -> User:
+    """
+    Récupère l'utilisateur connecté depuis le cache (ou Neo4j)
+    
+    Args:
+        email: Email issu du token JWT
+    
+    Returns:
+        Utilisateur authentifié (sans le hash du mot de passe)
+    
+    Raises:
+        HTTPException: 401 si l'utilisateur n'existe plus
+    """
+    user = await user_service.get_cached_user_by_email(email)
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Impossible de valider les identifiants",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return user
+
+
+async def get_current_admin(current_user: User = Depends(get_current_user)) -> User:
+    """
+    Restreint une route aux administrateurs
+    
+    Args:
+        current_user: Utilisateur authentifié
+    
+    Returns:
+        Utilisateur administrateur
+    
+    Raises:
+        HTTPException: 403 si l'utilisateur n'est pas administrateur
+    """
+    if not current_user.is_admin:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Accès réservé aux administrateurs"
+        )
+    return current_user
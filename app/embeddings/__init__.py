@@ -0,0 +1,12 @@
+"""
+Package embeddings pour l'application Maison Manoé
+Regroupe les briques de calcul des embeddings vectoriels
+"""
+from app.embeddings.batcher import EmbeddingBatcher
+from app.embeddings.cache import EmbeddingCache, normalize_text
+
+__all__ = [
+    "EmbeddingBatcher",
+    "EmbeddingCache",
+    "normalize_text"
+]
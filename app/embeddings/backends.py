@@ -0,0 +1,164 @@
+"""
+Backends d'inférence pour les embeddings
+
+- "torch" : SentenceTransformer en pleine précision (PyTorch)
+- "onnx"  : modèle exporté vers ONNX Runtime, quantifié en int8 dynamique,
+  pour des serveurs CPU (voir app.embeddings.onnx_tools pour l'export)
+
+Les deux backends produisent des vecteurs de même dimension, avec le même
+pooling et la même normalisation : les embeddings déjà stockés dans
+l'index vectoriel restent comparables.
+"""
+import json
+import os
+from typing import List, Optional
+
+import numpy as np
+
+# Fichier de métadonnées écrit à l'export ONNX
+ONNX_CONFIG_FILE = "embedding_config.json"
+
+
+class EmbeddingBackend:
+    """Interface commune des backends d'embeddings"""
+    
+    name: str = ""
+    
+    @property
+    def dimension(self) -> int:
+        """Dimension des vecteurs produits"""
+        raise NotImplementedError
+    
+    def encode(self, texts: List[str]) -> np.ndarray:
+        """
+        Encode une liste de textes
+        
+        Args:
+            texts: Textes à encoder
+        
+        Returns:
+            Matrice float32 de forme (len(texts), dimension)
+        """
+        raise NotImplementedError
+
+
+class TorchEmbeddingBackend(EmbeddingBackend):
+    """Backend SentenceTransformer (PyTorch, pleine précision)"""
+    
+    name = "torch"
+    
+    def __init__(self, model_name: str):
+        # Import différé : sentence-transformers et torch sont lents à importer
+        from sentence_transformers import SentenceTransformer
+        
+        self.model = SentenceTransformer(model_name)
+    
+    @property
+    def dimension(self) -> int:
+        return self.model.get_sentence_embedding_dimension()
+    
+    def encode(self, texts: List[str]) -> np.ndarray:
+        return self.model.encode(
+            texts,
+            batch_size=max(1, len(texts)),
+            convert_to_numpy=True
+        ).astype(np.float32, copy=False)
+
+
+class OnnxEmbeddingBackend(EmbeddingBackend):
+    """Backend ONNX Runtime (CPU) pour un modèle exporté et quantifié en int8"""
+    
+    name = "onnx"
+    
+    def __init__(self, model_dir: str, num_threads: int = 0):
+        """
+        Args:
+            model_dir: Répertoire produit par l'export (modèle, tokenizer, config)
+            num_threads: Threads intra-op d'ONNX Runtime (0 = valeur par défaut)
+        """
+        try:
+            import onnxruntime as ort
+            from transformers import AutoTokenizer
+        except ImportError as e:
+            raise RuntimeError(
+                "Le backend 'onnx' nécessite onnxruntime et transformers "
+                "(pip install onnxruntime)"
+            ) from e
+        
+        config_path = os.path.join(model_dir, ONNX_CONFIG_FILE)
+        if not os.path.exists(config_path):
+            raise RuntimeError(
+                f"Modèle ONNX introuvable dans '{model_dir}'. "
+                "Exporter le modèle avec : python -m app.embeddings.onnx_tools export"
+            )
+        
+        with open(config_path, encoding="utf-8") as f:
+            self.config = json.load(f)
+        
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if num_threads:
+            options.intra_op_num_threads = num_threads
+        
+        self.session = ort.InferenceSession(
+            os.path.join(model_dir, self.config["model_file"]),
+            sess_options=options,
+            providers=["CPUExecutionProvider"]
+        )
+        self.tokenizer = AutoTokenizer.from_pretrained(model_dir)
+        self._input_names = {i.name for i in self.session.get_inputs()}
+    
+    @property
+    def dimension(self) -> int:
+        return self.config["dimension"]
+    
+    def encode(self, texts: List[str]) -> np.ndarray:
+        tokens = self.tokenizer(
+            texts,
+            padding=True,
+            truncation=True,
+            max_length=self.config["max_seq_length"],
+            return_tensors="np"
+        )
+        inputs = {
+            name: tokens[name].astype(np.int64)
+            for name in self._input_names
+            if name in tokens
+        }
+        (hidden_states,) = self.session.run(["last_hidden_state"], inputs)
+        
+        # Mean pooling masqué, identique au module Pooling de sentence-transformers
+        mask = tokens["attention_mask"][..., None].astype(np.float32)
+        summed = (hidden_states * mask).sum(axis=1)
+        embeddings = summed / np.clip(mask.sum(axis=1), 1e-9, None)
+        
+        if self.config.get("normalize", True):
+            norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+            embeddings = embeddings / np.clip(norms, 1e-12, None)
+        
+        return embeddings.astype(np.float32, copy=False)
+
+
+def load_backend(
+    name: str,
+    model_name: str,
+    onnx_path: Optional[str] = None,
+    num_threads: int = 0
+) -> EmbeddingBackend:
+    """
+    Instancie un backend d'embeddings
+    
+    Args:
+        name: "torch" ou "onnx"
+        model_name: Nom du modèle sentence-transformers (backend torch)
+        onnx_path: Répertoire du modèle exporté (backend onnx)
+        num_threads: Threads d'inférence ONNX Runtime (0 = défaut)
+    
+    Returns:
+        Backend prêt à encoder
+    """
+    if name == "torch":
+        return TorchEmbeddingBackend(model_name)
+    if name == "onnx":
+        return OnnxEmbeddingBackend(onnx_path, num_threads=num_threads)
+    raise ValueError(f"Backend d'embeddings inconnu: {name}")
@@ -0,0 +1,179 @@
+"""
+Micro-batching des appels d'encodage d'embeddings
+
+Les textes soumis par les coroutines sont mis en file d'attente puis encodés
+par lots sur un thread dédié, afin de mutualiser le coût d'un appel au modèle
+et de ne jamais bloquer la boucle d'événements.
+"""
+import asyncio
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+
+@dataclass
+class _PendingText:
+    """Texte en attente d'encodage et future à résoudre"""
+    text: str
+    future: asyncio.Future
+    loop: asyncio.AbstractEventLoop
+    enqueued_at: float
+
+
+def _resolve(future: asyncio.Future, value: Any, error: Optional[BaseException]):
+    """Résout une future depuis la boucle d'événements propriétaire"""
+    if future.done():
+        return
+    if error is not None:
+        future.set_exception(error)
+    else:
+        future.set_result(value)
+
+
+class EmbeddingBatcher:
+    """Regroupe les demandes d'encodage concurrentes en un seul appel au modèle"""
+    
+    def __init__(
+        self,
+        encode_batch: Callable[[List[str]], np.ndarray],
+        max_batch_size: int = 32,
+        max_wait_ms: float = 5.0
+    ):
+        """
+        Args:
+            encode_batch: Fonction encodant une liste de textes en matrice (n, dim)
+            max_batch_size: Taille maximale d'un lot
+            max_wait_ms: Fenêtre d'attente maximale avant de vider un lot incomplet
+        """
+        self._encode_batch = encode_batch
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000
+        
+        self._queue: "queue.Queue[Optional[_PendingText]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        
+        # Métriques
+        self._stats_lock = threading.Lock()
+        self._batches = 0
+        self._texts = 0
+        self._max_batch_size_seen = 0
+        self._queue_wait_total = 0.0
+        self._queue_wait_max = 0.0
+        self._encode_time_total = 0.0
+    
+    def start(self):
+        """Démarre le thread d'encodage s'il ne tourne pas déjà"""
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(
+                target=self._run,
+                name="embedding-batcher",
+                daemon=True
+            )
+            self._thread.start()
+    
+    def stop(self, timeout: float = 5.0):
+        """Arrête le thread d'encodage après avoir traité la file"""
+        with self._lock:
+            thread = self._thread
+            self._thread = None
+        if thread and thread.is_alive():
+            self._queue.put(None)
+            thread.join(timeout)
+    
+    async def embed(self, text: str) -> List[float]:
+        """
+        Encode un texte en le regroupant avec les demandes concurrentes
+        
+        Args:
+            text: Texte à encoder
+            
+        Returns:
+            Embedding sous forme de liste de floats
+        """
+        self.start()
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._queue.put(_PendingText(text, future, loop, time.perf_counter()))
+        return await future
+    
+    def stats(self) -> Dict[str, float]:
+        """Retourne les métriques de taille de lot et d'attente en file"""
+        with self._stats_lock:
+            batches = self._batches
+            return {
+                "batches": batches,
+                "texts": self._texts,
+                "pending": self._queue.qsize(),
+                "avg_batch_size": self._texts / batches if batches else 0.0,
+                "max_batch_size": self._max_batch_size_seen,
+                "avg_queue_wait_ms": 1000 * self._queue_wait_total / self._texts if self._texts else 0.0,
+                "max_queue_wait_ms": 1000 * self._queue_wait_max,
+                "avg_encode_ms": 1000 * self._encode_time_total / batches if batches else 0.0,
+            }
+    
+    def _collect_batch(self, first: _PendingText) -> List[_PendingText]:
+        """Complète un lot jusqu'à la taille max ou l'expiration de la fenêtre"""
+        batch = [first]
+        deadline = first.enqueued_at + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            try:
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                # Remettre la sentinelle pour terminer après ce lot
+                self._queue.put(None)
+                break
+            batch.append(item)
+        return batch
+    
+    def _run(self):
+        """Boucle du thread d'encodage"""
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+            
+            batch = self._collect_batch(first)
+            started = time.perf_counter()
+            self._record_batch(batch, started)
+            
+            try:
+                vectors = self._encode_batch([item.text for item in batch])
+                error = None
+            except Exception as e:
+                vectors, error = None, e
+            
+            with self._stats_lock:
+                self._encode_time_total += time.perf_counter() - started
+            
+            self._dispatch(batch, vectors, error)
+    
+    def _record_batch(self, batch: Sequence[_PendingText], started: float):
+        """Met à jour les métriques pour un lot sur le point d'être encodé"""
+        waits = [started - item.enqueued_at for item in batch]
+        with self._stats_lock:
+            self._batches += 1
+            self._texts += len(batch)
+            self._max_batch_size_seen = max(self._max_batch_size_seen, len(batch))
+            self._queue_wait_total += sum(waits)
+            self._queue_wait_max = max(self._queue_wait_max, max(waits))
+    
+    @staticmethod
+    def _dispatch(batch: Sequence[_PendingText], vectors: Optional[np.ndarray], error: Optional[BaseException]):
+        """Transmet chaque vecteur (ou l'erreur) à la future de son appelant"""
+        for i, item in enumerate(batch):
+            value = None if error is not None else vectors[i].tolist()
+            try:
+                item.loop.call_soon_threadsafe(_resolve, item.future, value, error)
+            except RuntimeError:
+                # Boucle fermée : l'appelant n'attend plus le résultat
+                pass
@@ -0,0 +1,225 @@
+"""
+Cache des embeddings de requêtes
+
+Un niveau mémoire LRU borné, éventuellement adossé à un niveau SQLite
+persistant qui survit aux redémarrages. Les clés combinent le texte
+normalisé et le nom du modèle, de sorte qu'un changement de modèle ne
+réutilise jamais d'anciens vecteurs.
+
+Seul le niveau mémoire est consulté sur la boucle d'événements : les
+lectures SQLite passent par un thread (get_async) et les écritures sont
+regroupées par un thread d'écriture, avec un commit par lot.
+"""
+import asyncio
+import re
+import sqlite3
+import threading
+import unicodedata
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    """Normalise un texte de requête (Unicode NFC, casse, espaces)"""
+    text = unicodedata.normalize("NFC", text)
+    return _WHITESPACE.sub(" ", text).strip().lower()
+
+
+class EmbeddingCache:
+    """Cache LRU d'embeddings avec niveau persistant SQLite optionnel"""
+    
+    def __init__(
+        self,
+        model_name: str,
+        max_size: int = 1024,
+        path: Optional[str] = None,
+        flush_interval: float = 0.5
+    ):
+        """
+        Args:
+            model_name: Nom du modèle, inclus dans chaque clé
+            max_size: Nombre maximal d'entrées en mémoire (0 désactive le niveau mémoire)
+            path: Chemin du fichier SQLite persistant (None ou vide pour désactiver)
+            flush_interval: Délai de regroupement des écritures SQLite (secondes)
+        """
+        self.model_name = model_name
+        self.max_size = max(0, max_size)
+        self.flush_interval = flush_interval
+        self._entries: "OrderedDict[Tuple[str, str], List[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        
+        # Écritures en attente de commit, visibles des lectures en attendant
+        self._pending: Dict[Tuple[str, str], bytes] = {}
+        self._wake = threading.Event()
+        self._closing = threading.Event()
+        self._writer: Optional[threading.Thread] = None
+        
+        # Accès à la connexion SQLite (threads de lecture et d'écriture)
+        self._db_lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        if path:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.execute(
+                """
+                CREATE TABLE IF NOT EXISTS embeddings (
+                    model TEXT NOT NULL,
+                    text TEXT NOT NULL,
+                    vector BLOB NOT NULL,
+                    PRIMARY KEY (model, text)
+                )
+                """
+            )
+            self._db.commit()
+        
+        # Compteurs
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+    
+    def _key(self, text: str) -> Tuple[str, str]:
+        return (self.model_name, normalize_text(text))
+    
+    def get(self, text: str) -> Optional[List[float]]:
+        """Retourne l'embedding en cache pour ce texte, ou None (lecture SQLite bloquante)"""
+        key = self._key(text)
+        vector = self._lookup_memory(key)
+        if vector is not None:
+            return vector
+        return self._lookup_disk(key)
+    
+    async def get_async(self, text: str) -> Optional[List[float]]:
+        """Comme get, la lecture SQLite éventuelle étant faite sur un thread"""
+        key = self._key(text)
+        vector = self._lookup_memory(key)
+        if vector is not None or self._db is None:
+            if vector is None:
+                with self._lock:
+                    self.misses += 1
+            return vector
+        return await asyncio.to_thread(self._lookup_disk, key)
+    
+    def put(self, text: str, vector: List[float]):
+        """
+        Enregistre l'embedding d'un texte dans tous les niveaux actifs
+        
+        Sans attente disque : l'écriture SQLite est confiée au thread
+        d'écriture, qui commite par lots.
+        """
+        key = self._key(text)
+        
+        with self._lock:
+            self._remember(key, vector)
+            if self._db is None:
+                return
+            self._pending[key] = np.asarray(vector, dtype=np.float32).tobytes()
+            if self._writer is None:
+                self._writer = threading.Thread(target=self._write_loop, name="embedding-cache-writer", daemon=True)
+                self._writer.start()
+        self._wake.set()
+    
+    def _lookup_memory(self, key: Tuple[str, str]) -> Optional[List[float]]:
+        """Niveau mémoire et écritures en attente ; ne compte que les succès"""
+        with self._lock:
+            vector = self._entries.get(key)
+            if vector is None and key in self._pending:
+                vector = np.frombuffer(self._pending[key], dtype=np.float32).tolist()
+                self._remember(key, vector)
+            elif vector is not None:
+                self._entries.move_to_end(key)
+            if vector is not None:
+                self.hits += 1
+            return vector
+    
+    def _lookup_disk(self, key: Tuple[str, str]) -> Optional[List[float]]:
+        """Niveau SQLite (bloquant) ; compte le succès ou l'échec"""
+        row = None
+        with self._db_lock:
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT vector FROM embeddings WHERE model = ? AND text = ?",
+                    key
+                ).fetchone()
+        
+        with self._lock:
+            if row is None:
+                self.misses += 1
+                return None
+            vector = np.frombuffer(row[0], dtype=np.float32).tolist()
+            self._remember(key, vector)
+            self.hits += 1
+            self.disk_hits += 1
+            return vector
+    
+    def _write_loop(self):
+        """Thread d'écriture : regroupe les insertions proches en un commit"""
+        while not self._closing.is_set():
+            self._wake.wait()
+            self._closing.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+    
+    def flush(self):
+        """Écrit les embeddings en attente dans SQLite, en une transaction"""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return
+        
+        with self._db_lock:
+            if self._db is None:
+                return
+            try:
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO embeddings (model, text, vector) VALUES (?, ?, ?)",
+                    [(*key, blob) for key, blob in pending.items()]
+                )
+                self._db.commit()
+            except sqlite3.Error as e:
+                print(f"✗ Écriture du cache d'embeddings impossible: {e}")
+    
+    def _remember(self, key: Tuple[str, str], vector: List[float]):
+        """Insère dans le niveau mémoire en évinçant l'entrée la moins récente"""
+        if not self.max_size:
+            return
+        self._entries[key] = vector
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+    
+    def clear(self):
+        """Vide le niveau mémoire (le niveau persistant est conservé)"""
+        with self._lock:
+            self._entries.clear()
+    
+    def close(self):
+        """Écrit les embeddings en attente puis ferme le niveau persistant"""
+        self._closing.set()
+        self._wake.set()
+        if self._writer is not None:
+            self._writer.join()
+            self._writer = None
+        self.flush()
+        with self._db_lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+    
+    def stats(self) -> Dict[str, float]:
+        """Retourne les compteurs de succès et d'échecs du cache"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "pending_writes": len(self._pending),
+            }
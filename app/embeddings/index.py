@@ -0,0 +1,190 @@
+"""
+Index vectoriel en mémoire (miroir local de l'index Neo4j)
+
+Les embeddings des produits sont conservés dans une matrice NumPy float32
+normalisée : une recherche top-k se résume à un produit matrice-vecteur,
+sans aller-retour réseau. Neo4j reste la source de vérité ; l'index est
+chargé au démarrage puis tenu à jour par ProductService.
+"""
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+
+class LocalVectorIndex:
+    """Recherche exacte par similarité cosinus sur une matrice en mémoire"""
+    
+    def __init__(self, dimension: int, initial_capacity: int = 1024):
+        """
+        Args:
+            dimension: Dimension des embeddings
+            initial_capacity: Nombre de lignes pré-allouées
+        """
+        self.dimension = dimension
+        self._matrix = np.zeros((initial_capacity, dimension), dtype=np.float32)
+        self._prices = np.zeros(initial_capacity, dtype=np.float64)
+        # Catégorie et statut codés en entiers (vocabulaire partagé, -1 = absent)
+        self._categories = np.full(initial_capacity, -1, dtype=np.int32)
+        self._statuses = np.full(initial_capacity, -1, dtype=np.int32)
+        self._vocabulary: Dict[str, int] = {}
+        self._ids: List[str] = []
+        self._rows: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.loaded = False
+    
+    def __len__(self) -> int:
+        return len(self._ids)
+    
+    def __contains__(self, product_id: str) -> bool:
+        return product_id in self._rows
+    
+    @staticmethod
+    def _normalize(vector: Iterable[float]) -> np.ndarray:
+        array = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(array)
+        return array / norm if norm > 0 else array
+    
+    def _ensure_capacity(self, size: int):
+        capacity = self._matrix.shape[0]
+        if size <= capacity:
+            return
+        new_capacity = max(size, capacity * 2)
+        matrix = np.zeros((new_capacity, self.dimension), dtype=np.float32)
+        matrix[:capacity] = self._matrix
+        self._matrix = matrix
+        self._prices = self._grow(self._prices, new_capacity, 0.0)
+        self._categories = self._grow(self._categories, new_capacity, -1)
+        self._statuses = self._grow(self._statuses, new_capacity, -1)
+    
+    @staticmethod
+    def _grow(array: np.ndarray, capacity: int, fill: Any) -> np.ndarray:
+        grown = np.full(capacity, fill, dtype=array.dtype)
+        grown[:len(array)] = array
+        return grown
+    
+    def _code(self, value: Optional[str]) -> int:
+        """Code entier d'une valeur de catégorie/statut (créé si nécessaire)"""
+        if value is None:
+            return -1
+        return self._vocabulary.setdefault(value, len(self._vocabulary))
+    
+    def load(self, products: Iterable[Dict[str, Any]]):
+        """
+        Remplace le contenu de l'index
+        
+        Args:
+            products: Dictionnaires avec id, embedding, category, status, price
+        """
+        with self._lock:
+            self._ids, self._rows = [], {}
+            for product in products:
+                self._upsert(product)
+            self.loaded = True
+    
+    def upsert(self, product: Dict[str, Any]):
+        """Ajoute ou remplace un produit (ignoré s'il n'a pas d'embedding)"""
+        with self._lock:
+            self._upsert(product)
+    
+    def _upsert(self, product: Dict[str, Any]):
+        embedding = product.get("embedding")
+        if not embedding or len(embedding) != self.dimension:
+            return
+        
+        product_id = product["id"]
+        row = self._rows.get(product_id)
+        if row is None:
+            row = len(self._ids)
+            self._ensure_capacity(row + 1)
+            self._rows[product_id] = row
+            self._ids.append(product_id)
+        
+        self._matrix[row] = self._normalize(embedding)
+        self._categories[row] = self._code(product.get("category"))
+        self._statuses[row] = self._code(product.get("status"))
+        self._prices[row] = product.get("price") or 0.0
+    
+    def update_metadata(self, product_id: str, fields: Dict[str, Any]):
+        """Met à jour les attributs filtrables d'un produit déjà indexé"""
+        with self._lock:
+            row = self._rows.get(product_id)
+            if row is None:
+                return
+            if "category" in fields:
+                self._categories[row] = self._code(fields["category"])
+            if "status" in fields:
+                self._statuses[row] = self._code(fields["status"])
+            if fields.get("price") is not None:
+                self._prices[row] = fields["price"]
+    
+    def remove(self, product_id: str):
+        """Retire un produit (la dernière ligne prend sa place)"""
+        with self._lock:
+            row = self._rows.pop(product_id, None)
+            if row is None:
+                return
+            
+            last = len(self._ids) - 1
+            if row != last:
+                moved_id = self._ids[last]
+                self._matrix[row] = self._matrix[last]
+                self._prices[row] = self._prices[last]
+                self._ids[row] = moved_id
+                self._categories[row] = self._categories[last]
+                self._statuses[row] = self._statuses[last]
+                self._rows[moved_id] = row
+            
+            self._ids.pop()
+    
+    def search(
+        self,
+        query_vector: List[float],
+        top_k: int = 10,
+        min_score: float = 0.0,
+        category: Optional[str] = None,
+        status: Optional[str] = None,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None
+    ) -> List[Tuple[str, float]]:
+        """
+        Recherche les produits les plus proches d'un vecteur
+        
+        Les scores suivent la convention de l'index cosinus de Neo4j,
+        (1 + cos) / 2 dans [0, 1], afin que `min_score` garde le même sens
+        quel que soit le moteur.
+        
+        Args:
+            query_vector: Embedding de la requête
+            top_k: Nombre de résultats
+            min_score: Score minimum
+            category, status, min_price, max_price: Filtres optionnels
+        
+        Returns:
+            Liste de (product_id, score) triée par score décroissant
+        """
+        query = self._normalize(query_vector)
+        
+        with self._lock:
+            size = len(self._ids)
+            if not size:
+                return []
+            
+            scores = (self._matrix[:size] @ query + 1.0) / 2.0
+            mask = scores >= min_score
+            if category is not None:
+                mask &= self._categories[:size] == self._vocabulary.get(category, -2)
+            if status is not None:
+                mask &= self._statuses[:size] == self._vocabulary.get(status, -2)
+            if min_price is not None:
+                mask &= self._prices[:size] >= min_price
+            if max_price is not None:
+                mask &= self._prices[:size] <= max_price
+            
+            candidates = np.flatnonzero(mask)
+            if len(candidates) > top_k:
+                top = np.argpartition(scores[candidates], -top_k)[-top_k:]
+                candidates = candidates[top]
+            ordered = candidates[np.argsort(-scores[candidates], kind="stable")]
+            
+            return [(self._ids[i], float(scores[i])) for i in ordered]
@@ -0,0 +1,217 @@
+"""
+Export ONNX int8 du modèle d'embeddings et contrôle de parité
+
+Usage :
+    python -m app.embeddings.onnx_tools export [--output models/all-MiniLM-L6-v2-int8]
+    python -m app.embeddings.onnx_tools parity [--texts fichier.txt]
+
+Le contrôle de parité encode les mêmes textes avec les backends torch et onnx
+et rapporte la dérive cosinus (1 - similarité) entre les deux, ainsi que la
+latence moyenne de chacun.
+"""
+import argparse
+import json
+import os
+import time
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.config import settings
+from app.embeddings.backends import (
+    ONNX_CONFIG_FILE,
+    EmbeddingBackend,
+    OnnxEmbeddingBackend,
+    TorchEmbeddingBackend
+)
+
+# Textes représentatifs du catalogue et des requêtes clients
+DEFAULT_PARITY_TEXTS = [
+    "vase",
+    "bougie",
+    "coussin lin",
+    "plaid en laine mérinos",
+    "lampe de chevet en bois",
+    "miroir rotin",
+    "Vase en céramique fait main par un artisan provençal. Chaque pièce est unique.",
+    "Bougie naturelle en cire de soja avec mèches en coton, parfum lavande et bergamote.",
+    "Coussin en lin lavé 100% naturel, housse amovible avec fermeture éclair invisible.",
+    "Panier de rangement tressé à la main en jonc de mer naturel, style bohème.",
+]
+
+
+def export_onnx(model_name: str, output_dir: str, quantize: bool = True, opset: int = 14) -> str:
+    """
+    Exporte le transformer d'un modèle sentence-transformers vers ONNX
+    
+    Args:
+        model_name: Nom du modèle sentence-transformers
+        output_dir: Répertoire de sortie (modèle, tokenizer, config)
+        quantize: Appliquer la quantification dynamique int8
+        opset: Version d'opset ONNX
+    
+    Returns:
+        Chemin du fichier ONNX utilisé par le backend
+    """
+    import torch
+    from sentence_transformers import SentenceTransformer
+    from sentence_transformers.models import Normalize
+    
+    os.makedirs(output_dir, exist_ok=True)
+    st_model = SentenceTransformer(model_name, device="cpu")
+    transformer = st_model[0].auto_model.eval()
+    tokenizer = st_model.tokenizer
+    
+    class _LastHiddenState(torch.nn.Module):
+        """Expose uniquement last_hidden_state pour l'export"""
+        
+        def __init__(self, model):
+            super().__init__()
+            self.model = model
+        
+        def forward(self, input_ids, attention_mask, token_type_ids):
+            return self.model(
+                input_ids=input_ids,
+                attention_mask=attention_mask,
+                token_type_ids=token_type_ids
+            ).last_hidden_state
+    
+    sample = tokenizer(["exemple de texte"], return_tensors="pt")
+    if "token_type_ids" not in sample:
+        sample["token_type_ids"] = torch.zeros_like(sample["input_ids"])
+    
+    fp32_path = os.path.join(output_dir, "model.onnx")
+    dynamic = {0: "batch", 1: "sequence"}
+    with torch.no_grad():
+        torch.onnx.export(
+            _LastHiddenState(transformer),
+            (sample["input_ids"], sample["attention_mask"], sample["token_type_ids"]),
+            fp32_path,
+            input_names=["input_ids", "attention_mask", "token_type_ids"],
+            output_names=["last_hidden_state"],
+            dynamic_axes={
+                "input_ids": dynamic,
+                "attention_mask": dynamic,
+                "token_type_ids": dynamic,
+                "last_hidden_state": dynamic
+            },
+            opset_version=opset
+        )
+    
+    model_file = "model.onnx"
+    if quantize:
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+        
+        model_file = "model_int8.onnx"
+        quantize_dynamic(
+            fp32_path,
+            os.path.join(output_dir, model_file),
+            weight_type=QuantType.QInt8
+        )
+    
+    tokenizer.save_pretrained(output_dir)
+    config = {
+        "source_model": model_name,
+        "model_file": model_file,
+        "quantized": quantize,
+        "dimension": st_model.get_sentence_embedding_dimension(),
+        "max_seq_length": st_model.max_seq_length,
+        "normalize": any(isinstance(module, Normalize) for module in st_model)
+    }
+    with open(os.path.join(output_dir, ONNX_CONFIG_FILE), "w", encoding="utf-8") as f:
+        json.dump(config, f, indent=2)
+    
+    return os.path.join(output_dir, model_file)
+
+
+def _timed_encode(backend: EmbeddingBackend, texts: List[str], repeats: int) -> Tuple[np.ndarray, float]:
+    """Encode texte par texte et retourne les vecteurs et la latence moyenne (ms)"""
+    backend.encode(texts[:1])  # Échauffement
+    vectors = []
+    started = time.perf_counter()
+    for _ in range(repeats):
+        vectors = [backend.encode([text])[0] for text in texts]
+    elapsed = time.perf_counter() - started
+    return np.stack(vectors), 1000 * elapsed / (repeats * len(texts))
+
+
+def check_parity(
+    reference: EmbeddingBackend,
+    candidate: EmbeddingBackend,
+    texts: Optional[List[str]] = None,
+    repeats: int = 3
+) -> Dict[str, float]:
+    """
+    Compare deux backends sur les mêmes textes
+    
+    Args:
+        reference: Backend de référence (torch)
+        candidate: Backend évalué (onnx)
+        texts: Textes à encoder (DEFAULT_PARITY_TEXTS par défaut)
+        repeats: Nombre de passes pour la mesure de latence
+    
+    Returns:
+        Dérive cosinus moyenne/max, similarité min et latences par requête
+    """
+    texts = texts or DEFAULT_PARITY_TEXTS
+    ref_vectors, ref_ms = _timed_encode(reference, texts, repeats)
+    cand_vectors, cand_ms = _timed_encode(candidate, texts, repeats)
+    
+    ref_vectors = ref_vectors / np.linalg.norm(ref_vectors, axis=1, keepdims=True)
+    cand_vectors = cand_vectors / np.linalg.norm(cand_vectors, axis=1, keepdims=True)
+    cosines = (ref_vectors * cand_vectors).sum(axis=1)
+    drift = 1.0 - cosines
+    
+    return {
+        "texts": len(texts),
+        "mean_cosine_drift": float(drift.mean()),
+        "max_cosine_drift": float(drift.max()),
+        "min_cosine_similarity": float(cosines.min()),
+        f"{reference.name}_ms_per_query": ref_ms,
+        f"{candidate.name}_ms_per_query": cand_ms,
+        "speedup": ref_ms / cand_ms if cand_ms else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export ONNX et contrôle de parité des embeddings")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    
+    export_parser = subparsers.add_parser("export", help="Exporter le modèle vers ONNX")
+    export_parser.add_argument("--model", default=settings.embedding_model)
+    export_parser.add_argument("--output", default=settings.embedding_onnx_path)
+    export_parser.add_argument("--no-quantize", action="store_true", help="Conserver les poids float32")
+    
+    parity_parser = subparsers.add_parser("parity", help="Comparer les backends torch et onnx")
+    parity_parser.add_argument("--model", default=settings.embedding_model)
+    parity_parser.add_argument("--onnx-path", default=settings.embedding_onnx_path)
+    parity_parser.add_argument("--texts", help="Fichier texte, une requête par ligne")
+    parity_parser.add_argument("--max-drift", type=float, default=0.02, help="Dérive moyenne tolérée")
+    
+    args = parser.parse_args()
+    
+    if args.command == "export":
+        path = export_onnx(args.model, args.output, quantize=not args.no_quantize)
+        print(f"✓ Modèle ONNX exporté : {path}")
+        return
+    
+    texts = None
+    if args.texts:
+        with open(args.texts, encoding="utf-8") as f:
+            texts = [line.strip() for line in f if line.strip()]
+    
+    report = check_parity(
+        TorchEmbeddingBackend(args.model),
+        OnnxEmbeddingBackend(args.onnx_path, num_threads=settings.embedding_onnx_threads),
+        texts
+    )
+    print(json.dumps(report, indent=2))
+    
+    if report["mean_cosine_drift"] > args.max_drift:
+        print(f"✗ Dérive cosinus moyenne supérieure à {args.max_drift}")
+        raise SystemExit(1)
+    print("✓ Parité torch / onnx respectée")
+
+
+if __name__ == "__main__":
+    main()
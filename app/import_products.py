@@ -0,0 +1,41 @@
+"""
+Import en masse de produits depuis un fichier NDJSON ou CSV
+
+Usage :
+    python -m app.import_products catalogue.ndjson [--format csv] [--chunk-size 500]
+"""
+import argparse
+import asyncio
+
+from app.database import neo4j_db
+from app.services.product import product_service
+from app.services.product_import import detect_format, iter_rows
+
+
+async def import_file(path: str, file_format: str, chunk_size: int):
+    """Importe un fichier et affiche le bilan"""
+    try:
+        with open(path, encoding="utf-8-sig", newline="") as f:
+            report = await product_service.bulk_create_products(
+                iter_rows(f, file_format),
+                chunk_size=chunk_size
+            )
+    finally:
+        await neo4j_db.close_async()
+    
+    print(f"\n✅ {report.created} produits créés, {report.failed} en erreur")
+    print(f"⏱  {report.duration_seconds:.1f} s ({report.rows_per_second:.0f} lignes/s)")
+    for error in report.errors:
+        print(f"✗ Ligne {error.line}: {error.error}")
+    if report.failed > len(report.errors):
+        print(f"… {report.failed - len(report.errors)} autres erreurs non détaillées")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Import en masse de produits (NDJSON ou CSV)")
+    parser.add_argument("path", help="Fichier à importer")
+    parser.add_argument("--format", choices=["ndjson", "csv"], help="Format (déduit de l'extension sinon)")
+    parser.add_argument("--chunk-size", type=int, default=0, help="Produits par transaction")
+    args = parser.parse_args()
+    
+    asyncio.run(import_file(args.path, args.format or detect_format(args.path), args.chunk_size))
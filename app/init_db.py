@@ -2,7 +2,7 @@
 Script d'initialisation de la base de données Neo4j
 """
 from app.database import neo4j_db
-from app.models import ProductCreate
+from app.models import ProductCreate, PRODUCT_SEARCH_FIELDS
 from app.services.product import product_service
 import asyncio
 
@@ -93,14 +93,11 @@ async def create_sample_products():
     
     print("\n🌱 Création des produits d'exemple...\n")
     
-    for product_data in sample_products:
-        try:
-            product = await product_service.create_product(product_data)
-            print(f"✓ Produit créé: {product.name} (ID: {product.id})")
-        except Exception as e:
-            print(f"✗ Erreur lors de la création de {product_data.name}: {e}")
+    report = await product_service.bulk_create_products(enumerate(sample_products, 1))
+    for error in report.errors:
+        print(f"✗ Erreur lors de la création de {sample_products[error.line - 1].name}: {error.error}")
     
-    print("\n✅ Produits d'exemple créés avec succès!\n")
+    print(f"\n✅ {report.created} produits d'exemple créés avec succès!\n")
 
 
 async def init_database():
@@ -121,7 +118,7 @@ async def init_database():
     
     for constraint in constraints:
         try:
-            neo4j_db.execute_query(constraint)
+            neo4j_db.execute_query(constraint, name="init.constraint")
             print(f"✓ Contrainte créée")
         except Exception as e:
             print(f"⚠ {e}")
@@ -129,6 +126,8 @@ async def init_database():
     # Créer les index vectoriels
     print("\n🔍 Création des index vectoriels...")
     neo4j_db.create_vector_index("Product", "embedding")
+    neo4j_db.create_product_indexes()
+    neo4j_db.create_fulltext_index("Product", list(PRODUCT_SEARCH_FIELDS))
     
     # Créer des produits d'exemple
     await create_sample_products()
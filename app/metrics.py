@@ -0,0 +1,395 @@
+"""
+Métriques au format texte Prometheus (sans dépendance externe)
+
+Compteurs, jauges et histogrammes étiquetés, enregistrés dans un registre
+global et exposés par GET /metrics. L'enregistrement d'une mesure se
+résume à une recherche dans un dictionnaire et une addition sous verrou :
+les métriques peuvent être alimentées depuis les chemins critiques
+(requêtes HTTP, requêtes Neo4j, encodage des embeddings).
+"""
+import asyncio
+import bisect
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+# Bornes par défaut des histogrammes de durée (secondes)
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class _Metric:
+    """Base commune : nom, aide, étiquettes et séries par combinaison d'étiquettes"""
+    
+    kind = ""
+    
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+    
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+    
+    def _label_text(self, key: Tuple[str, ...], extra: str = "") -> str:
+        parts = [f'{name}="{_escape(value)}"' for name, value in zip(self.labelnames, key)]
+        if extra:
+            parts.append(extra)
+        return "{" + ",".join(parts) + "}" if parts else ""
+    
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self._samples())
+        return lines
+    
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """Valeur croissante (nombre d'événements)"""
+    
+    kind = "counter"
+    
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+    
+    def inc(self, amount: float = 1.0, **labels: str):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+    
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = list(self._values.items())
+        return [f"{self.name}{self._label_text(key)} {_format_value(value)}" for key, value in items]
+
+
+class Gauge(_Metric):
+    """Valeur instantanée, éventuellement calculée à la lecture"""
+    
+    kind = "gauge"
+    
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        function: Optional[Callable[[], float]] = None
+    ):
+        """
+        Args:
+            function: Fonction appelée à chaque export (jauge sans étiquette)
+        """
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._function = function
+    
+    def set(self, value: float, **labels: str):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+    
+    def inc(self, amount: float = 1.0, **labels: str):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+    
+    def dec(self, amount: float = 1.0, **labels: str):
+        self.inc(-amount, **labels)
+    
+    def _samples(self) -> List[str]:
+        if self._function is not None:
+            return [f"{self.name} {_format_value(self._function())}"]
+        with self._lock:
+            items = list(self._values.items())
+        return [f"{self.name}{self._label_text(key)} {_format_value(value)}" for key, value in items]
+
+
+class Histogram(_Metric):
+    """Distribution de valeurs (durées, tailles) par intervalles cumulés"""
+    
+    kind = "histogram"
+    
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Par série : [compte par intervalle..., somme, nombre]
+        self._series: Dict[Tuple[str, ...], List[float]] = {}
+    
+    def observe(self, value: float, **labels: str):
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [0.0] * (len(self.buckets) + 3)
+            series[index] += 1
+            series[-2] += value
+            series[-1] += 1
+    
+    def time(self, **labels: str) -> "_Timer":
+        """Mesure la durée d'un bloc `with` en secondes"""
+        return _Timer(self, labels)
+    
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = [(key, list(series)) for key, series in self._series.items()]
+        
+        lines = []
+        for key, series in items:
+            cumulative = 0.0
+            for bound, count in zip(self.buckets + (float("inf"),), series):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{self._label_text(key, le)} {_format_value(cumulative)}")
+            lines.append(f"{self.name}_sum{self._label_text(key)} {_format_value(series[-2])}")
+            lines.append(f"{self.name}_count{self._label_text(key)} {_format_value(series[-1])}")
+        return lines
+
+
+class _Timer:
+    """Gestionnaire de contexte alimentant un histogramme de durée"""
+    
+    __slots__ = ("_histogram", "_labels", "_started")
+    
+    def __init__(self, histogram: Histogram, labels: Dict[str, str]):
+        self._histogram = histogram
+        self._labels = labels
+    
+    def __enter__(self):
+        self._started = time.perf_counter()
+        return self
+    
+    def __exit__(self, *exc):
+        self._histogram.observe(time.perf_counter() - self._started, **self._labels)
+        return False
+
+
+class Registry:
+    """Ensemble des métriques exposées"""
+    
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+    
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics.append(metric)
+        return metric
+    
+    def render(self) -> str:
+        """Export au format texte Prometheus 0.0.4"""
+        lines: List[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+# Registre global
+registry = Registry()
+
+# HTTP
+http_request_duration = registry.register(Histogram(
+    "http_request_duration_seconds",
+    "Durée des requêtes HTTP par route",
+    ("method", "route", "status")
+))
+http_requests_in_flight = registry.register(Gauge(
+    "http_requests_in_flight",
+    "Requêtes HTTP en cours de traitement"
+))
+
+# Neo4j
+neo4j_query_duration = registry.register(Histogram(
+    "neo4j_query_duration_seconds",
+    "Durée des requêtes Cypher par nom de requête",
+    ("query",)
+))
+neo4j_query_errors = registry.register(Counter(
+    "neo4j_query_errors_total",
+    "Requêtes Cypher en erreur par nom de requête",
+    ("query",)
+))
+# Compté autour de execute_query(_async) : le driver n'expose pas l'occupation
+# de son pool. Rapportée à neo4j_pool_max_size du même driver, cette jauge
+# donne une approximation de la saturation, pas une mesure (les connexions
+# des requêtes internes au driver et celles en cours d'ouverture échappent)
+neo4j_queries_in_flight = registry.register(Gauge(
+    "neo4j_queries_in_flight",
+    "Requêtes Cypher en cours d'exécution par driver (approximation de l'occupation du pool)",
+    ("driver",)
+))
+neo4j_pool_max_size = registry.register(Gauge(
+    "neo4j_pool_max_size",
+    "Taille maximale du pool de connexions par driver Neo4j",
+    ("driver",)
+))
+
+# Embeddings
+embedding_encode_duration = registry.register(Histogram(
+    "embedding_encode_duration_seconds",
+    "Durée d'un appel au modèle d'embeddings",
+    ("source",)
+))
+embedding_batch_size = registry.register(Histogram(
+    "embedding_batch_size",
+    "Nombre de textes encodés par appel au modèle",
+    ("source",),
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256, 512)
+))
+
+# Boucle d'événements (étiquetée par processus : un worker uvicorn par série)
+event_loop_lag = registry.register(Histogram(
+    "event_loop_lag_seconds",
+    "Retard de réveil d'une tâche périodique sur la boucle d'événements",
+    ("pid",),
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+))
+
+# Recherche
+search_results = registry.register(Histogram(
+    "search_results",
+    "Nombre de résultats retournés par recherche",
+    ("mode",),
+    buckets=(0, 1, 5, 10, 20, 50, 100)
+))
+
+
+class EventLoopMonitor:
+    """
+    Mesure le retard de la boucle d'événements
+    
+    Une tâche se réveille toutes les `interval` secondes ; le temps écoulé
+    au-delà de l'intervalle prévu est le temps pendant lequel la boucle
+    était occupée par du code synchrone (bcrypt, sérialisation, encodage).
+    """
+    
+    def __init__(self, interval: float = 0.1):
+        """
+        Args:
+            interval: Période de mesure en secondes (0 = désactivé)
+        """
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+    
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+    
+    def start(self):
+        """Démarre la mesure (à appeler depuis la boucle d'événements)"""
+        if self.interval <= 0 or self.running:
+            return
+        self._task = asyncio.create_task(self._run())
+    
+    async def stop(self):
+        if not self.running:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+    
+    async def _run(self):
+        pid = str(os.getpid())
+        while True:
+            scheduled = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            event_loop_lag.observe(max(0.0, time.perf_counter() - scheduled - self.interval), pid=pid)
+
+
+class RouteTemplates:
+    """
+    Retrouve le gabarit de la route ayant traité une requête ASGI
+    
+    Les requêtes sont étiquetées par gabarit (/api/products/{product_id})
+    et non par chemin, pour garder un nombre de séries borné.
+    """
+    
+    def __init__(self):
+        self._routes: Optional[Dict[Any, List[Any]]] = None
+    
+    def _index_routes(self, app):
+        """Associe chaque endpoint (ou application montée) à ses routes"""
+        routes: Dict[Any, List[Any]] = {}
+        for route in getattr(app, "routes", []):
+            endpoint = getattr(route, "endpoint", None) or getattr(route, "app", None)
+            if endpoint is not None:
+                routes.setdefault(endpoint, []).append(route)
+        self._routes = routes
+    
+    def resolve(self, scope, path: str) -> str:
+        """
+        Args:
+            scope: Scope ASGI après routage (contient l'endpoint)
+            path: Chemin d'origine (le routeur le réécrit sous un montage)
+        
+        Returns:
+            Gabarit de la route, ou "unmatched" si aucune
+        """
+        if self._routes is None:
+            self._index_routes(scope["app"])
+        
+        candidates = self._routes.get(scope.get("endpoint"), ())
+        if len(candidates) == 1:
+            return candidates[0].path
+        # Endpoint déclaré sous plusieurs chemins (alias) : départager sur le chemin
+        for route in candidates:
+            if route.path_regex.match(path):
+                return route.path
+        return "unmatched"
+
+
+class MetricsMiddleware:
+    """Middleware ASGI mesurant la durée des requêtes HTTP par route"""
+    
+    def __init__(self, app):
+        self.app = app
+        self.routes = RouteTemplates()
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        status_code = 500
+        
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+        
+        # Le routeur réécrit scope["path"] sous un montage (/static) : chemin d'origine
+        path = scope["path"]
+        started = time.perf_counter()
+        http_requests_in_flight.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            http_requests_in_flight.dec()
+            http_request_duration.observe(
+                time.perf_counter() - started,
+                method=scope["method"],
+                route=self.routes.resolve(scope, path),
+                status=str(status_code)
+            )
@@ -8,7 +8,11 @@ from app.models.product import (
     ProductCreate,
     ProductUpdate,
     SearchQuery,
-    SearchResult
+    SearchResult,
+    ProductImportError,
+    ProductImportReport,
+    PRODUCT_FIELDS,
+    PRODUCT_SEARCH_FIELDS
 )
 from app.models.promo import (
     PromoBase,
@@ -23,7 +27,8 @@ from app.models.user import (
     UserInDB,
     Token,
     TokenData,
-    LoginRequest
+    LoginRequest,
+    RefreshRequest
 )
 
 __all__ = [
@@ -34,6 +39,10 @@ __all__ = [
     "ProductUpdate",
     "SearchQuery",
     "SearchResult",
+    "ProductImportError",
+    "ProductImportReport",
+    "PRODUCT_FIELDS",
+    "PRODUCT_SEARCH_FIELDS",
     # Promo models
     "PromoBase",
     "Promo",
@@ -46,5 +55,6 @@ __all__ = [
     "UserInDB",
     "Token",
     "TokenData",
-    "LoginRequest"
+    "LoginRequest",
+    "RefreshRequest"
 ]
@@ -48,11 +48,19 @@ class Product(ProductBase):
     id: str
     created_at: datetime = Field(default_factory=datetime.now)
     updated_at: datetime = Field(default_factory=datetime.now)
-    embedding: Optional[List[float]] = None  # Vecteur d'embedding pour recherche sémantique
+    # Vecteur d'embedding pour recherche sémantique (jamais sérialisé dans les réponses)
+    embedding: Optional[List[float]] = Field(None, exclude=True)
     
     model_config = ConfigDict(from_attributes=True)
 
 
+# Propriétés d'un produit exposées par l'API (tout sauf l'embedding)
+PRODUCT_FIELDS = tuple(name for name in Product.model_fields if name != "embedding")
+
+# Propriétés textuelles indexées pour la recherche plein texte
+PRODUCT_SEARCH_FIELDS = ("name", "description", "short_description", "category")
+
+
 class ProductCreate(ProductBase):
     """Modèle pour créer un produit"""
     pass
@@ -84,6 +92,13 @@ class SearchQuery(BaseModel):
     max_price: Optional[float] = Field(None, ge=0)
     status: Optional[str] = Field(None, pattern="^(draft|online|out-of-stock)$")
     use_semantic: bool = Field(default=True, description="Utiliser la recherche sémantique avec embeddings")
+    mode: Optional[str] = Field(
+        None,
+        pattern="^(semantic|lexical|hybrid)$",
+        description="Mode de recherche (prioritaire sur use_semantic) : semantic, lexical ou hybrid"
+    )
+    fusion: str = Field(default="rrf", pattern="^(rrf|weighted)$", description="Fusion des classements en mode hybride")
+    semantic_weight: float = Field(default=0.5, ge=0, le=1, description="Poids du score vectoriel (fusion weighted)")
     top_k: int = Field(default=10, ge=1, le=100, description="Nombre maximum de résultats")
     min_score: float = Field(default=0.5, ge=0, le=1, description="Score minimum de similarité")
 
@@ -93,4 +108,19 @@ class SearchResult(BaseModel):
     product: Product
     score: float = Field(..., ge=0, le=1, description="Score de similarité (0-1)")
     
-    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
+
+
+class ProductImportError(BaseModel):
+    """Erreur rencontrée sur une ligne lors d'un import en masse"""
+    line: int = Field(..., description="Numéro de ligne dans le fichier source")
+    error: str
+
+
+class ProductImportReport(BaseModel):
+    """Bilan d'un import en masse de produits"""
+    created: int = 0
+    failed: int = 0
+    errors: List[ProductImportError] = Field(default_factory=list, description="Détail des erreurs (tronqué)")
+    duration_seconds: float = 0.0
+    rows_per_second: float = 0.0
@@ -73,6 +73,13 @@ class Token(BaseModel):
     """Modèle pour le token JWT"""
     access_token: str
     token_type: str = "bearer"
+    expires_in: Optional[int] = Field(None, description="Durée de validité de l'access token (secondes)")
+    refresh_token: Optional[str] = Field(None, description="Refresh token à usage unique (rotation)")
+
+
+class RefreshRequest(BaseModel):
+    """Modèle pour le renouvellement ou la révocation d'un refresh token"""
+    refresh_token: str
 
 
 class TokenData(BaseModel):
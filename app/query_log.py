@@ -0,0 +1,168 @@
+"""
+Journal des requêtes Cypher lentes
+
+Toute requête dépassant SLOW_QUERY_THRESHOLD_MS est journalisée avec son
+nom, sa durée et ses paramètres caviardés (les valeurs textuelles et les
+listes sont remplacées par leur type et leur taille : emails, tokens et
+vecteurs n'apparaissent jamais).
+
+Sur activation explicite (SLOW_QUERY_PROFILE, pris en compte seulement en
+mode debug), chaque forme de requête (texte Cypher normalisé) lente est
+rejouée une fois sous PROFILE dans une transaction annulée ; le plan
+d'exécution (opérateurs, db hits, lignes) est conservé et consultable via
+GET /api/admin/slow-queries.
+"""
+import hashlib
+import re
+import threading
+from collections import deque
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from app.config import settings
+
+# Paramètres jamais affichés, même sous forme résumée
+SENSITIVE_KEYS = ("password", "token", "secret", "hash")
+
+
+def redact(value: Any, key: str = "") -> Any:
+    """
+    Caviarde des paramètres de requête
+    
+    Les nombres, booléens et None sont conservés (limites, prix, curseurs
+    de pagination) ; les chaînes et listes sont résumées.
+    """
+    if any(marker in key.lower() for marker in SENSITIVE_KEYS):
+        return "***"
+    if isinstance(value, dict):
+        return {k: redact(v, str(k)) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return f"<list len={len(value)}>"
+    if isinstance(value, str):
+        return f"<str len={len(value)}>"
+    return value
+
+
+def query_shape(query: str) -> str:
+    """Empreinte du texte Cypher normalisé (espaces compactés)"""
+    normalized = re.sub(r"\s+", " ", query).strip()
+    return hashlib.sha1(normalized.encode("utf-8")).hexdigest()[:12]
+
+
+def summarize_profile(plan: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Réduit un plan PROFILE du driver à l'arbre des opérateurs
+    
+    Args:
+        plan: ResultSummary.profile (operatorType, dbHits, rows, args, children)
+    
+    Returns:
+        Arbre {operator, db_hits, rows, details, children}
+    """
+    args = plan.get("args") or {}
+    return {
+        "operator": plan.get("operatorType"),
+        "db_hits": plan.get("dbHits", 0),
+        "rows": plan.get("rows", 0),
+        "details": args.get("Details"),
+        "children": [summarize_profile(child) for child in plan.get("children") or []]
+    }
+
+
+def total_db_hits(operator: Dict[str, Any]) -> int:
+    return operator["db_hits"] + sum(total_db_hits(child) for child in operator["children"])
+
+
+class SlowQueryLog:
+    """Requêtes lentes récentes et plans PROFILE par forme de requête"""
+    
+    def __init__(self, threshold_ms: float = 200.0, max_entries: int = 200, profile: bool = False):
+        """
+        Args:
+            threshold_ms: Durée au-delà de laquelle une requête est lente (0 = désactivé)
+            max_entries: Requêtes lentes conservées
+            profile: Rejouer chaque forme lente sous PROFILE (mode debug)
+        """
+        self.threshold_ms = threshold_ms
+        self.profile_enabled = profile
+        self._entries: "deque[Dict[str, Any]]" = deque(maxlen=max(1, max_entries))
+        # Forme -> plan (None tant que le PROFILE est en cours)
+        self._profiles: Dict[str, Optional[Dict[str, Any]]] = {}
+        self._lock = threading.Lock()
+    
+    @property
+    def enabled(self) -> bool:
+        return self.threshold_ms > 0
+    
+    def is_slow(self, duration: float) -> bool:
+        return self.threshold_ms > 0 and 1000 * duration >= self.threshold_ms
+    
+    def record(
+        self,
+        name: str,
+        query: str,
+        parameters: Optional[Dict[str, Any]],
+        duration: float,
+        error: Optional[str] = None
+    ) -> bool:
+        """
+        Journalise une requête lente
+        
+        Args:
+            name: Nom court de la requête
+            query: Texte Cypher
+            parameters: Paramètres (caviardés avant stockage)
+            duration: Durée en secondes
+            error: Type de l'exception si la requête a échoué
+        
+        Returns:
+            True si la forme doit être profilée (première occurrence, mode debug)
+        """
+        shape = query_shape(query)
+        entry = {
+            "name": name,
+            "shape": shape,
+            "duration_ms": 1000 * duration,
+            "parameters": redact(parameters or {}),
+            "error": error,
+            "at": datetime.now().isoformat()
+        }
+        print(f"✗ Requête lente {name} [{shape}] : {entry['duration_ms']:.0f} ms {entry['parameters']}")
+        
+        with self._lock:
+            self._entries.append(entry)
+            if not self.profile_enabled or error or shape in self._profiles:
+                return False
+            self._profiles[shape] = None
+            return True
+    
+    def store_profile(self, name: str, query: str, plan: Optional[Dict[str, Any]], error: Optional[str] = None):
+        """Enregistre le plan PROFILE d'une forme de requête"""
+        operators = summarize_profile(plan) if plan else None
+        with self._lock:
+            self._profiles[query_shape(query)] = {
+                "name": name,
+                "query": re.sub(r"\s+", " ", query).strip(),
+                "db_hits": total_db_hits(operators) if operators else None,
+                "plan": operators,
+                "error": error,
+                "profiled_at": datetime.now().isoformat()
+            }
+    
+    def entries(self, limit: int = 50) -> List[Dict[str, Any]]:
+        """Dernières requêtes lentes, de la plus récente à la plus ancienne"""
+        with self._lock:
+            return list(self._entries)[-limit:][::-1]
+    
+    def profiles(self) -> Dict[str, Dict[str, Any]]:
+        """Plans PROFILE capturés, par forme de requête"""
+        with self._lock:
+            return {shape: profile for shape, profile in self._profiles.items() if profile is not None}
+
+
+# Instance globale du journal des requêtes lentes
+slow_query_log = SlowQueryLog(
+    threshold_ms=settings.slow_query_threshold_ms,
+    max_entries=settings.slow_query_max_entries,
+    profile=settings.debug and settings.slow_query_profile
+)
@@ -0,0 +1,275 @@
+"""
+Ré-encodage reprenable des embeddings du catalogue
+
+À lancer après un changement de `EMBEDDING_MODEL` ou `EMBEDDING_DIMENSION` :
+les vecteurs déjà stockés sur les produits ne sont plus comparables aux
+requêtes encodées par le nouveau modèle.
+
+Usage :
+    python -m app.reembed [--chunk-size 256] [--workers 0] [--force] [--restart]
+
+Le catalogue est parcouru par paquets ordonnés par id. Chaque paquet est
+encodé par un pool de processus (un modèle chargé par cœur) puis réécrit
+par un UNWIND. Un produit est ignoré si son modèle et l'empreinte de son
+texte source (embedding_model / embedding_hash) sont déjà à jour. La
+progression est enregistrée après chaque paquet dans un fichier de reprise :
+relancer la commande après une interruption reprend au dernier id traité.
+Un produit modifié pendant son encodage n'est pas écrasé (son vecteur est
+recalculé par la file de l'application). L'index vectoriel est recréé à
+la fin si sa dimension a changé.
+
+Pendant l'exécution, l'index mélange anciens et nouveaux vecteurs : la
+recherche sémantique est dégradée jusqu'à la fin du traitement. Avec
+VECTOR_SEARCH_ENGINE=local, redémarrer l'application pour recharger l'index ;
+avec PRODUCT_STORE=memory, les workers reprennent les nouvelles empreintes
+au rechargement périodique du catalogue.
+"""
+import argparse
+import asyncio
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from app.config import settings
+from app.database import neo4j_db
+from app.embeddings.backends import EmbeddingBackend, load_backend
+from app.services.product import product_service
+from app.services.product_store import SOURCE_FIELDS
+
+DEFAULT_CHECKPOINT_PATH = ".reembed_checkpoint.json"
+
+# Backend chargé une fois par processus du pool
+_worker_backend: Optional[EmbeddingBackend] = None
+
+
+def _init_worker(backend: str, model_name: str, onnx_path: str, num_threads: int):
+    """Initialise un processus du pool en chargeant le modèle"""
+    global _worker_backend
+    if backend == "torch":
+        # Un thread par processus : le parallélisme vient du pool
+        import torch
+        torch.set_num_threads(1)
+    _worker_backend = load_backend(backend, model_name, onnx_path=onnx_path, num_threads=num_threads or 1)
+
+
+def _encode_in_worker(texts: List[str]) -> List[List[float]]:
+    """Encode un lot de textes dans un processus du pool"""
+    return _worker_backend.encode(texts).tolist()
+
+
+def load_checkpoint(path: str) -> Optional[Dict[str, Any]]:
+    """Charge le fichier de reprise s'il existe"""
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_checkpoint(path: str, checkpoint: Dict[str, Any]):
+    """Écrit le fichier de reprise de façon atomique"""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(checkpoint, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+class ReembedJob:
+    """Parcourt le catalogue et réécrit les embeddings obsolètes"""
+    
+    def __init__(
+        self,
+        chunk_size: int = 256,
+        workers: int = 0,
+        checkpoint_path: str = DEFAULT_CHECKPOINT_PATH,
+        force: bool = False
+    ):
+        """
+        Args:
+            chunk_size: Produits lus et écrits par transaction
+            workers: Processus d'encodage (0 = nombre de cœurs)
+            checkpoint_path: Fichier de reprise
+            force: Ré-encoder même les produits à jour
+        """
+        self.chunk_size = chunk_size
+        self.workers = workers or os.cpu_count() or 1
+        self.checkpoint_path = checkpoint_path
+        self.force = force
+    
+    def _new_checkpoint(self) -> Dict[str, Any]:
+        return {
+            "model": settings.embedding_model,
+            "dimension": settings.embedding_dimension,
+            "last_id": None,
+            "scanned": 0,
+            "updated": 0,
+            "skipped": 0,
+            "started_at": datetime.now().isoformat()
+        }
+    
+    def _resume_checkpoint(self) -> Dict[str, Any]:
+        """Reprend la progression si elle concerne le même modèle"""
+        checkpoint = load_checkpoint(self.checkpoint_path)
+        if (
+            checkpoint
+            and checkpoint.get("model") == settings.embedding_model
+            and checkpoint.get("dimension") == settings.embedding_dimension
+        ):
+            print(f"↻ Reprise après l'id {checkpoint['last_id']} ({checkpoint['scanned']} produits déjà parcourus)")
+            return checkpoint
+        return self._new_checkpoint()
+    
+    async def _fetch_chunk(self, last_id: Optional[str]) -> List[Dict[str, Any]]:
+        """
+        Lit le paquet suivant dans l'ordre des id
+        
+        Deux requêtes distinctes plutôt qu'un `$last_id IS NULL OR ...` : une
+        disjonction empêche le planificateur de parcourir product_id_index à
+        partir de `last_id`, et chaque paquet deviendrait un parcours du label
+        suivi d'un tri.
+        """
+        returned = """
+        RETURN p.id AS id, p.name AS name, p.description AS description,
+               p.short_description AS short_description, p.category AS category,
+               p.embedding_model AS embedding_model, p.embedding_hash AS embedding_hash,
+               size(p.embedding) AS dimension
+        ORDER BY p.id
+        LIMIT $limit
+        """
+        if last_id is None:
+            query = "MATCH (p:Product) WHERE p.id IS NOT NULL" + returned
+            return await neo4j_db.execute_query_async(query, {"limit": self.chunk_size}, name="reembed.fetch_first")
+        
+        query = "MATCH (p:Product) WHERE p.id > $last_id" + returned
+        return await neo4j_db.execute_query_async(query, {"last_id": last_id, "limit": self.chunk_size}, name="reembed.fetch")
+    
+    def _is_up_to_date(self, row: Dict[str, Any], text_hash: str) -> bool:
+        return (
+            not self.force
+            and row["embedding_model"] == settings.embedding_model
+            and row["embedding_hash"] == text_hash
+            and row["dimension"] == settings.embedding_dimension
+        )
+    
+    async def _encode(self, pool: ProcessPoolExecutor, texts: List[str]) -> List[List[float]]:
+        """Répartit un paquet de textes entre les processus du pool"""
+        loop = asyncio.get_running_loop()
+        size = max(1, -(-len(texts) // self.workers))
+        parts = await asyncio.gather(*(
+            loop.run_in_executor(pool, _encode_in_worker, texts[i:i + size])
+            for i in range(0, len(texts), size)
+        ))
+        vectors = [vector for part in parts for vector in part]
+        
+        if vectors and len(vectors[0]) != settings.embedding_dimension:
+            raise RuntimeError(
+                f"Le modèle produit des vecteurs de dimension {len(vectors[0])}, "
+                f"EMBEDDING_DIMENSION vaut {settings.embedding_dimension}"
+            )
+        return vectors
+    
+    async def _write(self, rows: List[Dict[str, Any]]) -> int:
+        """
+        Écrit les vecteurs des produits dont le texte source n'a pas changé
+        
+        Un produit modifié pendant l'encodage est laissé tel quel : la mise à
+        jour l'a placé dans la file de recalcul (app.services.embedding_refresh).
+        """
+        return len(await product_service.store.write_embeddings(rows))
+    
+    async def run(self, restart: bool = False) -> Dict[str, Any]:
+        """
+        Exécute (ou reprend) le ré-encodage
+        
+        Args:
+            restart: Ignorer le fichier de reprise existant
+        
+        Returns:
+            Bilan final (compteurs et durée)
+        """
+        checkpoint = self._new_checkpoint() if restart else self._resume_checkpoint()
+        started = time.perf_counter()
+        
+        print(f"🔄 Ré-encodage avec {settings.embedding_model} ({settings.embedding_backend}), {self.workers} processus")
+        
+        with ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=_init_worker,
+            initargs=(
+                settings.embedding_backend,
+                settings.embedding_model,
+                settings.embedding_onnx_path,
+                settings.embedding_onnx_threads
+            )
+        ) as pool:
+            while True:
+                rows = await self._fetch_chunk(checkpoint["last_id"])
+                if not rows:
+                    break
+                
+                stale = []
+                for row in rows:
+                    text = product_service._generate_searchable_text(row)
+                    text_hash = product_service.embedding_hash(text)
+                    if not self._is_up_to_date(row, text_hash):
+                        stale.append({
+                            "id": row["id"],
+                            "text": text,
+                            "source": [row.get(field) or "" for field in SOURCE_FIELDS],
+                            "embedding_model": settings.embedding_model,
+                            "embedding_hash": text_hash
+                        })
+                
+                if stale:
+                    vectors = await self._encode(pool, [row.pop("text") for row in stale])
+                    for row, vector in zip(stale, vectors):
+                        row["embedding"] = vector
+                    checkpoint["updated"] += await self._write(stale)
+                
+                checkpoint["scanned"] += len(rows)
+                checkpoint["skipped"] += len(rows) - len(stale)
+                checkpoint["last_id"] = rows[-1]["id"]
+                save_checkpoint(self.checkpoint_path, checkpoint)
+                
+                elapsed = time.perf_counter() - started
+                print(
+                    f"✓ {checkpoint['scanned']} parcourus, {checkpoint['updated']} ré-encodés, "
+                    f"{checkpoint['skipped']} à jour ({elapsed:.0f} s)"
+                )
+        
+        await asyncio.to_thread(neo4j_db.rebuild_vector_index, "Product", "embedding")
+        
+        checkpoint["finished_at"] = datetime.now().isoformat()
+        checkpoint["duration_seconds"] = time.perf_counter() - started
+        if os.path.exists(self.checkpoint_path):
+            os.remove(self.checkpoint_path)
+        return checkpoint
+
+
+async def reembed(args):
+    """Lance le ré-encodage et affiche le bilan"""
+    job = ReembedJob(
+        chunk_size=args.chunk_size,
+        workers=args.workers,
+        checkpoint_path=args.checkpoint,
+        force=args.force
+    )
+    try:
+        report = await job.run(restart=args.restart)
+        print(f"\n✅ Ré-encodage terminé : {report['updated']} produits ré-encodés, {report['skipped']} déjà à jour")
+    finally:
+        await neo4j_db.close_async()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Ré-encodage reprenable des embeddings du catalogue")
+    parser.add_argument("--chunk-size", type=int, default=256, help="Produits par transaction")
+    parser.add_argument("--workers", type=int, default=0, help="Processus d'encodage (0 = nombre de cœurs)")
+    parser.add_argument("--checkpoint", default=DEFAULT_CHECKPOINT_PATH, help="Fichier de reprise")
+    parser.add_argument("--force", action="store_true", help="Ré-encoder même les produits à jour")
+    parser.add_argument("--restart", action="store_true", help="Ignorer le fichier de reprise")
+    args = parser.parse_args()
+    
+    asyncio.run(reembed(args))
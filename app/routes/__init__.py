@@ -6,6 +6,8 @@ from fastapi import APIRouter
 # Import des routes API
 from app.routes.api.products import router as products_api_router
 from app.routes.api.auth import router as auth_api_router
+from app.routes.api.health import router as health_api_router
+from app.routes.api.admin import router as admin_api_router
 
 # Import des routes pages
 from app.routes.pages.client import router as client_router
@@ -16,6 +18,8 @@ from app.routes.pages.admin import router as admin_router
 api_router = APIRouter()
 api_router.include_router(products_api_router)
 api_router.include_router(auth_api_router)
+api_router.include_router(health_api_router)
+api_router.include_router(admin_api_router)
 
 # Router principal pour les pages HTML
 pages_router = APIRouter()
@@ -4,8 +4,12 @@ Regroupe toutes les routes API REST
 """
 from app.routes.api.products import router as products_router
 from app.routes.api.auth import router as auth_router
+from app.routes.api.health import router as health_router
+from app.routes.api.admin import router as admin_router
 
 __all__ = [
     "products_router",
-    "auth_router"
+    "auth_router",
+    "health_router",
+    "admin_router"
 ]
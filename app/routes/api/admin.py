@@ -0,0 +1,41 @@
+"""
+Routes API réservées aux administrateurs (diagnostic)
+"""
+from fastapi import APIRouter, Depends, Query
+
+from app.dependencies import get_current_admin
+from app.query_log import slow_query_log
+from app.tracing import tracer
+
+router = APIRouter(prefix="/api/admin", tags=["admin"], dependencies=[Depends(get_current_admin)])
+
+
+@router.get("/slow-queries")
+async def slow_queries(limit: int = Query(50, ge=1, le=500)):
+    """
+    Requêtes Cypher lentes récentes et plans PROFILE capturés
+    
+    Les paramètres sont caviardés ; les plans (opérateurs, db hits, lignes)
+    ne sont capturés qu'en mode debug, une fois par forme de requête.
+    """
+    return {
+        "threshold_ms": slow_query_log.threshold_ms,
+        "profiling": slow_query_log.profile_enabled,
+        "queries": slow_query_log.entries(limit),
+        "profiles": slow_query_log.profiles()
+    }
+
+
+@router.get("/traces")
+async def traces(limit: int = Query(20, ge=1, le=100)):
+    """
+    Dernières traces échantillonnées (exportateur memory), de la plus récente à la plus ancienne
+    
+    Les spans exposent les routes, les noms des requêtes Cypher et leurs
+    durées : réservé aux administrateurs, comme le journal des requêtes lentes.
+    """
+    return {
+        "sample_rate": tracer.sample_rate,
+        "exporter": type(tracer.exporter).__name__,
+        "traces": tracer.exporter.traces(limit)
+    }
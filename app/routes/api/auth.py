@@ -2,18 +2,48 @@
 Routes API pour l'authentification
 """
 from datetime import timedelta
-from typing import Annotated
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Annotated, Optional
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from fastapi.security import OAuth2PasswordRequestForm
 
-from app.models.user import User, UserCreate, Token, LoginRequest
+from app.models.user import User, UserCreate, Token, LoginRequest, RefreshRequest
+from app.services.refresh_token import InvalidRefreshToken, refresh_token_service
 from app.services.user import user_service
-from app.auth import create_access_token, get_current_user_email
+from app.auth import create_access_token
+from app.dependencies import get_current_user
 from app.config import settings
 
 router = APIRouter(prefix="/api/auth", tags=["Authentication"])
 
 
+async def issue_tokens(user: User, refresh_token: Optional[str] = None) -> Token:
+    """
+    Crée un access token JWT et l'accompagne d'un refresh token
+    
+    Args:
+        user: Utilisateur authentifié
+        refresh_token: Refresh token déjà émis (rotation) ; sinon une session est ouverte
+        
+    Returns:
+        Token (access + refresh)
+    """
+    access_token_expires = timedelta(minutes=settings.access_token_expire_minutes)
+    access_token = create_access_token(
+        data={"sub": user.email, "user_id": user.id},
+        expires_delta=access_token_expires
+    )
+    
+    if refresh_token is None:
+        refresh_token = await refresh_token_service.issue(user.id)
+    
+    return Token(
+        access_token=access_token,
+        token_type="bearer",
+        expires_in=int(access_token_expires.total_seconds()),
+        refresh_token=refresh_token
+    )
+
+
 @router.post("/register", response_model=User, status_code=status.HTTP_201_CREATED)
 async def register(user_data: UserCreate):
     """
@@ -60,14 +90,8 @@ async def login(login_data: LoginRequest):
             detail="Compte utilisateur désactivé"
         )
     
-    # Créer le token JWT
-    access_token_expires = timedelta(minutes=settings.access_token_expire_minutes)
-    access_token = create_access_token(
-        data={"sub": user.email, "user_id": user.id},
-        expires_delta=access_token_expires
-    )
-    
-    return Token(access_token=access_token, token_type="bearer")
+    # Créer le token JWT et ouvrir une session (refresh token)
+    return await issue_tokens(user)
 
 
 @router.post("/token", response_model=Token)
@@ -92,29 +116,53 @@ async def login_oauth2(form_data: Annotated[OAuth2PasswordRequestForm, Depends()
             detail="Compte utilisateur désactivé"
         )
     
-    # Créer le token JWT
-    access_token_expires = timedelta(minutes=settings.access_token_expire_minutes)
-    access_token = create_access_token(
-        data={"sub": user.email, "user_id": user.id},
-        expires_delta=access_token_expires
-    )
-    
-    return Token(access_token=access_token, token_type="bearer")
+    # Créer le token JWT et ouvrir une session (refresh token)
+    return await issue_tokens(user)
 
 
-@router.get("/me", response_model=User)
-async def get_current_user(current_user_email: str = Depends(get_current_user_email)):
+@router.post("/refresh", response_model=Token)
+async def refresh(refresh_data: RefreshRequest):
     """
-    Récupère les informations de l'utilisateur connecté
+    Renouvelle l'access token à partir d'un refresh token
     
-    Nécessite un token JWT valide dans le header Authorization: Bearer <token>
+    Aucun mot de passe n'est vérifié : le refresh token présenté est
+    remplacé par un nouveau (rotation). Réutiliser un ancien refresh token
+    révoque toute la session.
     """
-    user = await user_service.get_user_by_email(current_user_email)
+    try:
+        user, new_refresh_token = await refresh_token_service.rotate(refresh_data.refresh_token)
+    except InvalidRefreshToken as e:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail=str(e),
+            headers={"WWW-Authenticate": "Bearer"},
+        )
     
-    if not user:
+    if not user.is_active:
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Utilisateur non trouvé"
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Compte utilisateur désactivé"
         )
     
-    return user
+    return await issue_tokens(user, refresh_token=new_refresh_token)
+
+
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+async def logout(refresh_data: RefreshRequest):
+    """
+    Ferme la session associée à un refresh token
+    
+    L'access token en cours reste valide jusqu'à son expiration.
+    """
+    await refresh_token_service.revoke(refresh_data.refresh_token)
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+
+@router.get("/me", response_model=User)
+async def read_current_user(current_user: User = Depends(get_current_user)):
+    """
+    Récupère les informations de l'utilisateur connecté
+    
+    Nécessite un token JWT valide dans le header Authorization: Bearer <token>
+    """
+    return current_user
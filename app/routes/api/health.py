@@ -0,0 +1,58 @@
+"""
+Routes de supervision (liveness / readiness, métriques)
+"""
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse, PlainTextResponse
+
+from app.cache import response_cache
+from app.config import settings
+from app.database import neo4j_db
+from app.metrics import registry
+from app.services.product import product_service
+
+router = APIRouter(tags=["health"])
+
+
+@router.get("/healthz")
+@router.get("/api/health", include_in_schema=False)
+async def healthz():
+    """Liveness : le processus répond, sans dépendre de Neo4j ni du modèle"""
+    return {"status": "ok"}
+
+
+@router.get("/readyz")
+async def readyz():
+    """Readiness : le modèle d'embeddings est chargé et Neo4j est joignable (dernière erreur de préparation sinon)"""
+    checks = {
+        "database": neo4j_db.db_ready,
+        "embedding_model": neo4j_db.model_ready
+    }
+    if settings.vector_search_engine == "local":
+        checks["local_vector_index"] = product_service.local_index.loaded
+    ready = all(checks.values())
+    content = {"status": "ready" if ready else "starting", "checks": checks}
+    if not ready and neo4j_db.warmup_error:
+        content["error"] = neo4j_db.warmup_error
+    return JSONResponse(status_code=200 if ready else 503, content=content)
+
+
+@router.get("/api/health/embeddings")
+async def embeddings_health():
+    """Métriques des embeddings : micro-batcher, cache et retard de la file de recalcul"""
+    return {
+        "batcher": neo4j_db.embedding_batcher.stats(),
+        "cache": neo4j_db.embedding_cache.stats(),
+        "refresh_queue": product_service.embedding_refresh.stats()
+    }
+
+
+@router.get("/api/health/cache")
+async def cache_health():
+    """Métriques du cache des réponses et du stockage des produits (lectures servies en mémoire)"""
+    return {**response_cache.stats(), "product_store": product_service.store.stats()}
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Métriques au format texte Prometheus (requêtes HTTP, Neo4j, embeddings, recherche)"""
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
@@ -1,14 +1,102 @@
 """
 API Routes pour les produits
 """
-from fastapi import APIRouter, HTTPException, Query
-from typing import List, Optional
+import hashlib
+import io
+from datetime import datetime
 
-from app.models import Product, ProductCreate, ProductUpdate, SearchQuery, SearchResult
+from fastapi import APIRouter, Depends, File, Header, HTTPException, Query, Response, UploadFile
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from app.cache import response_cache
+from app.dependencies import get_current_admin
+from app.models import (
+    Product,
+    ProductCreate,
+    ProductUpdate,
+    SearchQuery,
+    SearchResult,
+    ProductImportReport,
+    PRODUCT_FIELDS
+)
 from app.services.product import product_service
+from app.services.product_import import SUPPORTED_FORMATS, detect_format, iter_rows
 
 router = APIRouter(prefix="/api/products", tags=["products"])
 
+FIELDS_DESCRIPTION = "Champs à retourner, séparés par des virgules (ex: id,name,price,main_image)"
+
+
+def parse_fields(fields: Optional[str]) -> Optional[List[str]]:
+    """
+    Valide le paramètre de projection `fields`
+    
+    Args:
+        fields: Liste de champs séparés par des virgules
+    
+    Returns:
+        Liste de champs (l'id est toujours inclus) ou None si absent
+    
+    Raises:
+        HTTPException: Si un champ demandé n'existe pas
+    """
+    if not fields:
+        return None
+    
+    requested = [name.strip() for name in fields.split(",") if name.strip()]
+    unknown = [name for name in requested if name not in PRODUCT_FIELDS]
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Champs inconnus: {', '.join(unknown)}"
+        )
+    
+    return ["id"] + [name for name in dict.fromkeys(requested) if name != "id"]
+
+
+def product_etag(product_id: str, updated_at: Union[str, datetime, None], fields: Optional[List[str]]) -> str:
+    """
+    ETag d'un produit, dérivé de sa date de modification et de la projection
+    
+    La date est normalisée via datetime afin que la valeur brute de Neo4j et
+    celle sérialisée depuis le modèle donnent le même ETag.
+    """
+    if isinstance(updated_at, str):
+        updated_at = datetime.fromisoformat(updated_at)
+    stamp = updated_at.isoformat() if updated_at else ""
+    digest = hashlib.sha1(f"{product_id}|{stamp}|{','.join(fields or [])}".encode("utf-8")).hexdigest()
+    return f'W/"{digest[:20]}"'
+
+
+def list_etag(params: Dict[str, Any], signature: Tuple[int, Optional[str]]) -> str:
+    """
+    ETag d'une liste, dérivé des paramètres et de l'empreinte du filtre
+    
+    L'empreinte (nombre de produits, dernière modification) est lue dans le
+    catalogue : l'ETag change avec toute écriture, y compris celles d'un
+    autre processus (import en CLI, autre worker, file de recalcul).
+    """
+    total, updated_at = signature
+    payload = f"{response_cache.normalize_params(params)}|{total}|{updated_at or ''}"
+    return f'W/"{hashlib.sha1(payload.encode("utf-8")).hexdigest()[:20]}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Comparaison faible d'un ETag avec l'en-tête If-None-Match"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return etag.removeprefix("W/") in candidates
+
+
+def not_modified(etag: str) -> Response:
+    """Réponse 304 sans corps"""
+    return Response(status_code=304, headers={"ETag": etag})
+
 
 @router.post("", response_model=Product, status_code=201)
 async def create_product(product: ProductCreate):
@@ -19,13 +107,79 @@ async def create_product(product: ProductCreate):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/import", response_model=ProductImportReport, dependencies=[Depends(get_current_admin)])
+async def import_products(
+    file: UploadFile = File(..., description="Fichier NDJSON (un produit par ligne) ou CSV avec en-tête"),
+    format: Optional[str] = Query(None, description="Format du fichier (ndjson ou csv), déduit du nom sinon")
+):
+    """
+    Importer des produits en masse (administrateurs)
+    
+    Le fichier est lu en flux, sur un thread, et traité par paquets :
+    validation, encodage des embeddings par lot et écriture par UNWIND. Les
+    lignes invalides sont rapportées sans interrompre l'import.
+    """
+    try:
+        file_format = format or detect_format(file.filename, file.content_type)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if file_format not in SUPPORTED_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Format non supporté: {file_format}")
+    
+    lines = io.TextIOWrapper(file.file, encoding="utf-8-sig", newline="")
+    try:
+        return await product_service.bulk_create_products(iter_rows(lines, file_format))
+    finally:
+        lines.detach()
+        await file.close()
+
+
 @router.get("/{product_id}", response_model=Product)
-async def get_product(product_id: str):
-    """Récupérer un produit par son ID"""
-    product = await product_service.get_product(product_id)
+async def get_product(
+    product_id: str,
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    if_none_match: Optional[str] = Header(None)
+):
+    """
+    Récupérer un produit par son ID (réponse mise en cache)
+    
+    La réponse porte un `ETag` dérivé de `updated_at` ; une requête
+    conditionnelle (`If-None-Match`) reçoit `304` sans que le produit soit
+    relu ni sérialisé.
+    """
+    projection = parse_fields(fields)
+    
+    cache_key = response_cache.key(
+        await response_cache.version("products:get", {"id": product_id, "fields": projection})
+    )
+    cached = await response_cache.get(cache_key)
+    if cached is not None:
+        if etag_matches(if_none_match, cached["etag"]):
+            return not_modified(cached["etag"])
+        return JSONResponse(content=cached["body"], headers={"ETag": cached["etag"]})
+    
+    if if_none_match:
+        # Validation sur la seule date de modification, sans charger le produit
+        updated_at = await product_service.get_product_updated_at(product_id)
+        if updated_at is None:
+            raise HTTPException(status_code=404, detail="Produit non trouvé")
+        etag = product_etag(product_id, updated_at, projection)
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag)
+    
+    # updated_at est toujours lu pour calculer l'ETag, puis retiré si non demandé
+    query_fields = projection + ["updated_at"] if projection and "updated_at" not in projection else projection
+    product = await product_service.get_product(product_id, fields=query_fields)
     if not product:
         raise HTTPException(status_code=404, detail="Produit non trouvé")
-    return product
+    
+    content = jsonable_encoder(product)
+    etag = product_etag(product_id, content.get("updated_at"), projection)
+    if query_fields is not projection:
+        content.pop("updated_at", None)
+    
+    await response_cache.set(cache_key, {"etag": etag, "body": content})
+    return JSONResponse(content=content, headers={"ETag": etag})
 
 
 @router.put("/{product_id}", response_model=Product)
@@ -50,23 +204,87 @@ async def list_products(
     category: Optional[str] = Query(None, description="Filtrer par catégorie"),
     status: Optional[str] = Query(None, description="Filtrer par statut"),
     limit: int = Query(20, ge=1, le=100, description="Nombre de résultats"),
-    skip: int = Query(0, ge=0, description="Nombre de résultats à sauter")
+    skip: int = Query(0, ge=0, description="Nombre de résultats à sauter (préférer cursor)"),
+    cursor: Optional[str] = Query(None, description="Curseur de la page suivante (en-tête X-Next-Cursor)"),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    if_none_match: Optional[str] = Header(None)
 ):
-    """Lister les produits avec filtres optionnels"""
-    return await product_service.list_products(
-        category=category,
-        status=status,
-        limit=limit,
-        skip=skip
-    )
+    """
+    Lister les produits avec filtres optionnels
+    
+    Le curseur de la page suivante est renvoyé dans l'en-tête `X-Next-Cursor`
+    (absent sur la dernière page). Les réponses sont mises en cache et
+    invalidées à chaque modification du catalogue. Leur `ETag` suit
+    l'empreinte des produits du filtre (nombre et dernière modification),
+    calculée à l'écriture en cache et à chaque requête conditionnelle :
+    `If-None-Match` permet d'obtenir `304`.
+    """
+    projection = parse_fields(fields)
+    params = {
+        "category": category,
+        "status": status,
+        "limit": limit,
+        "skip": skip,
+        "cursor": cursor,
+        "fields": projection
+    }
+    
+    cache_key = response_cache.key(await response_cache.version("products:list", params))
+    cached = await response_cache.get(cache_key)
+    
+    etag = None
+    if if_none_match:
+        # Empreinte relue dans le catalogue : prend en compte les écritures
+        # des autres processus, que la génération du cache ne voit pas
+        etag = list_etag(params, await product_service.list_signature(category=category, status=status))
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag)
+    
+    if cached is not None and cached.get("etag") and etag in (None, cached["etag"]):
+        headers = {"ETag": cached["etag"]}
+        if cached["next_cursor"]:
+            headers["X-Next-Cursor"] = cached["next_cursor"]
+        return JSONResponse(content=cached["items"], headers=headers)
+    
+    if etag is None:
+        # Empreinte lue avant la page : une écriture concurrente change l'ETag suivant
+        etag = list_etag(params, await product_service.list_signature(category=category, status=status))
+    
+    try:
+        products, next_cursor = await product_service.list_products_page(
+            category=category,
+            status=status,
+            limit=limit,
+            cursor=cursor,
+            skip=skip,
+            fields=projection
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    content = jsonable_encoder(products)
+    await response_cache.set(cache_key, {"etag": etag, "items": content, "next_cursor": next_cursor})
+    
+    headers = {"ETag": etag}
+    if next_cursor:
+        headers["X-Next-Cursor"] = next_cursor
+    return JSONResponse(content=content, headers=headers)
 
 
 @router.post("/search", response_model=List[SearchResult])
-async def search_products(search: SearchQuery):
+async def search_products(search: SearchQuery, response: Response):
     """
     Rechercher des produits avec recherche sémantique
     
     La recherche sémantique utilise des embeddings pour trouver des produits
-    similaires même si les mots exacts ne correspondent pas.
+    similaires même si les mots exacts ne correspondent pas. Le mode
+    `hybrid` combine recherche plein texte et vectorielle.
+    
+    La durée de chaque étape est renvoyée dans l'en-tête `Server-Timing`.
     """
-    return await product_service.search_products(search)
+    timings: Dict[str, float] = {}
+    results = await product_service.search_products(search, timings=timings)
+    response.headers["Server-Timing"] = ", ".join(
+        f"{stage};dur={duration:.1f}" for stage, duration in timings.items()
+    )
+    return results
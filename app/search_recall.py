@@ -0,0 +1,41 @@
+"""
+Comparaison des moteurs de recherche vectorielle (Neo4j vs index local)
+
+Usage :
+    python -m app.search_recall [--top-k 10] [requête ...]
+"""
+import argparse
+import asyncio
+import json
+
+from app.database import neo4j_db
+from app.services.product import product_service
+
+DEFAULT_QUERIES = [
+    "vase",
+    "bougie",
+    "coussin lin",
+    "plaid en laine",
+    "lampe en bois",
+    "miroir rotin",
+    "panier de rangement",
+    "tasse en grès"
+]
+
+
+async def compare(queries, top_k: int):
+    """Affiche le rappel@k de l'index Neo4j par rapport à la recherche exacte locale"""
+    try:
+        report = await product_service.compare_search_engines(queries, top_k=top_k)
+        print(json.dumps(report, indent=2, ensure_ascii=False))
+    finally:
+        await neo4j_db.close_async()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rappel de l'index vectoriel Neo4j vs index local")
+    parser.add_argument("queries", nargs="*", help="Requêtes de test")
+    parser.add_argument("--top-k", type=int, default=10)
+    args = parser.parse_args()
+    
+    asyncio.run(compare(args.queries or DEFAULT_QUERIES, args.top_k))
@@ -0,0 +1,181 @@
+"""
+File de recalcul différé des embeddings produits
+
+Une mise à jour de produit est validée immédiatement ; si son texte
+recherchable a changé, le produit est placé dans cette file et son
+embedding est réécrit plus tard, par lots, par une tâche de fond.
+Plusieurs modifications successives d'un même produit sont fusionnées en
+un seul recalcul.
+"""
+import asyncio
+import time
+from typing import Any, Dict, List, Optional
+
+from app.database import neo4j_db
+from app.services.product_store import SOURCE_FIELDS
+
+
+class EmbeddingRefreshQueue:
+    """Recalcule en arrière-plan les embeddings des produits modifiés"""
+    
+    def __init__(self, product_service: Any, batch_size: int = 32, retry_delay: float = 2.0):
+        """
+        Args:
+            product_service: ProductService (texte recherchable, empreinte, index local)
+            batch_size: Produits recalculés par lot
+            retry_delay: Attente avant de réessayer un lot en erreur (secondes)
+        """
+        self.product_service = product_service
+        self.batch_size = max(1, batch_size)
+        self.retry_delay = retry_delay
+        
+        # product_id -> instant de la première demande encore en attente
+        self._pending: Dict[str, float] = {}
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        
+        # Métriques
+        self._refreshed = 0
+        self._skipped = 0
+        self._failed_batches = 0
+        self._coalesced = 0
+        self._last_lag = 0.0
+        self._max_lag = 0.0
+    
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+    
+    def start(self):
+        """Démarre la tâche de fond (à appeler depuis la boucle d'événements)"""
+        if self.running:
+            return
+        self._wakeup = asyncio.Event()
+        if self._pending:
+            self._wakeup.set()
+        self._task = asyncio.create_task(self._run())
+    
+    async def stop(self, timeout: float = 5.0):
+        """
+        Arrête la tâche de fond après avoir tenté de vider la file
+        
+        Les produits encore en attente gardent un embedding_hash obsolète et
+        seront repris par le ré-encodage (python -m app.reembed).
+        """
+        if not self.running:
+            return
+        
+        deadline = time.monotonic() + timeout
+        while self._pending and time.monotonic() < deadline:
+            await asyncio.sleep(0.05)
+        
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        
+        if self._pending:
+            print(f"✗ {len(self._pending)} embeddings non recalculés à l'arrêt")
+    
+    def enqueue(self, product_id: str):
+        """Demande le recalcul de l'embedding d'un produit"""
+        if product_id in self._pending:
+            self._coalesced += 1
+            return
+        self._pending[product_id] = time.monotonic()
+        if self._wakeup is not None:
+            self._wakeup.set()
+    
+    def discard(self, product_id: str):
+        """Annule une demande en attente (produit supprimé)"""
+        self._pending.pop(product_id, None)
+    
+    def stats(self) -> Dict[str, Any]:
+        """Retourne la taille de la file et le retard des embeddings"""
+        oldest = min(self._pending.values(), default=None)
+        return {
+            "running": self.running,
+            "pending": len(self._pending),
+            "oldest_pending_seconds": time.monotonic() - oldest if oldest is not None else 0.0,
+            "refreshed": self._refreshed,
+            "skipped": self._skipped,
+            "coalesced": self._coalesced,
+            "failed_batches": self._failed_batches,
+            "last_lag_seconds": self._last_lag,
+            "max_lag_seconds": self._max_lag,
+        }
+    
+    async def _run(self):
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            
+            while self._pending:
+                batch = dict(list(self._pending.items())[:self.batch_size])
+                for product_id in batch:
+                    del self._pending[product_id]
+                
+                try:
+                    await self._refresh(batch)
+                except asyncio.CancelledError:
+                    self._requeue(batch)
+                    raise
+                except Exception as e:
+                    print(f"✗ Recalcul des embeddings échoué ({len(batch)} produits): {e}")
+                    self._failed_batches += 1
+                    self._requeue(batch)
+                    await asyncio.sleep(self.retry_delay)
+    
+    def _requeue(self, batch: Dict[str, float]):
+        """Remet un lot en file en conservant l'instant de la première demande"""
+        for product_id, enqueued_at in batch.items():
+            self._pending[product_id] = min(enqueued_at, self._pending.get(product_id, enqueued_at))
+    
+    async def _refresh(self, batch: Dict[str, float]):
+        """Relit le texte courant, encode les produits obsolètes et écrit les vecteurs"""
+        service = self.product_service
+        products = await service.store.fetch_embedding_sources(list(batch))
+        
+        stale: List[Dict[str, Any]] = []
+        texts: List[str] = []
+        for product in products:
+            text = service._generate_searchable_text(product)
+            metadata = service._embedding_metadata(text)
+            if (
+                product["embedding_hash"] == metadata["embedding_hash"]
+                and product["embedding_model"] == metadata["embedding_model"]
+            ):
+                self._skipped += 1
+                continue
+            stale.append({**product, **metadata})
+            texts.append(text)
+        
+        if stale:
+            embeddings = await neo4j_db.generate_embeddings_async(texts)
+            rows = [
+                {
+                    "id": product["id"],
+                    "source": [product.get(field) or "" for field in SOURCE_FIELDS],
+                    "embedding": embedding,
+                    "embedding_model": product["embedding_model"],
+                    "embedding_hash": product["embedding_hash"]
+                }
+                for product, embedding in zip(stale, embeddings)
+            ]
+            
+            # Le vecteur n'est écrit que si le texte source n'a pas changé entre-temps ;
+            # sinon la nouvelle modification a déjà remis le produit en file
+            written = set(await service.store.write_embeddings(rows))
+            self._refreshed += len(written)
+            
+            if service.local_index.loaded:
+                for product, embedding in zip(stale, embeddings):
+                    if product["id"] in written:
+                        service.local_index.upsert({**product, "embedding": embedding})
+        
+        now = time.monotonic()
+        lag = now - min(batch.values())
+        self._last_lag = lag
+        self._max_lag = max(self._max_lag, lag)
@@ -1,20 +1,77 @@
 """
 Service de gestion des produits avec Neo4j et embeddings
+
+Les lectures et écritures passent par un ProductStore (voir
+app.services.product_store) : Neo4j directement, ou catalogue en mémoire
+dont les écritures sont répercutées dans Neo4j (PRODUCT_STORE=memory).
 """
-from typing import List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
 from datetime import datetime
+import asyncio
+import base64
+import hashlib
+import json
+import time
 import uuid
 
+from pydantic import ValidationError
+
+from app import metrics
+from app.cache import response_cache
+from app.config import settings
 from app.database import neo4j_db
-from app.models import Product, ProductCreate, ProductUpdate, SearchQuery, SearchResult
+from app.embeddings.index import LocalVectorIndex
+from app.services.embedding_refresh import EmbeddingRefreshQueue
+from app.services.product_import import iterate_in_thread
+from app.services.product_store import ProductStore, create_product_store
+from app.tracing import tracer, traced
+from app.models import (
+    Product,
+    ProductCreate,
+    ProductUpdate,
+    SearchQuery,
+    SearchResult,
+    ProductImportError,
+    ProductImportReport,
+    PRODUCT_SEARCH_FIELDS
+)
 
 
 class ProductService:
-    """Service pour gérer les produits dans Neo4j"""
+    """Service pour gérer les produits (stockage, embeddings, recherche)"""
+    
+    def __init__(self, store: Optional[ProductStore] = None):
+        """
+        Args:
+            store: Stockage des produits (par défaut selon settings.product_store)
+        """
+        if store is None:
+            store = create_product_store(
+                settings.product_store,
+                max_products=settings.product_store_max_products,
+                reload_interval=settings.product_store_reload_interval
+            )
+        self.store = store
+        # Miroir en mémoire de l'index vectoriel, chargé si vector_search_engine = "local"
+        self.local_index = LocalVectorIndex(settings.embedding_dimension)
+        # Recalcul différé des embeddings après modification
+        self.embedding_refresh = EmbeddingRefreshQueue(self)
+    
+    @traced()
+    async def load_local_index(self) -> int:
+        """
+        Charge les embeddings des produits depuis Neo4j dans l'index local
+        
+        Returns:
+            Nombre de produits indexés
+        """
+        self.local_index.load(await self.store.load_embeddings())
+        print(f"✓ Index vectoriel local chargé : {len(self.local_index)} produits")
+        return len(self.local_index)
     
-    def __init__(self):
-        # Créer l'index vectoriel au démarrage
-        neo4j_db.create_vector_index("Product", "embedding")
+    def _to_product(self, row: Dict[str, Any]) -> Product:
+        """Construit un Product depuis une projection (propriétés absentes = valeurs par défaut)"""
+        return Product(**{key: value for key, value in row.items() if value is not None})
     
     def _generate_searchable_text(self, product_data: dict) -> str:
         """Génère un texte combiné pour l'embedding"""
@@ -26,6 +83,24 @@ class ProductService:
         ]
         return " ".join([p for p in parts if p])
     
+    @staticmethod
+    def embedding_hash(searchable_text: str) -> str:
+        """Empreinte SHA-256 du texte source d'un embedding"""
+        return hashlib.sha256(searchable_text.encode("utf-8")).hexdigest()
+    
+    def _embedding_metadata(self, searchable_text: str) -> Dict[str, str]:
+        """
+        Propriétés de traçabilité stockées avec l'embedding
+        
+        Le modèle et l'empreinte du texte source permettent au ré-encodage
+        (app.reembed) d'ignorer les produits déjà à jour.
+        """
+        return {
+            "embedding_model": settings.embedding_model,
+            "embedding_hash": self.embedding_hash(searchable_text)
+        }
+    
+    @traced()
     async def create_product(self, product_data: ProductCreate) -> Product:
         """
         Crée un nouveau produit avec embedding
@@ -41,7 +116,7 @@ class ProductService:
         
         # Générer l'embedding
         searchable_text = self._generate_searchable_text(product_data.model_dump())
-        embedding = neo4j_db.generate_embedding(searchable_text)
+        embedding = await neo4j_db.generate_embedding_async(searchable_text, use_cache=False)
         
         # Préparer les données
         product_dict = product_data.model_dump()
@@ -49,39 +124,161 @@ class ProductService:
             "id": product_id,
             "created_at": now.isoformat(),
             "updated_at": now.isoformat(),
-            "embedding": embedding
+            "embedding": embedding,
+            **self._embedding_metadata(searchable_text)
         })
         
-        # Créer le nœud dans Neo4j
-        query = """
-        CREATE (p:Product $props)
-        RETURN p
+        if await self.store.create(product_dict):
+            await response_cache.invalidate()
+            if self.local_index.loaded:
+                self.local_index.upsert(product_dict)
+            return Product(**product_dict)
+        
+        raise Exception("Erreur lors de la création du produit")
+    
+    @traced()
+    async def bulk_create_products(
+        self,
+        rows: Iterable[Tuple[int, Dict[str, Any]]],
+        chunk_size: Optional[int] = None,
+        max_reported_errors: int = 1000
+    ) -> ProductImportReport:
         """
+        Crée des produits en masse à partir d'un flux de lignes
         
-        result = neo4j_db.execute_query(query, {"props": product_dict})
+        Les lignes sont consommées par paquets de `chunk_size` (mémoire bornée),
+        lues sur un thread : chaque paquet est validé avec ProductCreate,
+        encodé en un seul lot d'embeddings puis écrit par un UNWIND dans sa
+        propre transaction.
         
-        if result:
-            return Product(**result[0]["p"])
+        Args:
+            rows: Itérable de (numéro de ligne, données brutes du produit ou
+                exception de lecture), voir app.services.product_import
+            chunk_size: Taille des paquets (par défaut settings.import_chunk_size)
+            max_reported_errors: Nombre maximal d'erreurs détaillées dans le bilan
+            
+        Returns:
+            Bilan de l'import (créés, échecs, erreurs par ligne, débit)
+        """
+        chunk_size = chunk_size or settings.import_chunk_size
+        report = ProductImportReport()
+        started = time.perf_counter()
         
-        raise Exception("Erreur lors de la création du produit")
+        def record_error(line: int, error: str):
+            report.failed += 1
+            if len(report.errors) < max_reported_errors:
+                report.errors.append(ProductImportError(line=line, error=error))
+        
+        chunk: List[Tuple[int, ProductCreate]] = []
+        
+        async def flush():
+            if not chunk:
+                return
+            try:
+                report.created += await self._create_product_chunk([product for _, product in chunk])
+            except Exception as e:
+                for line, _ in chunk:
+                    record_error(line, f"Écriture du paquet échouée: {e}")
+            chunk.clear()
+        
+        async for line, raw in iterate_in_thread(rows, chunk_size):
+            if isinstance(raw, Exception):
+                # Ligne illisible signalée par le lecteur
+                record_error(line, str(raw))
+                continue
+            try:
+                chunk.append((line, ProductCreate.model_validate(raw)))
+            except ValidationError as e:
+                record_error(line, "; ".join(
+                    f"{'.'.join(str(loc) for loc in err['loc'])}: {err['msg']}" for err in e.errors()
+                ))
+            except (TypeError, ValueError) as e:
+                record_error(line, str(e))
+            
+            if len(chunk) >= chunk_size:
+                await flush()
+        await flush()
+        
+        report.duration_seconds = time.perf_counter() - started
+        if report.duration_seconds > 0:
+            report.rows_per_second = (report.created + report.failed) / report.duration_seconds
+        return report
     
-    async def get_product(self, product_id: str) -> Optional[Product]:
-        """Récupère un produit par son ID"""
-        query = """
-        MATCH (p:Product {id: $product_id})
-        RETURN p
+    async def _create_product_chunk(self, products: List[ProductCreate]) -> int:
+        """Encode et écrit un paquet de produits en une seule transaction"""
+        now = datetime.now().isoformat()
+        rows = [product.model_dump() for product in products]
+        texts = [self._generate_searchable_text(row) for row in rows]
+        embeddings = await neo4j_db.generate_embeddings_async(texts)
+        
+        for row, text, embedding in zip(rows, texts, embeddings):
+            row.update({
+                "id": str(uuid.uuid4()),
+                "created_at": now,
+                "updated_at": now,
+                "embedding": embedding,
+                **self._embedding_metadata(text)
+            })
+        
+        created = await self.store.bulk_create(rows)
+        await response_cache.invalidate()
+        
+        if self.local_index.loaded:
+            for row in rows:
+                self.local_index.upsert(row)
+        return created
+    
+    @traced()
+    async def get_product(
+        self,
+        product_id: str,
+        fields: Optional[Sequence[str]] = None
+    ) -> Optional[Union[Product, Dict[str, Any]]]:
         """
+        Récupère un produit par son ID
         
-        result = neo4j_db.execute_query(query, {"product_id": product_id})
+        Args:
+            product_id: ID du produit
+            fields: Propriétés à retourner ; si fourni, retourne un dict partiel
+            
+        Returns:
+            Produit (ou dict projeté) ou None si non trouvé
+        """
+        product = await self.store.get(product_id, fields)
         
-        if result:
-            return Product(**result[0]["p"])
+        if product is not None:
+            return product if fields else self._to_product(product)
         
         return None
     
+    @traced()
+    async def get_product_updated_at(self, product_id: str) -> Optional[str]:
+        """
+        Lit uniquement la date de modification d'un produit (validation d'ETag)
+        
+        Returns:
+            updated_at brut, ou None si le produit n'existe pas
+        """
+        return await self.store.get_updated_at(product_id)
+    
+    @traced()
+    async def list_signature(self, category: Optional[str] = None, status: Optional[str] = None) -> Tuple[int, Optional[str]]:
+        """
+        Empreinte d'une liste filtrée (validation d'ETag)
+        
+        Returns:
+            Nombre de produits du filtre et updated_at le plus récent
+        """
+        return await self.store.list_signature(category, status)
+    
+    @traced()
     async def update_product(self, product_id: str, product_data: ProductUpdate) -> Optional[Product]:
         """
-        Met à jour un produit et régénère son embedding si nécessaire
+        Met à jour un produit en un seul aller-retour
+        
+        Si le texte recherchable a changé, l'embedding est recalculé plus tard
+        par la file de fond (EmbeddingRefreshQueue) : la mise à jour n'attend
+        pas le modèle.
         
         Args:
             product_id: ID du produit
@@ -90,159 +287,352 @@ class ProductService:
         Returns:
             Produit mis à jour ou None si non trouvé
         """
-        # Récupérer le produit existant
-        existing = await self.get_product(product_id)
-        if not existing:
-            return None
-        
-        # Préparer les données de mise à jour
         update_dict = product_data.model_dump(exclude_unset=True)
-        
-        # Si des champs affectant l'embedding sont modifiés, régénérer l'embedding
-        embedding_fields = {"name", "description", "short_description", "category"}
-        if any(field in update_dict for field in embedding_fields):
-            # Fusionner avec les données existantes
-            merged_data = existing.model_dump()
-            merged_data.update(update_dict)
-            
-            searchable_text = self._generate_searchable_text(merged_data)
-            update_dict["embedding"] = neo4j_db.generate_embedding(searchable_text)
-        
         update_dict["updated_at"] = datetime.now().isoformat()
         
-        # Construire la clause SET
-        set_clauses = [f"p.{key} = ${key}" for key in update_dict.keys()]
-        set_clause = ", ".join(set_clauses)
-        
-        query = f"""
-        MATCH (p:Product {{id: $product_id}})
-        SET {set_clause}
-        RETURN p
-        """
+        result = await self.store.update(product_id, update_dict)
+        if result is None:
+            return None
         
-        params = {"product_id": product_id, **update_dict}
-        result = neo4j_db.execute_query(query, params)
+        product, stored_hash = result
+        await response_cache.invalidate()
         
-        if result:
-            return Product(**result[0]["p"])
+        # Recalcul seulement si un champ du texte recherchable a réellement changé
+        if any(field in update_dict for field in PRODUCT_SEARCH_FIELDS):
+            searchable_text = self._generate_searchable_text(product)
+            if self.embedding_hash(searchable_text) != stored_hash:
+                self.embedding_refresh.enqueue(product_id)
         
-        return None
+        if self.local_index.loaded:
+            self.local_index.update_metadata(product_id, product)
+        return self._to_product(product)
     
+    @traced()
     async def delete_product(self, product_id: str) -> bool:
         """Supprime un produit"""
-        query = """
-        MATCH (p:Product {id: $product_id})
-        DELETE p
-        RETURN count(p) as deleted
+        deleted = await self.store.delete(product_id)
+        
+        if deleted:
+            await response_cache.invalidate()
+            self.embedding_refresh.discard(product_id)
+            self.local_index.remove(product_id)
+        return deleted
+    
+    @staticmethod
+    def encode_cursor(created_at: str, product_id: str) -> str:
+        """Encode la position (created_at, id) d'un produit en curseur opaque"""
+        raw = json.dumps([created_at, product_id], separators=(",", ":")).encode("utf-8")
+        return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+    
+    @staticmethod
+    def decode_cursor(cursor: str) -> Tuple[str, str]:
         """
+        Décode un curseur de pagination
         
-        result = neo4j_db.execute_query(query, {"product_id": product_id})
-        return result[0]["deleted"] > 0 if result else False
+        Raises:
+            ValueError: Si le curseur est invalide
+        """
+        try:
+            raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+            created_at, product_id = json.loads(raw)
+        except (ValueError, TypeError) as e:
+            raise ValueError("Curseur de pagination invalide") from e
+        if not isinstance(created_at, str) or not isinstance(product_id, str):
+            raise ValueError("Curseur de pagination invalide")
+        return created_at, product_id
     
-    async def list_products(
+    @traced()
+    async def list_products_page(
         self,
         category: Optional[str] = None,
         status: Optional[str] = None,
         limit: int = 20,
-        skip: int = 0
-    ) -> List[Product]:
-        """Liste les produits avec filtres optionnels"""
-        where_clauses = []
-        params = {"limit": limit, "skip": skip}
+        cursor: Optional[str] = None,
+        skip: int = 0,
+        fields: Optional[Sequence[str]] = None
+    ) -> Tuple[List[Union[Product, Dict[str, Any]]], Optional[str]]:
+        """
+        Liste une page de produits, du plus récent au plus ancien
         
-        if category:
-            where_clauses.append("p.category = $category")
-            params["category"] = category
+        La pagination par curseur (keyset) reprend après le dernier produit
+        de la page précédente (position created_at, id) : le coût d'une page
+        ne dépend pas de sa profondeur, contrairement à SKIP.
         
-        if status:
-            where_clauses.append("p.status = $status")
-            params["status"] = status
+        Args:
+            category: Filtrer par catégorie
+            status: Filtrer par statut
+            limit: Nombre de résultats
+            cursor: Curseur retourné par la page précédente
+            skip: Nombre de résultats à sauter (pagination historique)
+            fields: Propriétés à retourner ; si fourni, retourne des dicts partiels
+            
+        Returns:
+            Produits de la page et curseur de la page suivante (None si dernière page)
+            
+        Raises:
+            ValueError: Si le curseur est invalide
+        """
+        after = self.decode_cursor(cursor) if cursor else None
+        rows = await self.store.list_page(
+            category=category,
+            status=status,
+            limit=limit + 1,
+            after=after,
+            skip=skip,
+            fields=fields
+        )
         
-        where_clause = " AND ".join(where_clauses) if where_clauses else "1=1"
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = self.encode_cursor(*rows[-1][1])
         
-        query = f"""
-        MATCH (p:Product)
-        WHERE {where_clause}
-        RETURN p
-        ORDER BY p.created_at DESC
-        SKIP $skip
-        LIMIT $limit
+        if fields:
+            return [product for product, _ in rows], next_cursor
+        return [self._to_product(product) for product, _ in rows], next_cursor
+    
+    @traced()
+    async def list_products(
+        self,
+        category: Optional[str] = None,
+        status: Optional[str] = None,
+        limit: int = 20,
+        skip: int = 0,
+        fields: Optional[Sequence[str]] = None,
+        cursor: Optional[str] = None
+    ) -> List[Union[Product, Dict[str, Any]]]:
         """
+        Liste les produits avec filtres optionnels
         
-        result = neo4j_db.execute_query(query, params)
-        return [Product(**r["p"]) for r in result]
+        Args:
+            category: Filtrer par catégorie
+            status: Filtrer par statut
+            limit: Nombre de résultats
+            skip: Nombre de résultats à sauter
+            fields: Propriétés à retourner ; si fourni, retourne des dicts partiels
+            cursor: Curseur de pagination (voir list_products_page)
+            
+        Returns:
+            Liste de produits (ou de dicts projetés)
+        """
+        products, _ = await self.list_products_page(
+            category=category,
+            status=status,
+            limit=limit,
+            cursor=cursor,
+            skip=skip,
+            fields=fields
+        )
+        return products
     
-    async def search_products(self, search_query: SearchQuery) -> List[SearchResult]:
+    @staticmethod
+    def _search_filters(search_query: SearchQuery) -> Dict[str, Any]:
+        """Filtres de recherche transmis au stockage (catégorie, statut, prix)"""
+        return {
+            "category": search_query.category,
+            "status": search_query.status,
+            "min_price": search_query.min_price,
+            "max_price": search_query.max_price
+        }
+    
+    @traced()
+    async def search_products(
+        self,
+        search_query: SearchQuery,
+        timings: Optional[Dict[str, float]] = None
+    ) -> List[SearchResult]:
         """
-        Recherche de produits avec recherche vectorielle sémantique
+        Recherche de produits : sémantique (vecteurs), lexicale (plein texte)
+        ou hybride (fusion des deux classements)
+        
+        Les filtres (catégorie, statut, prix) sont appliqués par le stockage
+        afin de toujours retourner jusqu'à `top_k` résultats.
         
         Args:
             search_query: Requête de recherche avec filtres
+            timings: Dictionnaire rempli avec la durée (ms) de chaque étape
             
         Returns:
             Liste de résultats avec scores de pertinence
         """
-        if search_query.use_semantic:
-            # Recherche vectorielle
-            results = neo4j_db.vector_search(
-                query_text=search_query.query,
-                label="Product",
-                top_k=search_query.limit,
-                min_score=0.3  # Score minimum de similarité
-            )
-            
-            search_results = []
-            for r in results:
-                product = Product(**r["node"])
-                
-                # Appliquer les filtres supplémentaires
-                if search_query.category and product.category != search_query.category:
-                    continue
-                if search_query.status and product.status != search_query.status:
-                    continue
-                if search_query.min_price and product.price < search_query.min_price:
-                    continue
-                if search_query.max_price and product.price > search_query.max_price:
-                    continue
-                
-                search_results.append(
-                    SearchResult(product=product, score=r["score"])
-                )
-            
-            return search_results
+        timings = timings if timings is not None else {}
+        mode = search_query.mode or ("semantic" if search_query.use_semantic else "lexical")
         
+        if mode == "semantic":
+            results = await self._timed("vector", self._semantic_search(search_query, search_query.top_k), timings)
+        elif mode == "lexical":
+            results = await self._timed("lexical", self._lexical_search(search_query, search_query.top_k), timings)
         else:
-            # Recherche textuelle classique
-            where_clauses = ["toLower(p.name) CONTAINS toLower($query) OR toLower(p.description) CONTAINS toLower($query)"]
-            params = {"query": search_query.query, "limit": search_query.limit}
-            
-            if search_query.category:
-                where_clauses.append("p.category = $category")
-                params["category"] = search_query.category
-            
-            if search_query.status:
-                where_clauses.append("p.status = $status")
-                params["status"] = search_query.status
-            
-            if search_query.min_price:
-                where_clauses.append("p.price >= $min_price")
-                params["min_price"] = search_query.min_price
+            results = await self._hybrid_search(search_query, timings)
+        
+        metrics.search_results.observe(len(results), mode=mode)
+        return results
+    
+    @staticmethod
+    async def _timed(stage: str, coroutine, timings: Dict[str, float]):
+        """Attend une étape de recherche et enregistre sa durée en millisecondes"""
+        started = time.perf_counter()
+        try:
+            return await coroutine
+        finally:
+            timings[stage] = 1000 * (time.perf_counter() - started)
+    
+    @traced()
+    async def _semantic_search(self, search_query: SearchQuery, top_k: int) -> List[SearchResult]:
+        """Recherche vectorielle (index local si activé et chargé, sinon Neo4j)"""
+        if settings.vector_search_engine == "local" and self.local_index.loaded:
+            return await self._local_vector_search(search_query, top_k)
+        
+        results = await self.store.vector_search(
+            search_query.query,
+            top_k=top_k,
+            min_score=search_query.min_score,
+            filters=self._search_filters(search_query)
+        )
+        
+        with tracer.span("product.build_results", results=len(results)):
+            return [
+                SearchResult(product=self._to_product(product), score=score)
+                for product, score in results
+            ]
+    
+    @traced()
+    async def _lexical_search(self, search_query: SearchQuery, top_k: int) -> List[SearchResult]:
+        """Recherche plein texte (index Lucene, analyseur français, score BM25)"""
+        results = await self.store.fulltext_search(
+            search_query.query,
+            top_k=top_k,
+            filters=self._search_filters(search_query)
+        )
+        
+        # BM25 n'est pas borné : normalisation par le meilleur score (0-1)
+        best_score = max((score for _, score in results), default=0.0) or 1.0
+        with tracer.span("product.build_results", results=len(results)):
+            return [
+                SearchResult(product=self._to_product(product), score=score / best_score)
+                for product, score in results
+            ]
+    
+    @traced()
+    async def _hybrid_search(self, search_query: SearchQuery, timings: Dict[str, float]) -> List[SearchResult]:
+        """
+        Recherche hybride : les étapes lexicale et vectorielle s'exécutent en
+        parallèle, puis leurs classements sont fusionnés
+        
+        - "rrf" : Reciprocal Rank Fusion, somme des 1 / (k + rang)
+        - "weighted" : moyenne pondérée des scores normalisés (0-1)
+        """
+        # Chaque étape remonte plus de candidats que top_k pour que la fusion
+        # puisse promouvoir des produits classés moyennement dans les deux listes
+        depth = min(search_query.top_k * 2, 100)
+        
+        started = time.perf_counter()
+        lexical, semantic = await asyncio.gather(
+            self._timed("lexical", self._lexical_search(search_query, depth), timings),
+            self._timed("vector", self._semantic_search(search_query, depth), timings)
+        )
+        
+        fusion_started = time.perf_counter()
+        products: Dict[str, Product] = {}
+        scores: Dict[str, float] = {}
+        
+        if search_query.fusion == "rrf":
+            k = settings.search_rrf_k
+            for results in (lexical, semantic):
+                for rank, result in enumerate(results, start=1):
+                    products.setdefault(result.product.id, result.product)
+                    scores[result.product.id] = scores.get(result.product.id, 0.0) + 1 / (k + rank)
+            # Score maximal théorique : premier dans les deux classements
+            max_score = 2 / (k + 1)
+        else:
+            weight = search_query.semantic_weight
+            for results, stage_weight in ((lexical, 1 - weight), (semantic, weight)):
+                for result in results:
+                    products.setdefault(result.product.id, result.product)
+                    scores[result.product.id] = scores.get(result.product.id, 0.0) + stage_weight * result.score
+            max_score = 1.0
+        
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:search_query.top_k]
+        fused = [
+            SearchResult(product=products[product_id], score=min(1.0, score / max_score))
+            for product_id, score in ranked
+        ]
+        
+        timings["fusion"] = 1000 * (time.perf_counter() - fusion_started)
+        timings["total"] = 1000 * (time.perf_counter() - started)
+        return fused
+    
+    @traced()
+    async def _local_vector_search(self, search_query: SearchQuery, top_k: int) -> List[SearchResult]:
+        """Recherche sémantique sur l'index local, puis lecture des produits trouvés"""
+        query_embedding = await neo4j_db.generate_embedding_async(search_query.query)
+        
+        with tracer.span("local_index.search"):
+            hits = self.local_index.search(
+                query_embedding,
+                top_k=top_k,
+                min_score=search_query.min_score,
+                category=search_query.category,
+                status=search_query.status,
+                min_price=search_query.min_price,
+                max_price=search_query.max_price
+            )
+        if not hits:
+            return []
+        
+        nodes = await self.store.get_many([product_id for product_id, _ in hits])
+        
+        with tracer.span("product.build_results", results=len(nodes)):
+            return [
+                SearchResult(product=self._to_product(nodes[product_id]), score=score)
+                for product_id, score in hits
+                if product_id in nodes
+            ]
+    
+    async def compare_search_engines(self, queries: List[str], top_k: int = 10) -> Dict[str, Any]:
+        """
+        Compare l'index vectoriel Neo4j (approché) à l'index local (exact)
+        
+        Args:
+            queries: Requêtes de test
+            top_k: Nombre de voisins comparés
             
-            if search_query.max_price:
-                where_clauses.append("p.price <= $max_price")
-                params["max_price"] = search_query.max_price
+        Returns:
+            Rappel@k moyen de Neo4j par rapport à la recherche exacte locale,
+            détail par requête et latences moyennes des deux moteurs
+        """
+        if not self.local_index.loaded:
+            await self.load_local_index()
+        
+        per_query = []
+        neo4j_time = local_time = 0.0
+        
+        for text in queries:
+            embedding = await neo4j_db.generate_embedding_async(text)
             
-            where_clause = " AND ".join(where_clauses)
+            started = time.perf_counter()
+            neo4j_hits = await self.store.vector_search(text, top_k=top_k, fields=("id",))
+            neo4j_time += time.perf_counter() - started
             
-            query = f"""
-            MATCH (p:Product)
-            WHERE {where_clause}
-            RETURN p
-            LIMIT $limit
-            """
+            started = time.perf_counter()
+            local_hits = self.local_index.search(embedding, top_k=top_k)
+            local_time += time.perf_counter() - started
             
-            result = neo4j_db.execute_query(query, params)
-            return [SearchResult(product=Product(**r["p"]), score=1.0) for r in result]
+            neo4j_ids = {product["id"] for product, _ in neo4j_hits}
+            local_ids = {product_id for product_id, _ in local_hits}
+            recall = len(neo4j_ids & local_ids) / len(local_ids) if local_ids else 1.0
+            per_query.append({"query": text, "recall": recall})
+        
+        count = len(queries) or 1
+        return {
+            "queries": len(queries),
+            "top_k": top_k,
+            "indexed_products": len(self.local_index),
+            "mean_recall": sum(q["recall"] for q in per_query) / count,
+            "neo4j_ms": 1000 * neo4j_time / count,
+            "local_ms": 1000 * local_time / count,
+            "per_query": per_query
+        }
 
 
 # Instance globale
@@ -0,0 +1,114 @@
+"""
+Lecture en flux des fichiers d'import de produits (NDJSON et CSV)
+
+Les lecteurs produisent des couples (numéro de ligne, dictionnaire brut)
+un par un, sans charger le fichier en mémoire ; la validation est faite
+par ProductService.bulk_create_products, qui les consomme par lots sur un
+thread (iterate_in_thread) : la lecture du fichier ne bloque pas la boucle.
+"""
+import asyncio
+import csv
+import itertools
+import json
+from typing import Any, AsyncIterator, Dict, Iterable, Iterator, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+# Séparateur des images additionnelles dans une cellule CSV
+CSV_LIST_SEPARATOR = "|"
+
+SUPPORTED_FORMATS = ("ndjson", "csv")
+
+
+def iter_ndjson_rows(lines: Iterable[str]) -> Iterator[Tuple[int, Any]]:
+    """
+    Lit un flux NDJSON (un objet JSON par ligne)
+    
+    Les lignes vides sont ignorées ; une ligne illisible est transmise sous
+    forme de ValueError afin d'être comptée comme erreur sans interrompre l'import.
+    
+    Args:
+        lines: Lignes de texte
+    
+    Yields:
+        (numéro de ligne, objet décodé ou ValueError)
+    """
+    for line_number, line in enumerate(lines, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield line_number, json.loads(line)
+        except json.JSONDecodeError as e:
+            yield line_number, ValueError(f"JSON invalide: {e.msg}")
+
+
+def iter_csv_rows(lines: Iterable[str]) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """
+    Lit un flux CSV avec ligne d'en-tête (noms des champs de ProductCreate)
+    
+    Les cellules vides deviennent None et `additional_images` est découpé
+    sur le séparateur "|".
+    
+    Args:
+        lines: Lignes de texte
+    
+    Yields:
+        (numéro de ligne, dictionnaire des colonnes)
+    """
+    reader = csv.DictReader(lines)
+    for row in reader:
+        data: Dict[str, Any] = {}
+        for key, value in row.items():
+            if key is None:
+                continue  # Colonnes excédentaires
+            value = value.strip() if isinstance(value, str) else value
+            data[key.strip()] = value if value != "" else None
+        
+        images = data.pop("additional_images", None)
+        if images:
+            data["additional_images"] = [url.strip() for url in images.split(CSV_LIST_SEPARATOR) if url.strip()]
+        
+        yield reader.line_num, data
+
+
+def detect_format(filename: Optional[str], content_type: Optional[str] = None) -> str:
+    """
+    Devine le format d'un fichier d'import depuis son nom ou son type MIME
+    
+    Raises:
+        ValueError: Si le format n'est pas reconnu
+    """
+    name = (filename or "").lower()
+    content_type = (content_type or "").lower()
+    
+    if name.endswith((".ndjson", ".jsonl")) or "ndjson" in content_type or "jsonl" in content_type:
+        return "ndjson"
+    if name.endswith(".csv") or "csv" in content_type:
+        return "csv"
+    raise ValueError("Format d'import non reconnu (attendu: ndjson ou csv)")
+
+
+def iter_rows(lines: Iterable[str], file_format: str) -> Iterator[Tuple[int, Any]]:
+    """Sélectionne le lecteur correspondant au format"""
+    if file_format == "ndjson":
+        return iter_ndjson_rows(lines)
+    if file_format == "csv":
+        return iter_csv_rows(lines)
+    raise ValueError(f"Format d'import inconnu: {file_format}")
+
+
+async def iterate_in_thread(items: Iterable[T], batch_size: int) -> AsyncIterator[T]:
+    """
+    Parcourt un itérable bloquant (fichier, lecteur CSV) sans bloquer la boucle
+    
+    Les éléments sont lus par lots de `batch_size` sur un thread, puis
+    restitués un par un.
+    """
+    iterator = iter(items)
+    while True:
+        batch = await asyncio.to_thread(list, itertools.islice(iterator, batch_size))
+        if not batch:
+            return
+        for item in batch:
+            yield item
@@ -0,0 +1,819 @@
+"""
+Stockage des produits : interface, implémentation Neo4j et catalogue en mémoire
+
+ProductService ne manipule que cette interface. Deux implémentations :
+
+- Neo4jProductStore : requêtes Cypher (source de vérité)
+- InMemoryProductStore : catalogue complet en mémoire (dictionnaire et
+  index triés), en cache de lecture d'un stockage sous-jacent. Le catalogue
+  est chargé en une requête au démarrage ; les écritures sont appliquées au
+  stockage sous-jacent puis reportées en mémoire (write-through), et les
+  lectures sont servies sans aller-retour réseau. La recherche et les
+  données d'embedding restent déléguées au stockage sous-jacent (index
+  vectoriel et plein texte). Tant que le catalogue n'est pas chargé (ou
+  s'il dépasse PRODUCT_STORE_MAX_PRODUCTS), les lectures sont transmises
+  au stockage sous-jacent. Chaque worker ayant sa propre copie, le catalogue
+  est rechargé périodiquement pour reprendre les écritures des autres
+  processus (PRODUCT_STORE_RELOAD_INTERVAL).
+
+Les produits échangés sont des dictionnaires de propriétés (sans
+l'embedding, sauf à la création) ; les positions de pagination sont des
+couples (created_at, id), triés du plus récent au plus ancien.
+"""
+import asyncio
+import bisect
+import time
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from app.database import neo4j_db
+from app.models import PRODUCT_FIELDS, PRODUCT_SEARCH_FIELDS
+
+# Position d'un produit dans l'ordre de pagination : (created_at, id)
+Position = Tuple[str, str]
+
+# Propriétés pouvant servir de filtre d'égalité dans list_page
+INDEXED_FIELDS = ("category", "status")
+
+# Propriétés composant le texte recherchable, comparées avant d'écrire un vecteur
+SOURCE_FIELDS = list(PRODUCT_SEARCH_FIELDS)
+
+
+class ProductStore:
+    """Interface de stockage des produits"""
+    
+    async def load(self) -> Optional[int]:
+        """Prépare le stockage (chargement du catalogue) ; retourne le nombre de produits chargés"""
+        return None
+    
+    async def create(self, props: Dict[str, Any]) -> bool:
+        """Crée un produit (propriétés complètes, embedding compris)"""
+        raise NotImplementedError
+    
+    async def bulk_create(self, rows: List[Dict[str, Any]]) -> int:
+        """Crée des produits en une transaction ; retourne le nombre créé"""
+        raise NotImplementedError
+    
+    async def get(self, product_id: str, fields: Optional[Sequence[str]] = None) -> Optional[Dict[str, Any]]:
+        """Propriétés d'un produit (`fields`, par défaut PRODUCT_FIELDS), ou None"""
+        raise NotImplementedError
+    
+    async def get_updated_at(self, product_id: str) -> Optional[str]:
+        """Date de modification brute d'un produit (validation d'ETag), ou None"""
+        raise NotImplementedError
+    
+    async def get_many(self, product_ids: Sequence[str]) -> Dict[str, Dict[str, Any]]:
+        """Propriétés (PRODUCT_FIELDS) des produits existants, par ID"""
+        raise NotImplementedError
+    
+    async def update(self, product_id: str, props: Dict[str, Any]) -> Optional[Tuple[Dict[str, Any], Optional[str]]]:
+        """
+        Met à jour des propriétés
+        
+        Returns:
+            (propriétés après mise à jour, embedding_hash stocké), ou None si absent
+        """
+        raise NotImplementedError
+    
+    async def delete(self, product_id: str) -> bool:
+        """Supprime un produit ; retourne False s'il n'existait pas"""
+        raise NotImplementedError
+    
+    async def fetch_embedding_sources(self, product_ids: Sequence[str]) -> List[Dict[str, Any]]:
+        """
+        Texte source et métadonnées d'embedding des produits existants
+        
+        Returns:
+            id, champs de SOURCE_FIELDS, embedding_hash et embedding_model
+            stockés (recalcul différé des embeddings)
+        """
+        raise NotImplementedError
+    
+    async def write_embeddings(self, rows: List[Dict[str, Any]]) -> List[str]:
+        """
+        Écrit des embeddings recalculés, si le texte source n'a pas changé
+        
+        Args:
+            rows: id, source (valeurs de SOURCE_FIELDS encodées), embedding,
+                embedding_model, embedding_hash
+        
+        Returns:
+            IDs des produits écrits (les autres ont été modifiés entre-temps)
+        """
+        raise NotImplementedError
+    
+    async def list_page(
+        self,
+        category: Optional[str] = None,
+        status: Optional[str] = None,
+        limit: int = 20,
+        after: Optional[Position] = None,
+        skip: int = 0,
+        fields: Optional[Sequence[str]] = None
+    ) -> List[Tuple[Dict[str, Any], Position]]:
+        """
+        Produits du plus récent au plus ancien, strictement après `after`
+        
+        Returns:
+            Jusqu'à `limit` couples (propriétés, position)
+        """
+        raise NotImplementedError
+    
+    async def list_signature(self, category: Optional[str] = None, status: Optional[str] = None) -> Tuple[int, Optional[str]]:
+        """
+        Empreinte des produits filtrés : (nombre, updated_at le plus récent)
+        
+        Toute création, suppression ou modification d'un produit du filtre la
+        change, quel que soit le processus qui a écrit (ETag des listes).
+        """
+        raise NotImplementedError
+    
+    async def load_catalogue(self, max_products: int) -> List[Tuple[Dict[str, Any], Optional[str]]]:
+        """
+        Lit tout le catalogue, sans embeddings (chargement d'InMemoryProductStore)
+        
+        Returns:
+            Jusqu'à `max_products` + 1 couples (propriétés, embedding_hash)
+        """
+        raise NotImplementedError
+    
+    async def load_embeddings(self) -> List[Dict[str, Any]]:
+        """Embeddings et filtres (id, embedding, category, status, price) pour l'index local"""
+        raise NotImplementedError
+    
+    async def vector_search(
+        self,
+        query_text: str,
+        top_k: int,
+        min_score: float = 0.0,
+        filters: Optional[Dict[str, Any]] = None,
+        fields: Optional[Sequence[str]] = None
+    ) -> List[Tuple[Dict[str, Any], float]]:
+        """
+        Recherche vectorielle
+        
+        Args:
+            filters: category, status (égalité), min_price, max_price (bornes incluses)
+        
+        Returns:
+            Couples (propriétés, score cosinus)
+        """
+        raise NotImplementedError
+    
+    async def fulltext_search(
+        self,
+        query_text: str,
+        top_k: int,
+        filters: Optional[Dict[str, Any]] = None,
+        fields: Optional[Sequence[str]] = None
+    ) -> List[Tuple[Dict[str, Any], float]]:
+        """Recherche plein texte ; couples (propriétés, score BM25 brut)"""
+        raise NotImplementedError
+    
+    def stats(self) -> Dict[str, Any]:
+        return {"store": type(self).__name__}
+
+
+class Neo4jProductStore(ProductStore):
+    """Produits stockés dans Neo4j (requêtes Cypher)"""
+    
+    @staticmethod
+    def _projection(alias: str = "p", fields: Optional[Sequence[str]] = None) -> str:
+        """
+        Construit une projection Cypher des propriétés d'un produit
+        
+        Seules les propriétés explicitement listées sont renvoyées : l'embedding
+        (384 floats) n'est jamais transféré depuis Neo4j pour les lectures.
+        
+        Args:
+            alias: Variable Cypher désignant le produit
+            fields: Propriétés à retourner (par défaut PRODUCT_FIELDS)
+        """
+        names = fields or PRODUCT_FIELDS
+        return f"{alias} {{{', '.join('.' + name for name in names)}}}"
+    
+    @staticmethod
+    def _search_filters(filters: Optional[Dict[str, Any]], alias: str) -> Tuple[Optional[str], Dict[str, Any]]:
+        """
+        Construit la condition Cypher correspondant aux filtres de recherche
+        
+        Args:
+            filters: category, status, min_price, max_price (None = ignoré)
+            alias: Variable Cypher désignant le produit (ex: "p", "node")
+        
+        Returns:
+            Condition (None si aucun filtre) et paramètres associés
+        """
+        where_clauses = []
+        params: Dict[str, Any] = {}
+        filters = filters or {}
+        
+        if filters.get("category"):
+            where_clauses.append(f"{alias}.category = $category")
+            params["category"] = filters["category"]
+        
+        if filters.get("status"):
+            where_clauses.append(f"{alias}.status = $status")
+            params["status"] = filters["status"]
+        
+        if filters.get("min_price") is not None:
+            where_clauses.append(f"{alias}.price >= $min_price")
+            params["min_price"] = filters["min_price"]
+        
+        if filters.get("max_price") is not None:
+            where_clauses.append(f"{alias}.price <= $max_price")
+            params["max_price"] = filters["max_price"]
+        
+        return " AND ".join(where_clauses) or None, params
+    
+    async def create(self, props: Dict[str, Any]) -> bool:
+        query = """
+        CREATE (p:Product $props)
+        RETURN p.id AS id
+        """
+        
+        result = await neo4j_db.execute_query_async(query, {"props": props}, name="product.create")
+        return bool(result)
+    
+    async def bulk_create(self, rows: List[Dict[str, Any]]) -> int:
+        query = """
+        UNWIND $rows AS row
+        CREATE (p:Product)
+        SET p = row
+        RETURN count(p) AS created
+        """
+        
+        result = await neo4j_db.execute_query_async(query, {"rows": rows}, name="product.bulk_create")
+        return result[0]["created"] if result else 0
+    
+    async def get(self, product_id: str, fields: Optional[Sequence[str]] = None) -> Optional[Dict[str, Any]]:
+        query = f"""
+        MATCH (p:Product {{id: $product_id}})
+        RETURN {self._projection("p", fields)} AS p
+        """
+        
+        result = await neo4j_db.execute_query_async(query, {"product_id": product_id}, name="product.get")
+        return result[0]["p"] if result else None
+    
+    async def get_updated_at(self, product_id: str) -> Optional[str]:
+        query = """
+        MATCH (p:Product {id: $product_id})
+        RETURN p.updated_at AS updated_at
+        """
+        
+        result = await neo4j_db.execute_query_async(query, {"product_id": product_id}, name="product.updated_at")
+        return result[0]["updated_at"] if result else None
+    
+    async def get_many(self, product_ids: Sequence[str]) -> Dict[str, Dict[str, Any]]:
+        query = f"""
+        MATCH (p:Product)
+        WHERE p.id IN $ids
+        RETURN {self._projection("p")} AS p
+        """
+        
+        result = await neo4j_db.execute_query_async(query, {"ids": list(product_ids)}, name="product.by_ids")
+        return {r["p"]["id"]: r["p"] for r in result}
+    
+    async def update(self, product_id: str, props: Dict[str, Any]) -> Optional[Tuple[Dict[str, Any], Optional[str]]]:
+        query = f"""
+        MATCH (p:Product {{id: $product_id}})
+        SET p += $props
+        RETURN {self._projection("p")} AS p, p.embedding_hash AS embedding_hash
+        """
+        
+        result = await neo4j_db.execute_query_async(query, {"product_id": product_id, "props": props}, name="product.update")
+        if not result:
+            return None
+        return result[0]["p"], result[0]["embedding_hash"]
+    
+    async def delete(self, product_id: str) -> bool:
+        query = """
+        MATCH (p:Product {id: $product_id})
+        DELETE p
+        RETURN count(p) as deleted
+        """
+        
+        result = await neo4j_db.execute_query_async(query, {"product_id": product_id}, name="product.delete")
+        return result[0]["deleted"] > 0 if result else False
+    
+    async def fetch_embedding_sources(self, product_ids: Sequence[str]) -> List[Dict[str, Any]]:
+        query = """
+        UNWIND $ids AS product_id
+        MATCH (p:Product {id: product_id})
+        RETURN p.id AS id, p.name AS name, p.description AS description,
+               p.short_description AS short_description, p.category AS category,
+               p.status AS status, p.price AS price,
+               p.embedding_hash AS embedding_hash, p.embedding_model AS embedding_model
+        """
+        
+        return await neo4j_db.execute_query_async(query, {"ids": list(product_ids)}, name="product.embedding_sources")
+    
+    async def write_embeddings(self, rows: List[Dict[str, Any]]) -> List[str]:
+        query = """
+        UNWIND $rows AS row
+        MATCH (p:Product {id: row.id})
+        WHERE [field IN $source_fields | coalesce(p[field], "")] = row.source
+        SET p.embedding = row.embedding,
+            p.embedding_model = row.embedding_model,
+            p.embedding_hash = row.embedding_hash
+        RETURN p.id AS id
+        """
+        
+        result = await neo4j_db.execute_query_async(query, {"rows": rows, "source_fields": SOURCE_FIELDS}, name="product.write_embeddings")
+        return [r["id"] for r in result]
+    
+    async def list_page(
+        self,
+        category: Optional[str] = None,
+        status: Optional[str] = None,
+        limit: int = 20,
+        after: Optional[Position] = None,
+        skip: int = 0,
+        fields: Optional[Sequence[str]] = None
+    ) -> List[Tuple[Dict[str, Any], Position]]:
+        """
+        La pagination par curseur (keyset) reprend après `after` via l'index
+        (created_at, id) : le coût d'une page ne dépend pas de sa profondeur.
+        """
+        where_clauses = []
+        params: Dict[str, Any] = {"limit": limit, "skip": skip}
+        
+        if category:
+            where_clauses.append("p.category = $category")
+            params["category"] = category
+        
+        if status:
+            where_clauses.append("p.status = $status")
+            params["status"] = status
+        
+        if after:
+            params["cursor_created_at"], params["cursor_id"] = after
+            where_clauses.append(
+                "p.created_at <= $cursor_created_at"
+                " AND (p.created_at < $cursor_created_at OR p.id < $cursor_id)"
+            )
+        else:
+            # Prédicat permettant un parcours ordonné de l'index (created_at, id)
+            where_clauses.append("p.created_at IS NOT NULL")
+        
+        where_clause = " AND ".join(where_clauses)
+        skip_clause = "SKIP $skip" if skip else ""
+        
+        query = f"""
+        MATCH (p:Product)
+        WHERE {where_clause}
+        WITH p
+        ORDER BY p.created_at DESC, p.id DESC
+        {skip_clause}
+        LIMIT $limit
+        RETURN {self._projection("p", fields)} AS p, p.created_at AS cursor_created_at, p.id AS cursor_id
+        """
+        
+        result = await neo4j_db.execute_query_async(query, params, name="product.list")
+        return [(r["p"], (r["cursor_created_at"], r["cursor_id"])) for r in result]
+    
+    async def list_signature(self, category: Optional[str] = None, status: Optional[str] = None) -> Tuple[int, Optional[str]]:
+        where, params = self._search_filters({"category": category, "status": status}, "p")
+        query = f"""
+        MATCH (p:Product)
+        {f"WHERE {where}" if where else ""}
+        RETURN count(p) AS total, max(p.updated_at) AS updated_at
+        """
+        
+        result = await neo4j_db.execute_query_async(query, params, name="product.list_signature")
+        return (result[0]["total"], result[0]["updated_at"]) if result else (0, None)
+    
+    async def load_catalogue(self, max_products: int) -> List[Tuple[Dict[str, Any], Optional[str]]]:
+        query = f"""
+        MATCH (p:Product)
+        RETURN {self._projection("p")} AS p, p.embedding_hash AS embedding_hash
+        LIMIT $limit
+        """
+        
+        result = await neo4j_db.execute_query_async(query, {"limit": max_products + 1}, name="product.load_catalogue")
+        return [(r["p"], r["embedding_hash"]) for r in result]
+    
+    async def load_embeddings(self) -> List[Dict[str, Any]]:
+        query = """
+        MATCH (p:Product)
+        WHERE p.embedding IS NOT NULL
+        RETURN p.id AS id, p.embedding AS embedding, p.category AS category,
+               p.status AS status, p.price AS price
+        """
+        
+        return await neo4j_db.execute_query_async(query, name="product.load_local_index")
+    
+    async def vector_search(
+        self,
+        query_text: str,
+        top_k: int,
+        min_score: float = 0.0,
+        filters: Optional[Dict[str, Any]] = None,
+        fields: Optional[Sequence[str]] = None
+    ) -> List[Tuple[Dict[str, Any], float]]:
+        where, params = self._search_filters(filters, "node")
+        results = await neo4j_db.vector_search_async(
+            query_text=query_text,
+            label="Product",
+            top_k=top_k,
+            min_score=min_score,
+            where=where,
+            parameters=params,
+            projection=self._projection("node", fields)
+        )
+        return [(r["node"], r["score"]) for r in results]
+    
+    async def fulltext_search(
+        self,
+        query_text: str,
+        top_k: int,
+        filters: Optional[Dict[str, Any]] = None,
+        fields: Optional[Sequence[str]] = None
+    ) -> List[Tuple[Dict[str, Any], float]]:
+        where, params = self._search_filters(filters, "node")
+        results = await neo4j_db.fulltext_search_async(
+            query_text=query_text,
+            label="Product",
+            top_k=top_k,
+            where=where,
+            parameters=params,
+            projection=self._projection("node", fields)
+        )
+        return [(r["node"], r["score"]) for r in results]
+
+
+class InMemoryProductStore(ProductStore):
+    """Catalogue complet en mémoire, en cache de lecture d'un autre stockage"""
+    
+    def __init__(
+        self,
+        backing: ProductStore,
+        max_products: int = 20000,
+        reload_interval: float = 60.0,
+        retry_delay: float = 5.0
+    ):
+        """
+        Args:
+            backing: Stockage sous-jacent (source de vérité, recherche)
+            max_products: Au-delà, le catalogue n'est pas chargé (lectures transmises)
+            reload_interval: Rechargement complet après ce délai en secondes (0 = jamais)
+            retry_delay: Attente avant de retenter un chargement échoué ou abandonné
+        """
+        self.backing = backing
+        self.max_products = max_products
+        self.reload_interval = reload_interval
+        self.retry_delay = retry_delay
+        
+        self._products: Dict[str, Dict[str, Any]] = {}
+        self._hashes: Dict[str, Optional[str]] = {}
+        # Positions triées par ordre croissant (parcourues à l'envers)
+        self._order: List[Position] = []
+        self._by_value: Dict[Tuple[str, Any], List[Position]] = {}
+        # Empreintes des listes par filtre, vidées à chaque modification
+        self._signatures: Dict[Tuple[Optional[str], Optional[str]], Tuple[int, Optional[str]]] = {}
+        
+        self.loaded = False
+        self._version = 0  # Incrémenté à chaque écriture (détecte un chargement concurrent)
+        self._next_load_at = 0.0
+        self._load_task: Optional[asyncio.Task] = None
+        
+        # Métriques
+        self._memory_reads = 0
+        self._backing_reads = 0
+        self._loads = 0
+        self._discarded_loads = 0
+        self._too_large = False
+    
+    def __len__(self) -> int:
+        return len(self._products)
+    
+    # Index
+    
+    @staticmethod
+    def _position(props: Dict[str, Any]) -> Optional[Position]:
+        created_at = props.get("created_at")
+        return (created_at, props["id"]) if isinstance(created_at, str) else None
+    
+    def _put(self, props: Dict[str, Any], embedding_hash: Optional[str] = None):
+        """Ajoute ou remplace un produit et met à jour les index"""
+        product_id = props["id"]
+        self._remove(product_id)
+        self._signatures.clear()
+        
+        record = {name: props.get(name) for name in PRODUCT_FIELDS}
+        self._products[product_id] = record
+        self._hashes[product_id] = embedding_hash
+        
+        position = self._position(record)
+        if position is None:
+            return
+        bisect.insort(self._order, position)
+        for field in INDEXED_FIELDS:
+            if record[field] is not None:
+                bisect.insort(self._by_value.setdefault((field, record[field]), []), position)
+    
+    def _remove(self, product_id: str) -> bool:
+        record = self._products.pop(product_id, None)
+        self._hashes.pop(product_id, None)
+        if record is None:
+            return False
+        self._signatures.clear()
+        
+        position = self._position(record)
+        if position is not None:
+            self._discard(self._order, position)
+            for field in INDEXED_FIELDS:
+                positions = self._by_value.get((field, record[field]))
+                if positions is not None:
+                    self._discard(positions, position)
+        return True
+    
+    @staticmethod
+    def _discard(positions: List[Position], position: Position):
+        index = bisect.bisect_left(positions, position)
+        if index < len(positions) and positions[index] == position:
+            del positions[index]
+    
+    def _replace_all(self, rows: Iterable[Tuple[Dict[str, Any], Optional[str]]]):
+        """Reconstruit le catalogue et ses index en un seul tri"""
+        products: Dict[str, Dict[str, Any]] = {}
+        hashes: Dict[str, Optional[str]] = {}
+        for props, embedding_hash in rows:
+            products[props["id"]] = {name: props.get(name) for name in PRODUCT_FIELDS}
+            hashes[props["id"]] = embedding_hash
+        
+        order: List[Position] = []
+        by_value: Dict[Tuple[str, Any], List[Position]] = {}
+        for record in products.values():
+            position = self._position(record)
+            if position is None:
+                continue
+            order.append(position)
+            for field in INDEXED_FIELDS:
+                if record[field] is not None:
+                    by_value.setdefault((field, record[field]), []).append(position)
+        order.sort()
+        for positions in by_value.values():
+            positions.sort()
+        
+        self._products, self._hashes, self._order, self._by_value = products, hashes, order, by_value
+        self._signatures.clear()
+    
+    @staticmethod
+    def _project(record: Dict[str, Any], fields: Optional[Sequence[str]]) -> Dict[str, Any]:
+        return {name: record.get(name) for name in fields or PRODUCT_FIELDS}
+    
+    # Chargement
+    
+    async def load(self) -> Optional[int]:
+        """
+        Charge tout le catalogue depuis le stockage sous-jacent
+        
+        Le résultat est abandonné si une écriture a eu lieu pendant la
+        lecture (il pourrait ne pas la contenir) ; le chargement sera retenté.
+        
+        Returns:
+            Nombre de produits en mémoire, ou None si le catalogue n'est pas chargé
+        """
+        version = self._version
+        self._next_load_at = time.monotonic() + self.retry_delay
+        try:
+            rows = await self.backing.load_catalogue(self.max_products)
+        except Exception as e:
+            print(f"✗ Chargement du catalogue en mémoire impossible: {e}")
+            return None
+        
+        if len(rows) > self.max_products:
+            self._too_large = True
+            self.loaded = False
+            self._replace_all(())
+            self._next_load_at = time.monotonic() + (self.reload_interval or float("inf"))
+            print(f"✗ Catalogue de plus de {self.max_products} produits : lectures servies par Neo4j")
+            return None
+        
+        if version != self._version:
+            self._discarded_loads += 1
+            return None
+        
+        self._replace_all(rows)
+        self._too_large = False
+        self.loaded = True
+        self._loads += 1
+        self._next_load_at = time.monotonic() + (self.reload_interval or float("inf"))
+        if self._loads == 1:
+            print(f"✓ Catalogue chargé en mémoire : {len(self)} produits")
+        return len(self)
+    
+    def _maybe_reload(self):
+        """Planifie un rechargement en arrière-plan si le catalogue est absent ou ancien"""
+        if time.monotonic() < self._next_load_at:
+            return
+        if self._load_task is not None and not self._load_task.done():
+            return
+        self._load_task = asyncio.create_task(self.load())
+    
+    def _serve_from_memory(self) -> bool:
+        self._maybe_reload()
+        if self.loaded:
+            self._memory_reads += 1
+            return True
+        self._backing_reads += 1
+        return False
+    
+    # Écritures : stockage sous-jacent d'abord, puis mémoire
+    
+    async def create(self, props: Dict[str, Any]) -> bool:
+        if not await self.backing.create(props):
+            return False
+        self._version += 1
+        if self.loaded:
+            self._put(props, props.get("embedding_hash"))
+        return True
+    
+    async def bulk_create(self, rows: List[Dict[str, Any]]) -> int:
+        created = await self.backing.bulk_create(rows)
+        self._version += 1
+        if self.loaded and created:
+            for row in rows:
+                self._put(row, row.get("embedding_hash"))
+        return created
+    
+    async def update(self, product_id: str, props: Dict[str, Any]) -> Optional[Tuple[Dict[str, Any], Optional[str]]]:
+        result = await self.backing.update(product_id, props)
+        self._version += 1
+        if result is not None and self.loaded:
+            self._put(*result)
+        return result
+    
+    async def delete(self, product_id: str) -> bool:
+        deleted = await self.backing.delete(product_id)
+        self._version += 1
+        self._remove(product_id)
+        return deleted
+    
+    async def write_embeddings(self, rows: List[Dict[str, Any]]) -> List[str]:
+        written = await self.backing.write_embeddings(rows)
+        self._version += 1
+        hashes = {row["id"]: row["embedding_hash"] for row in rows}
+        for product_id in written:
+            if product_id in self._products:
+                self._hashes[product_id] = hashes[product_id]
+        return written
+    
+    # Lectures : mémoire une fois le catalogue chargé
+    
+    async def get(self, product_id: str, fields: Optional[Sequence[str]] = None) -> Optional[Dict[str, Any]]:
+        if not self._serve_from_memory():
+            return await self.backing.get(product_id, fields)
+        record = self._products.get(product_id)
+        return self._project(record, fields) if record is not None else None
+    
+    async def get_updated_at(self, product_id: str) -> Optional[str]:
+        if not self._serve_from_memory():
+            return await self.backing.get_updated_at(product_id)
+        record = self._products.get(product_id)
+        return record["updated_at"] if record is not None else None
+    
+    async def get_many(self, product_ids: Sequence[str]) -> Dict[str, Dict[str, Any]]:
+        if not self._serve_from_memory():
+            return await self.backing.get_many(product_ids)
+        return {
+            product_id: self._project(self._products[product_id], None)
+            for product_id in product_ids
+            if product_id in self._products
+        }
+    
+    async def list_page(
+        self,
+        category: Optional[str] = None,
+        status: Optional[str] = None,
+        limit: int = 20,
+        after: Optional[Position] = None,
+        skip: int = 0,
+        fields: Optional[Sequence[str]] = None
+    ) -> List[Tuple[Dict[str, Any], Position]]:
+        if not self._serve_from_memory():
+            return await self.backing.list_page(category, status, limit, after, skip, fields)
+        
+        # Parcours de l'index le plus sélectif, l'autre filtre est vérifié produit par produit
+        filters = {field: value for field, value in (("category", category), ("status", status)) if value}
+        candidates = [self._by_value.get((field, value), []) for field, value in filters.items()]
+        positions = min(candidates, key=len) if candidates else self._order
+        
+        end = bisect.bisect_left(positions, after) if after else len(positions)
+        page: List[Tuple[Dict[str, Any], Position]] = []
+        for index in range(end - 1, -1, -1):
+            position = positions[index]
+            record = self._products[position[1]]
+            if any(record[field] != value for field, value in filters.items()):
+                continue
+            if skip:
+                skip -= 1
+                continue
+            page.append((self._project(record, fields), position))
+            if len(page) >= limit:
+                break
+        return page
+    
+    async def list_signature(self, category: Optional[str] = None, status: Optional[str] = None) -> Tuple[int, Optional[str]]:
+        if not self._serve_from_memory():
+            return await self.backing.list_signature(category, status)
+        
+        key = (category, status)
+        if key not in self._signatures:
+            records = [
+                record for record in self._products.values()
+                if (not category or record["category"] == category) and (not status or record["status"] == status)
+            ]
+            stamps = [record["updated_at"] for record in records if record["updated_at"] is not None]
+            self._signatures[key] = (len(records), max(stamps, default=None))
+        return self._signatures[key]
+    
+    # Recherche : déléguée au stockage sous-jacent, produits lus en mémoire
+    
+    def _hydrate(self, hits: List[Tuple[Dict[str, Any], float]], fields: Optional[Sequence[str]]):
+        """Complète des résultats réduits à l'ID avec les propriétés en mémoire"""
+        return [
+            (self._project(self._products[props["id"]], fields), score)
+            for props, score in hits
+            if props["id"] in self._products
+        ]
+    
+    async def load_catalogue(self, max_products: int) -> List[Tuple[Dict[str, Any], Optional[str]]]:
+        if not self._serve_from_memory():
+            return await self.backing.load_catalogue(max_products)
+        return [
+            (self._project(record, None), self._hashes.get(product_id))
+            for product_id, record in list(self._products.items())[:max_products + 1]
+        ]
+    
+    async def fetch_embedding_sources(self, product_ids: Sequence[str]) -> List[Dict[str, Any]]:
+        # embedding_model n'est pas conservé en mémoire
+        return await self.backing.fetch_embedding_sources(product_ids)
+    
+    async def load_embeddings(self) -> List[Dict[str, Any]]:
+        return await self.backing.load_embeddings()
+    
+    async def vector_search(
+        self,
+        query_text: str,
+        top_k: int,
+        min_score: float = 0.0,
+        filters: Optional[Dict[str, Any]] = None,
+        fields: Optional[Sequence[str]] = None
+    ) -> List[Tuple[Dict[str, Any], float]]:
+        if not self._serve_from_memory():
+            return await self.backing.vector_search(query_text, top_k, min_score, filters, fields)
+        hits = await self.backing.vector_search(query_text, top_k, min_score, filters, fields=("id",))
+        return self._hydrate(hits, fields)
+    
+    async def fulltext_search(
+        self,
+        query_text: str,
+        top_k: int,
+        filters: Optional[Dict[str, Any]] = None,
+        fields: Optional[Sequence[str]] = None
+    ) -> List[Tuple[Dict[str, Any], float]]:
+        if not self._serve_from_memory():
+            return await self.backing.fulltext_search(query_text, top_k, filters, fields)
+        hits = await self.backing.fulltext_search(query_text, top_k, filters, fields=("id",))
+        return self._hydrate(hits, fields)
+    
+    def stats(self) -> Dict[str, Any]:
+        reads = self._memory_reads + self._backing_reads
+        return {
+            "store": type(self).__name__,
+            "backing": type(self.backing).__name__,
+            "loaded": self.loaded,
+            "products": len(self),
+            "too_large": self._too_large,
+            "max_products": self.max_products,
+            "memory_reads": self._memory_reads,
+            "backing_reads": self._backing_reads,
+            "memory_read_ratio": self._memory_reads / reads if reads else 0.0,
+            "loads": self._loads,
+            "discarded_loads": self._discarded_loads,
+        }
+
+
+def create_product_store(
+    name: str,
+    max_products: int = 20000,
+    reload_interval: float = 60.0
+) -> ProductStore:
+    """
+    Instancie le stockage des produits
+    
+    Args:
+        name: "neo4j" ou "memory" (catalogue en mémoire, cache de lecture de Neo4j)
+        max_products: Taille maximale du catalogue chargé en mémoire
+        reload_interval: Rechargement périodique du catalogue en mémoire (secondes, 0 = jamais)
+    """
+    if name == "neo4j":
+        return Neo4jProductStore()
+    if name == "memory":
+        return InMemoryProductStore(
+            Neo4jProductStore(),
+            max_products=max_products,
+            reload_interval=reload_interval
+        )
+    raise ValueError(f"Stockage des produits inconnu: {name}")
@@ -0,0 +1,188 @@
+"""
+Service des refresh tokens (sessions longues sans rehachage du mot de passe)
+
+Un refresh token est une valeur aléatoire opaque remise au client ; seule
+son empreinte SHA-256 est stockée, sur un nœud RefreshToken relié à
+l'utilisateur. Chaque utilisation le remplace par un nouveau token de la
+même famille (rotation). Présenter un token déjà remplacé signale un vol
+probable : toute la famille est alors révoquée.
+
+Seul le token actif d'une famille reste relié à l'utilisateur : un token
+remplacé devient une pierre tombale (nœud détaché, retrouvé par son
+empreinte) tant que la famille existe, de sorte que rejouer n'importe
+quel ancêtre révoque la session. Une famille révoquée est supprimée avec
+ses pierres tombales ; l'ouverture d'une session supprime les familles
+expirées de l'utilisateur.
+"""
+from typing import Optional, Tuple
+from datetime import datetime, timedelta
+import hashlib
+import secrets
+import uuid
+
+from app.config import settings
+from app.database import neo4j_db
+from app.models.user import User
+
+# Propriétés de l'utilisateur renvoyées avec le token (sans le hash du mot de passe)
+USER_PROJECTION = "u {" + ", ".join("." + name for name in User.model_fields) + "}"
+
+
+class InvalidRefreshToken(ValueError):
+    """Refresh token inconnu, expiré, révoqué ou réutilisé"""
+
+
+class RefreshTokenService:
+    """Service pour émettre, renouveler et révoquer les refresh tokens"""
+    
+    @staticmethod
+    def _hash(token: str) -> str:
+        return hashlib.sha256(token.encode("utf-8")).hexdigest()
+    
+    def _new_token(self) -> Tuple[str, dict]:
+        """Génère un token et les propriétés de son nœud"""
+        token = secrets.token_urlsafe(32)
+        now = datetime.now()
+        return token, {
+            "id": str(uuid.uuid4()),
+            "token_hash": self._hash(token),
+            "created_at": now.isoformat(),
+            "expires_at": (now + timedelta(days=settings.refresh_token_expire_days)).isoformat()
+        }
+    
+    async def issue(self, user_id: str) -> str:
+        """
+        Ouvre une nouvelle session (famille de tokens) pour un utilisateur
+        
+        Args:
+            user_id: ID de l'utilisateur authentifié
+        
+        Returns:
+            Refresh token en clair (à remettre au client)
+        """
+        token, props = self._new_token()
+        props["family_id"] = props["id"]
+        
+        # Les sessions expirées de l'utilisateur sont supprimées au passage,
+        # pierres tombales comprises
+        query = """
+        MATCH (u:User {id: $user_id})
+        CALL {
+            WITH u
+            MATCH (u)-[:HAS_REFRESH_TOKEN]->(expired:RefreshToken)
+            WHERE expired.expires_at <= $now
+            WITH DISTINCT expired.family_id AS family_id
+            MATCH (f:RefreshToken {family_id: family_id})
+            DETACH DELETE f
+        }
+        CREATE (u)-[:HAS_REFRESH_TOKEN]->(t:RefreshToken)
+        SET t = $props
+        RETURN t.id AS id
+        """
+        
+        await neo4j_db.execute_query_async(query, {
+            "user_id": user_id,
+            "props": props,
+            "now": props["created_at"]
+        }, name="refresh_token.issue")
+        return token
+    
+    async def rotate(self, token: str) -> Tuple[User, str]:
+        """
+        Échange un refresh token contre un nouveau
+        
+        Args:
+            token: Refresh token présenté par le client
+        
+        Returns:
+            (utilisateur, nouveau refresh token)
+        
+        Raises:
+            InvalidRefreshToken: Si le token est inconnu, expiré ou déjà utilisé
+        """
+        new_token, props = self._new_token()
+        now = props["created_at"]
+        
+        # Le SET sur t prend le verrou d'écriture avant la lecture de revoked_at :
+        # deux rotations concurrentes du même token sont sérialisées, la seconde
+        # voit le token révoqué (réutilisation). L'ancien token est détaché de
+        # l'utilisateur et conservé comme pierre tombale.
+        query = f"""
+        MATCH (t:RefreshToken {{token_hash: $token_hash}})
+        SET t._lock = true
+        REMOVE t._lock
+        WITH t
+        OPTIONAL MATCH (u:User)-[r:HAS_REFRESH_TOKEN]->(t)
+        WITH t, u, r, t.revoked_at AS revoked_at, t.expires_at AS expires_at,
+             t.revoked_at IS NULL AND u IS NOT NULL AND t.expires_at > $now AS rotated
+        FOREACH (_ IN CASE WHEN rotated THEN [1] ELSE [] END |
+            SET t.revoked_at = $now, t.replaced_by = $props.id
+            DELETE r
+            CREATE (u)-[:HAS_REFRESH_TOKEN]->(n:RefreshToken $props)
+            SET n.family_id = t.family_id
+        )
+        RETURN rotated, revoked_at, expires_at, t.family_id AS family_id,
+               CASE WHEN rotated THEN {USER_PROJECTION} END AS u
+        """
+        
+        result = await neo4j_db.execute_query_async(query, {
+            "token_hash": self._hash(token),
+            "now": now,
+            "props": props
+        }, name="refresh_token.rotate")
+        if not result:
+            raise InvalidRefreshToken("Refresh token inconnu")
+        
+        current = result[0]
+        if not current["rotated"]:
+            if current["revoked_at"] is not None:
+                # Token déjà remplacé ou révoqué : réutilisation, on ferme la session
+                await self.revoke_family(current["family_id"])
+                raise InvalidRefreshToken("Refresh token déjà utilisé")
+            raise InvalidRefreshToken("Refresh token expiré")
+        
+        user = User(**{k: v for k, v in current["u"].items() if v is not None})
+        return user, new_token
+    
+    async def revoke(self, token: str) -> bool:
+        """
+        Ferme la session d'un refresh token (déconnexion)
+        
+        Returns:
+            True si une session a été révoquée
+        """
+        query = """
+        MATCH (t:RefreshToken {token_hash: $token_hash})
+        RETURN t.family_id AS family_id
+        """
+        
+        result = await neo4j_db.execute_query_async(query, {"token_hash": self._hash(token)}, name="refresh_token.revoke")
+        if not result:
+            return False
+        
+        await self.revoke_family(result[0]["family_id"])
+        return True
+    
+    async def revoke_family(self, family_id: str):
+        """Révoque une session en supprimant tous ses tokens"""
+        query = """
+        MATCH (t:RefreshToken {family_id: $family_id})
+        DETACH DELETE t
+        """
+        
+        await neo4j_db.execute_query_async(query, {"family_id": family_id}, name="refresh_token.revoke_family")
+    
+    async def revoke_all(self, user_id: str):
+        """Révoque toutes les sessions d'un utilisateur (ex: changement de mot de passe)"""
+        query = """
+        MATCH (u:User {id: $user_id})-[:HAS_REFRESH_TOKEN]->(t:RefreshToken)
+        WITH DISTINCT t.family_id AS family_id
+        MATCH (f:RefreshToken {family_id: family_id})
+        DETACH DELETE f
+        """
+        
+        await neo4j_db.execute_query_async(query, {"user_id": user_id}, name="refresh_token.revoke_all")
+
+
+# Instance globale du service
+refresh_token_service = RefreshTokenService()
@@ -5,14 +5,27 @@ from typing import Optional
 from datetime import datetime
 import uuid
 
+from app.cache import TTLCache
+from app.config import settings
 from app.database import neo4j_db
 from app.models.user import User, UserCreate, UserUpdate, UserInDB
-from app.auth import get_password_hash, verify_password
+from app.services.refresh_token import refresh_token_service
+from app.auth import get_password_hash_async, verify_password_async
+from app.tracing import traced
+
+
+# Propriétés d'un utilisateur renvoyées sans le hash du mot de passe
+USER_FIELDS = list(User.model_fields)
 
 
 class UserService:
     """Service pour gérer les utilisateurs dans Neo4j"""
     
+    def __init__(self):
+        # Utilisateurs authentifiés récemment, par email (invalidés à chaque écriture)
+        self.user_cache = TTLCache(settings.auth_cache_ttl, max_entries=settings.auth_cache_max_entries)
+    
+    @traced()
     async def create_user(self, user_data: UserCreate) -> User:
         """
         Crée un nouveau utilisateur avec mot de passe hashé
@@ -35,7 +48,7 @@ class UserService:
         now = datetime.now()
         
         # Hash du mot de passe
-        hashed_password = get_password_hash(user_data.password)
+        hashed_password = await get_password_hash_async(user_data.password)
         
         # Préparer les données
         user_dict = user_data.model_dump(exclude={"password"})
@@ -65,11 +78,12 @@ class UserService:
         RETURN u
         """
         
-        result = neo4j_db.execute_query(query, user_dict)
+        result = await neo4j_db.execute_query_async(query, user_dict, name="user.create")
         
         # Retourner l'utilisateur sans le mot de passe
         return User(**{k: v for k, v in user_dict.items() if k != "hashed_password"})
     
+    @traced()
     async def get_user_by_email(self, email: str) -> Optional[UserInDB]:
         """
         Récupère un utilisateur par son email
@@ -85,7 +99,7 @@ class UserService:
         RETURN u
         """
         
-        result = neo4j_db.execute_query(query, {"email": email})
+        result = await neo4j_db.execute_query_async(query, {"email": email}, name="user.by_email")
         
         if not result or len(result) == 0:
             return None
@@ -97,6 +111,7 @@ class UserService:
         
         return UserInDB(**user_data)
     
+    @traced()
     async def get_user_by_id(self, user_id: str) -> Optional[User]:
         """
         Récupère un utilisateur par son ID
@@ -112,7 +127,7 @@ class UserService:
         RETURN u
         """
         
-        result = neo4j_db.execute_query(query, {"id": user_id})
+        result = await neo4j_db.execute_query_async(query, {"id": user_id}, name="user.by_id")
         
         if not result or len(result) == 0:
             return None
@@ -126,6 +141,38 @@ class UserService:
         
         return User(**user_data)
     
+    @traced()
+    async def get_cached_user_by_email(self, email: str) -> Optional[User]:
+        """
+        Récupère l'utilisateur d'une session authentifiée, via le cache
+        
+        Le hash du mot de passe n'est pas lu : seules les propriétés de User
+        sont projetées.
+        
+        Args:
+            email: Email de l'utilisateur (claim "sub" du token)
+            
+        Returns:
+            Utilisateur trouvé ou None
+        """
+        user = self.user_cache.get(email)
+        if user is not None:
+            return user
+        
+        query = f"""
+        MATCH (u:User {{email: $email}})
+        RETURN u {{{', '.join('.' + name for name in USER_FIELDS)}}} AS u
+        """
+        
+        result = await neo4j_db.execute_query_async(query, {"email": email}, name="user.cached_by_email")
+        if not result:
+            return None
+        
+        user = User(**{k: v for k, v in result[0]["u"].items() if v is not None})
+        self.user_cache.set(email, user)
+        return user
+    
+    @traced()
     async def authenticate_user(self, email: str, password: str) -> Optional[User]:
         """
         Authentifie un utilisateur
@@ -142,13 +189,14 @@ class UserService:
         if not user_in_db:
             return None
         
-        if not verify_password(password, user_in_db.hashed_password):
+        if not await verify_password_async(password, user_in_db.hashed_password):
             return None
         
         # Retourner l'utilisateur sans le mot de passe
         user_data = user_in_db.model_dump(exclude={"hashed_password"})
         return User(**user_data)
     
+    @traced()
     async def update_user(self, user_id: str, user_data: UserUpdate) -> Optional[User]:
         """
         Met à jour un utilisateur
@@ -168,7 +216,7 @@ class UserService:
         
         # Hash du nouveau mot de passe si fourni
         if "password" in update_dict:
-            update_dict["hashed_password"] = get_password_hash(update_dict.pop("password"))
+            update_dict["hashed_password"] = await get_password_hash_async(update_dict.pop("password"))
         
         update_dict["updated_at"] = datetime.now().isoformat()
         
@@ -178,12 +226,13 @@ class UserService:
         
         query = f"""
         MATCH (u:User {{id: $id}})
+        WITH u, u.email AS previous_email
         SET {set_clause}
-        RETURN u
+        RETURN u, previous_email
         """
         
         params = {"id": user_id, **update_dict}
-        result = neo4j_db.execute_query(query, params)
+        result = await neo4j_db.execute_query_async(query, params, name="user.update")
         
         if not result or len(result) == 0:
             return None
@@ -192,10 +241,18 @@ class UserService:
         if not user_node:
             return None
         
+        self.user_cache.discard(result[0]["previous_email"])
+        self.user_cache.discard(user_node.get("email"))
+        
+        # Un changement de mot de passe ferme toutes les sessions ouvertes
+        if "hashed_password" in update_dict:
+            await refresh_token_service.revoke_all(user_id)
+        
         user_data_dict = {k: v for k, v in user_node.items() if k != "hashed_password"}
         
         return User(**user_data_dict)
     
+    @traced()
     async def delete_user(self, user_id: str) -> bool:
         """
         Supprime un utilisateur
@@ -208,12 +265,20 @@ class UserService:
         """
         query = """
         MATCH (u:User {id: $id})
-        DELETE u
-        RETURN COUNT(u) as deleted
+        OPTIONAL MATCH (u)-[:HAS_REFRESH_TOKEN]->(t:RefreshToken)
+        OPTIONAL MATCH (f:RefreshToken {family_id: t.family_id})
+        WITH u, u.email AS email, collect(DISTINCT f) AS tokens
+        FOREACH (token IN tokens | DETACH DELETE token)
+        DETACH DELETE u
+        RETURN email
         """
         
-        result = neo4j_db.execute_query(query, {"id": user_id})
-        return result and len(result) > 0 and result[0].get('deleted', 0) > 0
+        result = await neo4j_db.execute_query_async(query, {"id": user_id}, name="user.delete")
+        if not result:
+            return False
+        
+        self.user_cache.discard(result[0]["email"])
+        return True
 
 
 # Instance globale du service
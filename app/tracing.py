@@ -0,0 +1,293 @@
+"""
+Traçage léger des requêtes (spans imbriqués)
+
+Chaque requête HTTP échantillonnée ouvre une trace : un span racine pour
+la route, puis un span par méthode de service, par requête Cypher et par
+encodage d'embedding. Le span courant est porté par une ContextVar : il
+suit la requête à travers les `await`, les tâches de asyncio.gather et
+asyncio.to_thread.
+
+Hors d'une trace échantillonnée (ou si TRACING_SAMPLE_RATE=0), ouvrir un
+span se limite à lire la ContextVar : le coût est négligeable.
+
+Les traces terminées sont envoyées à un exportateur : en mémoire (les
+dernières traces, consultables via /api/admin/traces) ou fichier JSON
+Lines (une trace par ligne).
+"""
+import functools
+import inspect
+import json
+import random
+import threading
+import time
+import uuid
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, List, Optional
+
+from app.config import settings
+from app.metrics import RouteTemplates
+
+
+class Span:
+    """Étape chronométrée d'une trace"""
+    
+    __slots__ = ("trace", "name", "span_id", "parent_id", "attributes", "start", "duration", "error")
+    
+    def __init__(self, trace: "Trace", name: str, parent_id: Optional[str], attributes: Dict[str, Any]):
+        self.trace = trace
+        self.name = name
+        self.span_id = uuid.uuid4().hex[:16]
+        self.parent_id = parent_id
+        self.attributes = attributes
+        self.start = time.perf_counter()
+        self.duration: Optional[float] = None
+        self.error: Optional[str] = None
+    
+    def set_attribute(self, key: str, value: Any):
+        self.attributes[key] = value
+    
+    def finish(self):
+        self.duration = time.perf_counter() - self.start
+        self.trace.spans.append(self)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start_ms": 1000 * (self.start - self.trace.start),
+            "duration_ms": 1000 * (self.duration or 0.0),
+            "attributes": self.attributes,
+            "error": self.error,
+        }
+
+
+class Trace:
+    """Ensemble des spans d'une requête"""
+    
+    def __init__(self, name: str):
+        self.trace_id = uuid.uuid4().hex
+        self.name = name
+        self.timestamp = time.time()
+        self.start = time.perf_counter()
+        # list.append est atomique : les spans terminés dans un thread (to_thread) sont sûrs
+        self.spans: List[Span] = []
+    
+    def to_dict(self) -> Dict[str, Any]:
+        spans = sorted(self.spans, key=lambda span: span.start)
+        root = spans[0] if spans else None
+        return {
+            "trace_id": self.trace_id,
+            "name": self.name,
+            "timestamp": self.timestamp,
+            "duration_ms": 1000 * (root.duration or 0.0) if root else 0.0,
+            "spans": [span.to_dict() for span in spans],
+        }
+
+
+class TraceExporter:
+    """Destination des traces terminées"""
+    
+    def export(self, trace: Trace):
+        raise NotImplementedError
+    
+    def traces(self, limit: int = 20) -> List[Dict[str, Any]]:
+        """Dernières traces exportées (si l'exportateur les conserve)"""
+        return []
+
+
+class InMemoryExporter(TraceExporter):
+    """Conserve les dernières traces en mémoire"""
+    
+    def __init__(self, max_traces: int = 100):
+        self._traces: "deque[Dict[str, Any]]" = deque(maxlen=max(1, max_traces))
+    
+    def export(self, trace: Trace):
+        self._traces.append(trace.to_dict())
+    
+    def traces(self, limit: int = 20) -> List[Dict[str, Any]]:
+        return list(self._traces)[-limit:][::-1]
+
+
+class FileExporter(TraceExporter):
+    """Ajoute chaque trace à un fichier JSON Lines"""
+    
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+    
+    def export(self, trace: Trace):
+        line = json.dumps(trace.to_dict(), default=str)
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+
+
+def create_exporter(name: str, path: str = "", max_traces: int = 100) -> TraceExporter:
+    """
+    Instancie un exportateur de traces
+    
+    Args:
+        name: "memory" ou "file"
+        path: Fichier de destination (exportateur file)
+        max_traces: Traces conservées (exportateur memory)
+    """
+    if name == "memory":
+        return InMemoryExporter(max_traces=max_traces)
+    if name == "file":
+        return FileExporter(path)
+    raise ValueError(f"Exportateur de traces inconnu: {name}")
+
+
+# Span courant de la requête (None hors d'une trace échantillonnée)
+_current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+
+class Tracer:
+    """Ouvre les traces échantillonnées et les spans qui les composent"""
+    
+    def __init__(self, exporter: TraceExporter, sample_rate: float = 0.0):
+        """
+        Args:
+            exporter: Destination des traces terminées
+            sample_rate: Proportion des requêtes tracées (0 = traçage désactivé, 1 = toutes)
+        """
+        self.exporter = exporter
+        self.sample_rate = sample_rate
+    
+    @property
+    def enabled(self) -> bool:
+        return self.sample_rate > 0
+    
+    def should_sample(self) -> bool:
+        return self.sample_rate > 0 and (self.sample_rate >= 1 or random.random() < self.sample_rate)
+    
+    @contextmanager
+    def trace(self, name: str, **attributes: Any):
+        """
+        Ouvre une trace et son span racine, exportés à la sortie du bloc
+        
+        Yields:
+            Span racine (renommable une fois la route connue)
+        """
+        trace = Trace(name)
+        span = Span(trace, name, None, attributes)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.error = type(e).__name__
+            raise
+        finally:
+            _current_span.reset(token)
+            span.finish()
+            trace.name = span.name
+            try:
+                self.exporter.export(trace)
+            except Exception as e:
+                print(f"✗ Export de la trace impossible: {e}")
+    
+    @contextmanager
+    def span(self, name: str, **attributes: Any):
+        """
+        Ouvre un span enfant du span courant
+        
+        Sans trace en cours, le bloc s'exécute sans rien enregistrer.
+        
+        Yields:
+            Span, ou None hors d'une trace
+        """
+        parent = _current_span.get()
+        if parent is None:
+            yield None
+            return
+        
+        span = Span(parent.trace, name, parent.span_id, attributes)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.error = type(e).__name__
+            raise
+        finally:
+            _current_span.reset(token)
+            span.finish()
+
+
+def current_span() -> Optional[Span]:
+    """Span courant, ou None hors d'une trace échantillonnée"""
+    return _current_span.get()
+
+
+def traced(name: Optional[str] = None) -> Callable:
+    """
+    Décorateur ouvrant un span autour d'une fonction (synchrone ou coroutine)
+    
+    Args:
+        name: Nom du span (par défaut le nom qualifié, ex: ProductService.get_product)
+    """
+    def decorator(func: Callable) -> Callable:
+        span_name = name or func.__qualname__
+        
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                if _current_span.get() is None:
+                    return await func(*args, **kwargs)
+                with tracer.span(span_name):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+        
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _current_span.get() is None:
+                return func(*args, **kwargs)
+            with tracer.span(span_name):
+                return func(*args, **kwargs)
+        return wrapper
+    
+    return decorator
+
+
+class TracingMiddleware:
+    """Middleware ASGI ouvrant une trace pour les requêtes HTTP échantillonnées"""
+    
+    def __init__(self, app):
+        self.app = app
+        self.routes = RouteTemplates()
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not tracer.should_sample():
+            await self.app(scope, receive, send)
+            return
+        
+        status_code = 500
+        
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+        
+        path = scope["path"]
+        with tracer.trace(f"{scope['method']} {path}", method=scope["method"], path=path) as span:
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                route = self.routes.resolve(scope, path)
+                span.name = f"{scope['method']} {route}"
+                span.set_attribute("route", route)
+                span.set_attribute("status", status_code)
+
+
+# Instance globale du traceur
+tracer = Tracer(
+    create_exporter(
+        settings.tracing_exporter,
+        path=settings.tracing_file_path,
+        max_traces=settings.tracing_max_traces
+    ),
+    sample_rate=settings.tracing_sample_rate
+)
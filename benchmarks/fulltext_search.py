@@ -0,0 +1,145 @@
+"""
+Benchmark de la recherche lexicale : CONTAINS vs index plein texte
+
+Crée des catalogues synthétiques de tailles croissantes sous un label dédié
+(:BenchProduct, supprimé à la fin), puis mesure la latence de la recherche
+par balayage `toLower(...) CONTAINS` et celle de
+`db.index.fulltext.queryNodes` (analyseur français, BM25).
+
+Nécessite une instance Neo4j joignable (voir NEO4J_URI).
+
+Usage :
+    python -m benchmarks.fulltext_search [--sizes 1000 10000 100000] [--repeats 20]
+"""
+import argparse
+import json
+import random
+import statistics
+import time
+from typing import Dict, List
+
+from app.database import neo4j_db
+
+LABEL = "BenchProduct"
+
+NOUNS = ["vase", "bougie", "coussin", "plaid", "lampe", "miroir", "panier", "tasse",
+         "corbeille", "diffuseur", "assiette", "nappe", "rideau", "tapis", "cadre"]
+MATERIALS = ["céramique", "lin", "laine mérinos", "bois massif", "rotin", "grès",
+             "jonc de mer", "verre recyclé", "coton", "chêne", "cire de soja"]
+ADJECTIVES = ["artisanal", "naturel", "fait main", "tressé", "émaillé", "provençal",
+              "bohème", "intemporel", "doux", "parfumé", "unique"]
+CATEGORIES = ["Décoration", "Textile", "Luminaires", "Vaisselle"]
+
+QUERIES = ["vase", "coussins lin", "bougie parfumee", "céramique artisanale", "rotin tressé"]
+
+
+def _product(i: int, rng: random.Random) -> Dict[str, str]:
+    noun, material, adjective = rng.choice(NOUNS), rng.choice(MATERIALS), rng.choice(ADJECTIVES)
+    return {
+        "id": f"bench-{i}",
+        "name": f"{noun.capitalize()} en {material} {adjective}",
+        "short_description": f"{noun.capitalize()} {adjective}",
+        "description": " ".join(
+            f"{rng.choice(NOUNS)} {rng.choice(MATERIALS)} {rng.choice(ADJECTIVES)}."
+            for _ in range(6)
+        ),
+        "category": rng.choice(CATEGORIES)
+    }
+
+
+def populate(size: int, batch_size: int = 5000, seed: int = 42):
+    """Complète le catalogue synthétique jusqu'à `size` nœuds"""
+    rng = random.Random(seed)
+    existing = neo4j_db.execute_query(f"MATCH (p:{LABEL}) RETURN count(p) AS count")[0]["count"]
+    for _ in range(existing):
+        _product(0, rng)  # Conserver la même séquence aléatoire
+    for start in range(existing, size, batch_size):
+        rows = [_product(i, rng) for i in range(start, min(start + batch_size, size))]
+        neo4j_db.execute_query(f"UNWIND $rows AS row CREATE (p:{LABEL}) SET p = row", {"rows": rows})
+
+
+def _latencies(query: str, params_list: List[Dict], repeats: int) -> Dict[str, float]:
+    samples = []
+    for _ in range(repeats):
+        for params in params_list:
+            started = time.perf_counter()
+            neo4j_db.execute_query(query, params)
+            samples.append(1000 * (time.perf_counter() - started))
+    samples.sort()
+    return {
+        "p50_ms": statistics.median(samples),
+        "p95_ms": samples[int(0.95 * (len(samples) - 1))],
+        "mean_ms": statistics.fmean(samples)
+    }
+
+
+def run(sizes: List[int], repeats: int, top_k: int = 10) -> List[Dict]:
+    contains_query = f"""
+    MATCH (p:{LABEL})
+    WHERE toLower(p.name) CONTAINS toLower($query) OR toLower(p.description) CONTAINS toLower($query)
+    RETURN p.id AS id
+    LIMIT $top_k
+    """
+    fulltext_query = f"""
+    CALL db.index.fulltext.queryNodes('{LABEL.lower()}_fulltext_index', $query)
+    YIELD node, score
+    RETURN node.id AS id, score
+    ORDER BY score DESC
+    LIMIT $top_k
+    """
+    
+    neo4j_db.create_fulltext_index(LABEL, ["name", "description", "short_description", "category"])
+    neo4j_db.execute_query("CALL db.awaitIndexes(300)")
+    
+    results = []
+    for size in sorted(sizes):
+        populate(size)
+        neo4j_db.execute_query("CALL db.awaitIndexes(300)")
+        
+        params = [{"query": q, "top_k": top_k} for q in QUERIES]
+        fulltext_params = [
+            {"query": neo4j_db.escape_lucene(q.lower()), "top_k": top_k} for q in QUERIES
+        ]
+        
+        # Échauffement (plans et caches)
+        _latencies(contains_query, params, 1)
+        _latencies(fulltext_query, fulltext_params, 1)
+        
+        row = {
+            "size": size,
+            "contains": _latencies(contains_query, params, repeats),
+            "fulltext": _latencies(fulltext_query, fulltext_params, repeats)
+        }
+        results.append(row)
+        print(
+            f"{size:>8} produits | CONTAINS p50 {row['contains']['p50_ms']:8.2f} ms"
+            f" | plein texte p50 {row['fulltext']['p50_ms']:8.2f} ms"
+        )
+    return results
+
+
+def cleanup():
+    """Supprime le catalogue synthétique et son index"""
+    neo4j_db.execute_query(
+        f"MATCH (p:{LABEL}) CALL {{ WITH p DETACH DELETE p }} IN TRANSACTIONS OF 10000 ROWS"
+    )
+    neo4j_db.execute_query(f"DROP INDEX {LABEL.lower()}_fulltext_index IF EXISTS")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Latence CONTAINS vs index plein texte")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--repeats", type=int, default=20)
+    parser.add_argument("--output", help="Fichier JSON de résultats")
+    parser.add_argument("--keep", action="store_true", help="Conserver les données synthétiques")
+    args = parser.parse_args()
+    
+    try:
+        report = run(args.sizes, args.repeats)
+        if args.output:
+            with open(args.output, "w", encoding="utf-8") as f:
+                json.dump(report, f, indent=2)
+    finally:
+        if not args.keep:
+            cleanup()
+        neo4j_db.close()
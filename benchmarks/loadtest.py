@@ -0,0 +1,555 @@
+"""
+Test de charge HTTP rejouant le trafic réel de la boutique
+
+Des utilisateurs virtuels (boucle fermée, sans temps de réflexion par
+défaut) enchaînent des parcours tirés selon --mix ; chaque parcours
+reproduit les requêtes d'un navigateur (page HTML puis appels fetch des
+gabarits) :
+
+- home    : GET / puis GET /api/products?status=online&limit=3&fields=...
+- search  : GET /recherche?q=... puis GET /api/products?status=online&limit=20
+- product : GET /produit/{id}, GET /api/products/{id} et les produits similaires
+- login   : POST /api/auth/login puis GET /api/auth/me
+- search_api : POST /api/products/search (absent du mix par défaut)
+
+Chaque palier de --concurrency est mesuré pendant --duration secondes
+après --warmup secondes de chauffe : débit, p50/p95/p99 par endpoint,
+erreurs par statut, retard de la boucle d'événements du serveur (delta de
+l'histogramme event_loop_lag_seconds de /metrics, par worker) et du
+générateur. Le point de saturation est le dernier palier dont le débit
+progresse encore de --saturation-gain (ou dont le p99 respecte --slo-ms).
+
+Cibles :
+    --url http://127.0.0.1:8000     application déjà démarrée (--email/--password
+                                    pour le parcours login)
+    --offline --workers 1 2 4       uvicorn benchmarks.offline_app:app lancé pour
+                                    chaque nombre de workers (doublure en mémoire)
+
+Usage :
+    python -m benchmarks.loadtest --offline --workers 1 2 4 --concurrency 1 8 32 64
+    python -m benchmarks.loadtest --url http://127.0.0.1:8000 --email a@b.fr --password ...
+    python -m benchmarks.loadtest --offline --processes 4 --mix home=50 product=50 --output load.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import re
+import socket
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+
+from benchmarks.reporting import git_revision, summarize
+
+# Identifiants de l'utilisateur chargé par benchmarks.offline_app
+OFFLINE_EMAIL = "bench@example.com"
+OFFLINE_PASSWORD = "motdepasse-de-test"
+
+QUERIES = ["vase", "coussins lin", "bougie parfumée", "céramique artisanale", "rotin tressé",
+           "lampe en chêne", "plaid en laine mérinos", "panier jonc de mer"]
+
+# Projections demandées par les gabarits (index.html, produit.html)
+HOME_FIELDS = "id,name,price,main_image,short_description,description"
+RELATED_FIELDS = "id,name,price,main_image"
+
+DEFAULT_MIX = {"home": 40, "search": 25, "product": 25, "login": 10, "search_api": 0}
+
+LAG_LINE = re.compile(
+    r'^event_loop_lag_seconds_(bucket|sum|count)\{pid="([^"]+)"(?:,le="([^"]+)")?\} (\S+)$'
+)
+
+
+class Session:
+    """Client d'un utilisateur virtuel : chronomètre chaque requête par endpoint"""
+    
+    def __init__(self, client: httpx.AsyncClient, recorder: "Recorder", context: Dict[str, Any], rng: random.Random):
+        self.client = client
+        self.recorder = recorder
+        self.context = context
+        self.rng = rng
+    
+    async def request(self, endpoint: str, method: str, url: str, **kwargs) -> Optional[httpx.Response]:
+        started = time.perf_counter()
+        try:
+            response = await self.client.request(method, url, **kwargs)
+        except httpx.HTTPError as e:
+            self.recorder.error(endpoint, type(e).__name__)
+            return None
+        self.recorder.record(endpoint, time.perf_counter() - started, response.status_code)
+        return response
+
+
+async def journey_home(session: Session):
+    await session.request("GET /", "GET", "/")
+    await session.request(
+        "GET /api/products [home]", "GET", "/api/products",
+        params={"status": "online", "limit": 3, "fields": HOME_FIELDS}
+    )
+
+
+async def journey_search(session: Session):
+    await session.request("GET /recherche", "GET", "/recherche", params={"q": session.rng.choice(QUERIES)})
+    await session.request(
+        "GET /api/products [search]", "GET", "/api/products", params={"status": "online", "limit": 20}
+    )
+
+
+async def journey_product(session: Session):
+    product_id = session.rng.choice(session.context["product_ids"])
+    await session.request("GET /produit/{id}", "GET", f"/produit/{product_id}")
+    await session.request("GET /api/products/{id}", "GET", f"/api/products/{product_id}")
+    await session.request(
+        "GET /api/products [related]", "GET", "/api/products",
+        params={"status": "online", "limit": 8, "fields": RELATED_FIELDS}
+    )
+
+
+async def journey_login(session: Session):
+    response = await session.request(
+        "POST /api/auth/login", "POST", "/api/auth/login",
+        json={"email": session.context["email"], "password": session.context["password"]}
+    )
+    if response is None or response.status_code != 200:
+        return
+    token = response.json()["access_token"]
+    await session.request("GET /api/auth/me", "GET", "/api/auth/me", headers={"Authorization": f"Bearer {token}"})
+
+
+async def journey_search_api(session: Session):
+    await session.request(
+        "POST /api/products/search", "POST", "/api/products/search",
+        json={"query": session.rng.choice(QUERIES), "mode": "hybrid", "top_k": 10}
+    )
+
+
+JOURNEYS = {
+    "home": journey_home,
+    "search": journey_search,
+    "product": journey_product,
+    "login": journey_login,
+    "search_api": journey_search_api,
+}
+
+
+class Recorder:
+    """Durées et erreurs par endpoint, enregistrées seulement pendant la fenêtre de mesure"""
+    
+    def __init__(self):
+        self.recording = False
+        self.latencies: Dict[str, List[float]] = {}
+        self.errors: Dict[str, Dict[str, int]] = {}
+        self.journeys = 0
+    
+    def record(self, endpoint: str, duration: float, status_code: int):
+        if not self.recording:
+            return
+        self.latencies.setdefault(endpoint, []).append(duration)
+        if status_code >= 400:
+            self.error(endpoint, str(status_code))
+    
+    def error(self, endpoint: str, reason: str):
+        if not self.recording:
+            return
+        errors = self.errors.setdefault(endpoint, {})
+        errors[reason] = errors.get(reason, 0) + 1
+
+
+async def _loop_probe(stop: asyncio.Event, recorder: Recorder, interval: float, lags: List[float]):
+    """Retard de la boucle du générateur : au-delà de quelques ms, le client sature"""
+    while not stop.is_set():
+        scheduled = time.perf_counter()
+        await asyncio.sleep(interval)
+        if recorder.recording:
+            lags.append(time.perf_counter() - scheduled - interval)
+
+
+async def _generate(config: Dict[str, Any]) -> Dict[str, Any]:
+    recorder = Recorder()
+    stop = asyncio.Event()
+    names = [name for name, weight in config["mix"].items() if weight > 0]
+    weights = [config["mix"][name] for name in names]
+    limits = httpx.Limits(max_connections=config["concurrency"], max_keepalive_connections=config["concurrency"])
+    
+    async with httpx.AsyncClient(base_url=config["url"], limits=limits, timeout=config["timeout"]) as client:
+        async def virtual_user(index: int):
+            rng = random.Random(config["seed"] * 100003 + index)
+            session = Session(client, recorder, config["context"], rng)
+            while not stop.is_set():
+                journey = rng.choices(names, weights)[0]
+                await JOURNEYS[journey](session)
+                if recorder.recording:
+                    recorder.journeys += 1
+                if config["think_time"]:
+                    await asyncio.sleep(rng.expovariate(1 / config["think_time"]))
+        
+        client_lags: List[float] = []
+        probe = asyncio.create_task(_loop_probe(stop, recorder, 0.01, client_lags))
+        users = [asyncio.create_task(virtual_user(i)) for i in range(config["concurrency"])]
+        
+        await asyncio.sleep(config["warmup"])
+        recorder.recording = True
+        started = time.perf_counter()
+        await asyncio.sleep(config["duration"])
+        recorder.recording = False
+        elapsed = time.perf_counter() - started
+        
+        stop.set()
+        await asyncio.gather(*users, probe)
+    
+    return {
+        "elapsed": elapsed,
+        "journeys": recorder.journeys,
+        "latencies": recorder.latencies,
+        "errors": recorder.errors,
+        "client_lags": client_lags,
+    }
+
+
+def generate(config: Dict[str, Any]) -> Dict[str, Any]:
+    """Exécute une part du palier (un processus générateur)"""
+    return asyncio.run(_generate(config))
+
+
+def scrape_loop_lag(url: str, scrapes: int) -> Dict[str, Dict[str, float]]:
+    """
+    Lit l'histogramme event_loop_lag_seconds de /metrics
+    
+    Chaque lecture est servie par un seul worker : plusieurs lectures, sur
+    une nouvelle connexion chacune, couvrent (probablement) tous les workers.
+    
+    Returns:
+        pid -> {"sum", "count", "le=<borne>"...} (dernière lecture de chaque worker)
+    """
+    workers: Dict[str, Dict[str, float]] = {}
+    with httpx.Client(base_url=url, timeout=10.0) as client:
+        for _ in range(scrapes):
+            try:
+                response = client.get("/metrics", headers={"Connection": "close"})
+            except httpx.HTTPError:
+                continue
+            if response.status_code != 200:
+                continue
+            series: Dict[str, Dict[str, float]] = {}
+            for line in response.text.splitlines():
+                match = LAG_LINE.match(line)
+                if match:
+                    kind, pid, le, value = match.groups()
+                    series.setdefault(pid, {})[f"le={le}" if kind == "bucket" else kind] = float(value)
+            for pid, values in series.items():
+                # Série la plus avancée si plusieurs lectures du même worker
+                if values.get("count", 0) >= workers.get(pid, {}).get("count", -1):
+                    workers[pid] = values
+    return workers
+
+
+def loop_lag_delta(before: Dict[str, Dict[str, float]], after: Dict[str, Dict[str, float]]) -> Optional[Dict[str, Any]]:
+    """Retard de la boucle du serveur pendant le palier, tous workers confondus"""
+    count, total = 0.0, 0.0
+    buckets: Dict[float, float] = {}
+    for pid, values in after.items():
+        previous = before.get(pid, {})
+        count += values.get("count", 0) - previous.get("count", 0)
+        total += values.get("sum", 0) - previous.get("sum", 0)
+        for key, value in values.items():
+            if key.startswith("le="):
+                bound = float(key[3:].replace("+Inf", "inf"))
+                buckets[bound] = buckets.get(bound, 0) + value - previous.get(key, 0)
+    if count <= 0:
+        return None
+    
+    def upper_bound(p: float) -> float:
+        for bound in sorted(buckets):
+            if buckets[bound] >= p * count:
+                return bound
+        return float("inf")
+    
+    return {
+        "workers_seen": len(after),
+        "samples": int(count),
+        "mean_ms": 1000 * total / count,
+        "p99_ms_le": 1000 * upper_bound(0.99),
+        "max_ms_le": 1000 * upper_bound(1.0),
+    }
+
+
+def merge(parts: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Fusionne les résultats bruts des processus générateurs"""
+    merged = {"elapsed": max(part["elapsed"] for part in parts), "journeys": 0,
+              "latencies": {}, "errors": {}, "client_lags": []}
+    for part in parts:
+        merged["journeys"] += part["journeys"]
+        merged["client_lags"].extend(part["client_lags"])
+        for endpoint, samples in part["latencies"].items():
+            merged["latencies"].setdefault(endpoint, []).extend(samples)
+        for endpoint, errors in part["errors"].items():
+            target = merged["errors"].setdefault(endpoint, {})
+            for reason, n in errors.items():
+                target[reason] = target.get(reason, 0) + n
+    return merged
+
+
+def step_report(concurrency: int, raw: Dict[str, Any], server_lag: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    elapsed = raw["elapsed"]
+    
+    def latency(samples: List[float]) -> Dict[str, float]:
+        stats = summarize(samples)
+        return {key: stats[key] for key in ("mean_ms", "p50_ms", "p95_ms", "p99_ms")}
+    
+    endpoints = {}
+    for endpoint in sorted(raw["latencies"]):
+        samples = raw["latencies"][endpoint]
+        endpoints[endpoint] = {
+            "requests": len(samples),
+            "requests_per_second": len(samples) / elapsed,
+            "errors": raw["errors"].get(endpoint, {}),
+            **latency(samples),
+        }
+    all_samples = [sample for samples in raw["latencies"].values() for sample in samples]
+    client_lag = summarize(raw["client_lags"])
+    return {
+        "concurrency": concurrency,
+        "duration_s": elapsed,
+        "requests": len(all_samples),
+        "requests_per_second": len(all_samples) / elapsed,
+        "journeys_per_second": raw["journeys"] / elapsed,
+        "errors": sum(sum(errors.values()) for errors in raw["errors"].values()),
+        "latency": latency(all_samples),
+        "endpoints": endpoints,
+        "server_loop_lag": server_lag,
+        "client_loop_lag": {"p50_ms": client_lag["p50_ms"], "p99_ms": client_lag["p99_ms"]},
+    }
+
+
+def find_saturation(steps: List[Dict[str, Any]], gain: float, slo_ms: Optional[float]) -> Dict[str, Any]:
+    """
+    Dernier palier avant que le débit ne plafonne (ou que le p99 dépasse le SLO)
+    
+    Returns:
+        {"concurrency", "requests_per_second", "reason"} ; reason = None si
+        aucun palier n'a saturé (augmenter --concurrency)
+    """
+    best = max(steps, key=lambda step: step["requests_per_second"])
+    for previous, step in zip(steps, steps[1:]):
+        if slo_ms is not None and step["latency"]["p99_ms"] > slo_ms:
+            return {"concurrency": previous["concurrency"], "requests_per_second": best["requests_per_second"],
+                    "reason": f"p99 > {slo_ms:g} ms à {step['concurrency']}"}
+        if step["requests_per_second"] < previous["requests_per_second"] * (1 + gain):
+            return {"concurrency": previous["concurrency"], "requests_per_second": best["requests_per_second"],
+                    "reason": f"débit +{100 * gain:.0f} % non atteint à {step['concurrency']}"}
+    return {"concurrency": steps[-1]["concurrency"], "requests_per_second": best["requests_per_second"],
+            "reason": None}
+
+
+def print_step(step: Dict[str, Any]):
+    lag = step["server_loop_lag"]
+    lag_text = f"boucle serveur moy. {lag['mean_ms']:.1f} ms, p99 ≤ {lag['p99_ms_le']:g} ms" if lag else "boucle serveur n/d"
+    print(f"  concurrence {step['concurrency']:>4} : {step['requests_per_second']:8.1f} req/s  "
+          f"p50 {step['latency']['p50_ms']:7.1f}  p95 {step['latency']['p95_ms']:7.1f}  "
+          f"p99 {step['latency']['p99_ms']:7.1f} ms  erreurs {step['errors']}  {lag_text}  "
+          f"client p99 {step['client_loop_lag']['p99_ms']:.1f} ms")
+    for endpoint, stats in step["endpoints"].items():
+        errors = f"  {stats['errors']}" if stats["errors"] else ""
+        print(f"      {endpoint:<30} {stats['requests_per_second']:8.1f} req/s  p50 {stats['p50_ms']:7.1f}  "
+              f"p95 {stats['p95_ms']:7.1f}  p99 {stats['p99_ms']:7.1f} ms{errors}")
+
+
+def discover_context(url: str, email: Optional[str], password: Optional[str]) -> Dict[str, Any]:
+    """Identifiants de produits en ligne (parcours product) et compte de connexion"""
+    with httpx.Client(base_url=url, timeout=30.0) as client:
+        response = client.get("/api/products", params={"status": "online", "limit": 100, "fields": "id"})
+        response.raise_for_status()
+    return {"product_ids": [product["id"] for product in response.json()], "email": email, "password": password}
+
+
+def effective_mix(mix: Dict[str, float], context: Dict[str, Any]) -> Dict[str, float]:
+    mix = dict(mix)
+    if not context["product_ids"] and mix.get("product"):
+        print("✗ Aucun produit en ligne : parcours product désactivé")
+        mix["product"] = 0
+    if not (context["email"] and context["password"]) and mix.get("login"):
+        print("✗ --email/--password absents : parcours login désactivé")
+        mix["login"] = 0
+    if not any(mix.values()):
+        raise SystemExit("✗ Aucun parcours à exécuter")
+    return mix
+
+
+def run_target(url: str, args, mix: Dict[str, float], context: Dict[str, Any], scrapes: int) -> Dict[str, Any]:
+    """Exécute tous les paliers de concurrence contre une cible"""
+    steps = []
+    executor = ProcessPoolExecutor(args.processes) if args.processes > 1 else None
+    try:
+        for concurrency in args.concurrency:
+            shares = [concurrency // args.processes + (i < concurrency % args.processes)
+                      for i in range(args.processes)]
+            configs = [{
+                "url": url, "mix": mix, "context": context, "concurrency": share, "seed": i,
+                "warmup": args.warmup, "duration": args.duration, "think_time": args.think_time / 1000,
+                "timeout": args.timeout,
+            } for i, share in enumerate(shares) if share > 0]
+            
+            before = scrape_loop_lag(url, scrapes)
+            parts = list(executor.map(generate, configs)) if executor else [generate(configs[0])]
+            after = scrape_loop_lag(url, scrapes)
+            
+            step = step_report(concurrency, merge(parts), loop_lag_delta(before, after))
+            print_step(step)
+            steps.append(step)
+    finally:
+        if executor:
+            executor.shutdown()
+    return {"steps": steps, "saturation": find_saturation(steps, args.saturation_gain, args.slo_ms)}
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_offline_server(workers: int, args) -> Tuple[subprocess.Popen, str]:
+    """Lance uvicorn benchmarks.offline_app:app et attend que chaque worker soit prêt"""
+    port = free_port()
+    env = {
+        **os.environ,
+        "BENCH_CATALOG_SIZE": str(args.catalog_size),
+        "BENCH_EMBED_MS_PER_TEXT": str(args.embed_ms_per_text),
+        "BENCH_DB_LATENCY_MS": str(args.db_latency_ms),
+    }
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "benchmarks.offline_app:app", "--host", "127.0.0.1",
+         "--port", str(port), "--workers", str(workers), "--log-level", "warning", "--no-access-log"],
+        env=env
+    )
+    url = f"http://127.0.0.1:{port}"
+    
+    # /readyz est servi par un worker au hasard : exiger plusieurs réponses prêtes d'affilée
+    deadline = time.monotonic() + args.startup_timeout
+    ready = 0
+    with httpx.Client(base_url=url, timeout=5.0) as client:
+        while ready < 4 * workers:
+            if process.poll() is not None or time.monotonic() > deadline:
+                process.terminate()
+                raise RuntimeError(f"Le serveur hors ligne ({workers} workers) n'a pas démarré")
+            try:
+                ready = ready + 1 if client.get("/readyz").status_code == 200 else 0
+            except httpx.HTTPError:
+                ready = 0
+            if ready == 0:
+                time.sleep(0.2)
+    return process, url
+
+
+def stop_server(process: subprocess.Popen):
+    process.terminate()
+    try:
+        process.wait(timeout=15)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+
+
+def print_scaling(targets: Dict[str, Dict[str, Any]]):
+    """Débit maximal par nombre de workers, relatif à un seul worker"""
+    print("\nMise à l'échelle (débit maximal, point de saturation)")
+    baseline = None
+    for workers, result in targets.items():
+        saturation = result["saturation"]
+        baseline = baseline or saturation["requests_per_second"]
+        reason = saturation["reason"] or "non saturé, augmenter --concurrency"
+        print(f"  {workers:>3} worker(s) : {saturation['requests_per_second']:8.1f} req/s  "
+              f"×{saturation['requests_per_second'] / baseline:.2f}  saturation à {saturation['concurrency']} ({reason})")
+
+
+def parse_mix(values: Optional[List[str]]) -> Dict[str, float]:
+    if not values:
+        return dict(DEFAULT_MIX)
+    mix = {name: 0.0 for name in JOURNEYS}
+    for value in values:
+        name, _, weight = value.partition("=")
+        if name not in JOURNEYS or not weight:
+            raise SystemExit(f"✗ Parcours invalide : {value} (attendu nom=poids parmi {', '.join(JOURNEYS)})")
+        mix[name] = float(weight)
+    return mix
+
+
+def main(args):
+    mix = parse_mix(args.mix)
+    report = {
+        "meta": {
+            **git_revision(),
+            "timestamp": datetime.now().isoformat(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "args": vars(args),
+        },
+        "targets": {}
+    }
+    
+    if args.offline:
+        for workers in args.workers:
+            print(f"\n▶ Doublure hors ligne, {workers} worker(s), {args.catalog_size} produits")
+            process, url = start_offline_server(workers, args)
+            try:
+                context = discover_context(url, OFFLINE_EMAIL, OFFLINE_PASSWORD)
+                result = run_target(url, args, effective_mix(mix, context), context, args.metrics_scrapes or 4 * workers)
+            finally:
+                stop_server(process)
+            report["targets"][str(workers)] = result
+        print_scaling(report["targets"])
+    else:
+        print(f"\n▶ {args.url}")
+        context = discover_context(args.url, args.email, args.password)
+        result = run_target(args.url, args, effective_mix(mix, context), context, args.metrics_scrapes or 4)
+        report["targets"][args.url] = result
+        saturation = result["saturation"]
+        print(f"\nSaturation : {saturation['requests_per_second']:.1f} req/s, concurrence {saturation['concurrency']} "
+              f"({saturation['reason'] or 'non atteinte, augmenter --concurrency'})")
+    
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n✓ Résultats écrits dans {args.output}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Test de charge HTTP : parcours réels de la boutique")
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument("--url", default="http://127.0.0.1:8000", help="Application déjà démarrée")
+    target.add_argument("--offline", action="store_true", help="Lancer benchmarks.offline_app (doublure en mémoire)")
+    parser.add_argument("--email", help="Compte du parcours login (--url)")
+    parser.add_argument("--password", help="Mot de passe du parcours login (--url)")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1], help="Workers uvicorn à comparer (--offline)")
+    parser.add_argument("--catalog-size", type=int, default=1000, help="Produits de la doublure (--offline)")
+    parser.add_argument("--embed-ms-per-text", type=float, default=0.0,
+                        help="Coût d'inférence simulé par texte encodé (--offline, ms)")
+    parser.add_argument("--db-latency-ms", type=float, default=0.0, help="Aller-retour Neo4j simulé (--offline, ms)")
+    parser.add_argument("--startup-timeout", type=float, default=120.0, help="Attente du serveur hors ligne (s)")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16, 64],
+                        help="Paliers d'utilisateurs virtuels simultanés")
+    parser.add_argument("--duration", type=float, default=15.0, help="Durée mesurée de chaque palier (s)")
+    parser.add_argument("--warmup", type=float, default=3.0, help="Chauffe non mesurée avant chaque palier (s)")
+    parser.add_argument("--think-time", type=float, default=0.0,
+                        help="Temps de réflexion moyen entre deux parcours (ms, loi exponentielle)")
+    parser.add_argument("--mix", nargs="+", help="Poids des parcours, ex. home=40 search=25 product=25 login=10")
+    parser.add_argument("--processes", type=int, default=1,
+                        help="Processus générateurs (un seul plafonne vers quelques milliers de req/s)")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Délai maximal d'une requête (s)")
+    parser.add_argument("--metrics-scrapes", type=int, default=0,
+                        help="Lectures de /metrics par mesure (0 = 4 par worker)")
+    parser.add_argument("--saturation-gain", type=float, default=0.1,
+                        help="Gain de débit minimal entre deux paliers avant de conclure à la saturation")
+    parser.add_argument("--slo-ms", type=float, help="p99 maximal acceptable (ms)")
+    parser.add_argument("--output", help="Fichier JSON de résultats")
+    args = parser.parse_args()
+    
+    main(args)
@@ -0,0 +1,124 @@
+"""
+Benchmark des connexions : bcrypt sur la boucle vs pool de hachage dédié
+
+Simule une rafale de connexions concurrentes (recherche de l'utilisateur
+puis vérification bcrypt) pendant que des « pages » légères sont servies
+en continu sur la même boucle d'événements. Deux modes sont comparés :
+
+- inline : verify_password appelé directement dans la coroutine (avant)
+- pool   : via PasswordHasher, le pool borné de app.auth (après)
+
+Le coût bcrypt est celui de la configuration réelle (pwd_context) ; Neo4j
+n'est pas nécessaire, la recherche de l'utilisateur est simulée.
+
+Usage :
+    python -m benchmarks.login_throughput [--logins 64] [--concurrency 32] [--workers 4]
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from typing import Dict, List
+
+from app.auth import PasswordHasher, PasswordHashingOverloaded, get_password_hash, verify_password
+
+PASSWORD = "motdepasse-de-test"
+
+
+def _percentiles(samples: List[float]) -> Dict[str, float]:
+    if not samples:
+        return {"p50_ms": 0.0, "p99_ms": 0.0, "max_ms": 0.0}
+    samples = sorted(samples)
+    return {
+        "p50_ms": statistics.median(samples),
+        "p99_ms": samples[int(0.99 * (len(samples) - 1))],
+        "max_ms": samples[-1]
+    }
+
+
+async def _page_probe(stop: asyncio.Event, interval: float, latencies: List[float]):
+    """Sert une page légère toutes les `interval` secondes et mesure son retard"""
+    while not stop.is_set():
+        scheduled = time.perf_counter()
+        await asyncio.sleep(interval)
+        # Retard = temps passé au-delà de l'intervalle prévu (boucle bloquée)
+        latencies.append(1000 * (time.perf_counter() - scheduled - interval))
+
+
+async def run_mode(
+    mode: str,
+    hasher: PasswordHasher,
+    hashed: str,
+    logins: int,
+    concurrency: int,
+    db_latency: float
+) -> Dict:
+    """Exécute une rafale de connexions dans un mode donné"""
+    login_latencies: List[float] = []
+    page_latencies: List[float] = []
+    rejected = 0
+    semaphore = asyncio.Semaphore(concurrency)
+    
+    async def login():
+        nonlocal rejected
+        async with semaphore:
+            started = time.perf_counter()
+            await asyncio.sleep(db_latency)  # Lecture de l'utilisateur dans Neo4j
+            try:
+                if mode == "inline":
+                    verify_password(PASSWORD, hashed)
+                else:
+                    await hasher.run(verify_password, PASSWORD, hashed)
+            except PasswordHashingOverloaded:
+                rejected += 1
+                return
+            login_latencies.append(1000 * (time.perf_counter() - started))
+    
+    stop = asyncio.Event()
+    probe = asyncio.create_task(_page_probe(stop, 0.005, page_latencies))
+    started = time.perf_counter()
+    await asyncio.gather(*(login() for _ in range(logins)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await probe
+    
+    return {
+        "mode": mode,
+        "logins": logins,
+        "rejected": rejected,
+        "duration_s": elapsed,
+        "logins_per_second": len(login_latencies) / elapsed if elapsed else 0.0,
+        "login": _percentiles(login_latencies),
+        "page_delay": _percentiles(page_latencies)
+    }
+
+
+async def main(args):
+    hashed = get_password_hash(PASSWORD)
+    
+    hasher = PasswordHasher(
+        workers=args.workers,
+        queue_timeout=args.queue_timeout,
+        max_waiting=args.logins
+    )
+    
+    reports = []
+    for mode in ("inline", "pool"):
+        reports.append(await run_mode(
+            mode, hasher, hashed, args.logins, args.concurrency, args.db_latency_ms / 1000
+        ))
+    reports[-1]["hasher"] = hasher.stats()
+    print(json.dumps(reports, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Débit de connexion et latence des pages, bcrypt inline vs pool")
+    parser.add_argument("--logins", type=int, default=64, help="Connexions dans la rafale")
+    parser.add_argument("--concurrency", type=int, default=32, help="Connexions simultanées")
+    parser.add_argument("--workers", type=int, default=4, help="Threads du pool de hachage")
+    parser.add_argument("--queue-timeout", type=float, default=30.0, help="Attente maximale d'une place (s)")
+    parser.add_argument("--db-latency-ms", type=float, default=2.0, help="Latence simulée de Neo4j")
+    args = parser.parse_args()
+    
+    asyncio.run(main(args))
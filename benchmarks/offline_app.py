@@ -0,0 +1,51 @@
+"""
+Application servie sur la doublure en mémoire (sans Neo4j ni modèle)
+
+À l'import, remplace neo4j_db par InMemoryNeo4j, charge un catalogue
+synthétique déterministe et un utilisateur de test, puis expose `app`
+(main.app inchangée). Chaque worker uvicorn construit la même doublure :
+identifiants des produits et de l'utilisateur identiques d'un processus
+à l'autre.
+
+Configuration par variables d'environnement :
+    BENCH_CATALOG_SIZE       Nombre de produits (1000)
+    BENCH_EMBED_MS_PER_TEXT  Coût d'inférence simulé par texte encodé (0)
+    BENCH_DB_LATENCY_MS      Aller-retour Neo4j simulé (0)
+
+Usage :
+    uvicorn benchmarks.offline_app:app --workers 4
+    python -m benchmarks.loadtest --offline --workers 1 2 4
+"""
+import os
+
+from app.auth import get_password_hash
+from app.config import settings
+from benchmarks.standins import FakeEmbeddingBackend, InMemoryNeo4j, install, new_user, synthetic_products
+
+import main
+
+# Compte utilisé par le scénario de connexion du test de charge
+EMAIL = "bench@example.com"
+PASSWORD = "motdepasse-de-test"
+USER_ID = "bench-user"
+
+CATALOG_SIZE = int(os.environ.get("BENCH_CATALOG_SIZE", "1000"))
+EMBED_MS_PER_TEXT = float(os.environ.get("BENCH_EMBED_MS_PER_TEXT", "0"))
+DB_LATENCY_MS = float(os.environ.get("BENCH_DB_LATENCY_MS", "0"))
+
+
+def build_standin() -> InMemoryNeo4j:
+    """Doublure peuplée du catalogue synthétique et de l'utilisateur de test"""
+    embedder = FakeEmbeddingBackend(settings.embedding_dimension, EMBED_MS_PER_TEXT)
+    db = InMemoryNeo4j(embedder, latency_ms=DB_LATENCY_MS)
+    db.seed_products(list(synthetic_products(CATALOG_SIZE, embedder)))
+    db.seed_user({**new_user(EMAIL, get_password_hash(PASSWORD)), "id": USER_ID})
+    return db
+
+
+# Le lifespan de main.app (préchauffage, index local) utilise la doublure
+neo4j_db = build_standin()
+install(neo4j_db)
+print(f"✓ Doublure en mémoire : {CATALOG_SIZE} produits (pid {os.getpid()})")
+
+app = main.app
@@ -0,0 +1,232 @@
+"""
+Suite de benchmarks hors ligne (sans Neo4j ni modèle d'embeddings)
+
+Remplace neo4j_db par la doublure en mémoire (benchmarks.standins) et
+mesure les services et les pages sur des catalogues synthétiques de
+tailles croissantes :
+
+- list_products (statut, catégorie), get_product
+- search_products en mode sémantique, lexical et hybride (avec filtres)
+- create_product, bulk_create_products (paquets de --bulk-size lignes)
+- authenticate_user (bcrypt réel, via le pool de hachage)
+- pages HTML : /, /recherche, /produit/{id}
+
+Les durées mesurent le code de l'application (services, modèles Pydantic,
+caches, métriques) plus le coût de la doublure, identique d'un commit à
+l'autre. Le résultat est un JSON (commit, paramètres, percentiles par
+benchmark et par taille) ; --compare affiche l'écart avec un résultat
+précédent.
+
+Usage :
+    python -m benchmarks.offline_suite [--sizes 100 1000 10000] [--output bench.json]
+    python -m benchmarks.offline_suite --sizes 1000000 --only list_products search_semantic
+    python -m benchmarks.offline_suite --compare bench-main.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import sys
+import time
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List
+
+import httpx
+
+import main
+from app.auth import get_password_hash
+from app.cache import response_cache
+from app.config import settings
+from app.models import ProductCreate, SearchQuery
+from app.services.product import product_service
+from app.services.user import user_service
+from benchmarks.reporting import git_revision, summarize
+from benchmarks.standins import (
+    CATEGORIES,
+    FakeEmbeddingBackend,
+    InMemoryNeo4j,
+    install,
+    new_user,
+    synthetic_products
+)
+
+PASSWORD = "motdepasse-de-test"
+EMAIL = "bench@example.com"
+QUERIES = ["vase", "coussins lin", "bougie parfumée", "céramique artisanale", "rotin tressé",
+           "lampe en chêne", "plaid en laine mérinos", "panier jonc de mer"]
+
+BENCHMARKS = [
+    "list_products", "list_products_category", "get_product",
+    "search_semantic", "search_semantic_filtered", "search_lexical", "search_hybrid",
+    "create_product", "bulk_create", "authenticate_user",
+    "page_home", "page_search", "page_product"
+]
+
+
+async def measure(operation: Callable[[int], Awaitable[Any]], repeats: int, warmup: int) -> Dict[str, float]:
+    """Exécute `operation(i)` séquentiellement et résume les durées"""
+    for i in range(warmup):
+        await operation(i)
+    samples = []
+    for i in range(repeats):
+        started = time.perf_counter()
+        await operation(warmup + i)
+        samples.append(time.perf_counter() - started)
+    return summarize(samples)
+
+
+def sample_product(i: int) -> Dict[str, Any]:
+    return {
+        "name": f"Vase en grès émaillé {i}",
+        "description": "Vase artisanal en grès émaillé, tourné à la main dans notre atelier.",
+        "short_description": "Vase fait main",
+        "price": 49.0,
+        "category": "Décoration",
+        "stock": 5,
+        "status": "online"
+    }
+
+
+async def prepare(size: int, args, hashed_password: str) -> InMemoryNeo4j:
+    """Crée une doublure peuplée de `size` produits et installe-la à la place de neo4j_db"""
+    embedder = FakeEmbeddingBackend(settings.embedding_dimension, args.embed_ms_per_text)
+    db = InMemoryNeo4j(embedder, latency_ms=args.db_latency_ms)
+    db.seed_products(list(synthetic_products(size, embedder)))
+    db.seed_user(new_user(EMAIL, hashed_password))
+    
+    install(db)
+    await db.warmup_async()
+    
+    # Aucun état ne doit survivre d'une taille à l'autre
+    user_service.user_cache.clear()
+    await response_cache.invalidate()
+    await product_service.store.load()
+    if settings.vector_search_engine == "local":
+        await product_service.load_local_index()
+    return db
+
+
+async def run_size(size: int, args, hashed_password: str) -> Dict[str, Dict[str, float]]:
+    """Exécute les benchmarks sélectionnés sur un catalogue de `size` produits"""
+    started = time.perf_counter()
+    db = await prepare(size, args, hashed_password)
+    print(f"✓ Catalogue de {size} produits prêt ({time.perf_counter() - started:.1f} s)")
+    
+    product_ids = list(db.products)
+    transport = httpx.ASGITransport(app=main.app)
+    client = httpx.AsyncClient(transport=transport, base_url="http://bench")
+    
+    def search(mode: str, **filters):
+        async def operation(i: int):
+            query = SearchQuery(query=QUERIES[i % len(QUERIES)], mode=mode, top_k=10, **filters)
+            await product_service.search_products(query)
+        return operation
+    
+    async def bulk_create(i: int):
+        rows = ((line, sample_product(i * args.bulk_size + line)) for line in range(args.bulk_size))
+        report = await product_service.bulk_create_products(rows, chunk_size=args.bulk_size)
+        assert report.failed == 0, report.errors[:3]
+    
+    async def authenticate(i: int):
+        assert await user_service.authenticate_user(EMAIL, PASSWORD) is not None
+    
+    async def page(path: str):
+        response = await client.get(path)
+        assert response.status_code == 200, (path, response.status_code)
+    
+    operations: Dict[str, Callable[[int], Awaitable[Any]]] = {
+        "list_products": lambda i: product_service.list_products(status="online", limit=20),
+        "list_products_category": lambda i: product_service.list_products(
+            category=CATEGORIES[i % len(CATEGORIES)], status="online", limit=20
+        ),
+        "get_product": lambda i: product_service.get_product(product_ids[(i * 7919) % len(product_ids)]),
+        "search_semantic": search("semantic"),
+        "search_semantic_filtered": search("semantic", category="Textile", max_price=60.0),
+        "search_lexical": search("lexical"),
+        "search_hybrid": search("hybrid"),
+        "create_product": lambda i: product_service.create_product(ProductCreate(**sample_product(i))),
+        "bulk_create": bulk_create,
+        "authenticate_user": authenticate,
+        "page_home": lambda i: page("/"),
+        "page_search": lambda i: page("/recherche?q=vase"),
+        "page_product": lambda i: page(f"/produit/{product_ids[i % len(product_ids)]}"),
+    }
+    repeats = {"bulk_create": args.bulk_repeats, "authenticate_user": args.auth_repeats}
+    
+    results = {}
+    try:
+        for name in args.only or BENCHMARKS:
+            runs = repeats.get(name, args.repeats)
+            results[name] = await measure(operations[name], runs, warmup=min(args.warmup, runs))
+            if name == "bulk_create":
+                results[name]["rows_per_second"] = args.bulk_size * results[name]["ops_per_second"]
+            print(f"  {name:<26} p50 {results[name]['p50_ms']:9.3f} ms   p99 {results[name]['p99_ms']:9.3f} ms")
+    finally:
+        await client.aclose()
+        await db.close_async()
+    return results
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any]):
+    """Affiche le rapport des médianes (courant / référence) par taille et benchmark"""
+    print(f"\nComparaison avec {baseline['meta'].get('commit')} (ratio des p50, < 1 = plus rapide)")
+    for size, benchmarks in current["results"].items():
+        reference = baseline["results"].get(size, {})
+        for name, stats in benchmarks.items():
+            if name in reference and reference[name]["p50_ms"]:
+                ratio = stats["p50_ms"] / reference[name]["p50_ms"]
+                marker = "✓" if ratio <= 1.05 else "✗"
+                print(f"{marker} {size:>8} {name:<26} {reference[name]['p50_ms']:9.3f} → {stats['p50_ms']:9.3f} ms  ×{ratio:.2f}")
+
+
+async def run(args):
+    hashed_password = get_password_hash(PASSWORD)
+    report = {
+        "meta": {
+            **git_revision(),
+            "timestamp": datetime.now().isoformat(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "embedding_dimension": settings.embedding_dimension,
+            "vector_search_engine": settings.vector_search_engine,
+            "response_cache_ttl": settings.response_cache_ttl,
+            "args": vars(args),
+        },
+        "results": {}
+    }
+    
+    for size in args.sizes:
+        report["results"][str(size)] = await run_size(size, args, hashed_password)
+    
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n✓ Résultats écrits dans {args.output}")
+    else:
+        print(json.dumps(report, indent=2))
+    
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            compare(report, json.load(f))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmarks des services et des pages, sans Neo4j ni modèle")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000],
+                        help="Tailles de catalogue (jusqu'à 1000000)")
+    parser.add_argument("--only", nargs="+", choices=BENCHMARKS, help="Benchmarks à exécuter")
+    parser.add_argument("--repeats", type=int, default=50, help="Mesures par benchmark")
+    parser.add_argument("--warmup", type=int, default=5, help="Exécutions non mesurées avant chaque benchmark")
+    parser.add_argument("--bulk-size", type=int, default=500, help="Produits par appel à bulk_create_products")
+    parser.add_argument("--bulk-repeats", type=int, default=5, help="Mesures de bulk_create")
+    parser.add_argument("--auth-repeats", type=int, default=5, help="Mesures de authenticate_user (bcrypt)")
+    parser.add_argument("--embed-ms-per-text", type=float, default=0.0,
+                        help="Coût d'inférence simulé par texte encodé (ms)")
+    parser.add_argument("--db-latency-ms", type=float, default=0.0, help="Aller-retour Neo4j simulé (ms)")
+    parser.add_argument("--output", help="Fichier JSON de résultats")
+    parser.add_argument("--compare", help="Résultat de référence (JSON) à comparer")
+    args = parser.parse_args()
+    
+    asyncio.run(run(args))
@@ -0,0 +1,42 @@
+"""
+Outils communs aux benchmarks : percentiles et révision git des résultats
+"""
+import statistics
+import subprocess
+from typing import Any, Dict, List
+
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    """Statistiques d'une série de durées (secondes) en millisecondes"""
+    ordered = sorted(1000 * sample for sample in samples)
+    if not ordered:
+        return {"runs": 0, "mean_ms": 0.0, "p50_ms": 0.0, "p95_ms": 0.0, "p99_ms": 0.0,
+                "min_ms": 0.0, "ops_per_second": 0.0}
+    
+    def percentile(p: float) -> float:
+        return ordered[min(len(ordered) - 1, int(round(p * (len(ordered) - 1))))]
+    
+    mean = statistics.fmean(ordered)
+    return {
+        "runs": len(ordered),
+        "mean_ms": mean,
+        "p50_ms": percentile(0.50),
+        "p95_ms": percentile(0.95),
+        "p99_ms": percentile(0.99),
+        "min_ms": ordered[0],
+        "ops_per_second": 1000 / mean if mean else 0.0,
+    }
+
+
+def git_revision() -> Dict[str, Any]:
+    """Commit courant (et modifications non commitées) pour comparer les résultats"""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+        dirty = bool(subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"], capture_output=True, text=True
+        ).stdout.strip())
+        return {"commit": commit, "dirty": dirty}
+    except (OSError, subprocess.CalledProcessError):
+        return {"commit": None, "dirty": None}
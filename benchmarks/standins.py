@@ -0,0 +1,639 @@
+"""
+Doublures hors ligne pour les benchmarks : Neo4j en mémoire et embedder factice
+
+- FakeEmbeddingBackend : embeddings déterministes par hachage des mots
+  (des textes partageant des mots ont des vecteurs proches), avec un coût
+  d'inférence simulé optionnel
+- InMemoryNeo4j : Neo4jConnection dont l'exécution des requêtes est
+  remplacée par des fonctions Python choisies d'après le nom de la requête
+  (`name=`). Tout le reste du code (services, micro-batcher, cache des
+  embeddings, métriques, traces, boucle de sur-échantillonnage de la
+  recherche vectorielle) s'exécute tel quel.
+
+Seules les requêtes émises par les services sont simulées : une requête
+inconnue lève NotImplementedError, ce qui signale une doublure à compléter
+quand un service en ajoute une.
+
+Mémoire : environ 4 × EMBEDDING_DIMENSION octets par produit pour les
+vecteurs (1,5 Go pour 1M produits en dimension 384) ; définir par exemple
+EMBEDDING_DIMENSION=64 pour les plus grands catalogues.
+"""
+import asyncio
+import bisect
+import itertools
+import math
+import random
+import re
+import sys
+import time
+import uuid
+import zlib
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from app.config import settings
+from app.database import Neo4jConnection
+from app.embeddings.backends import EmbeddingBackend
+from app.models import PRODUCT_SEARCH_FIELDS
+from app.query_log import slow_query_log
+
+TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+NOUNS = ["vase", "bougie", "coussin", "plaid", "lampe", "miroir", "panier", "tasse",
+         "corbeille", "diffuseur", "assiette", "nappe", "rideau", "tapis", "cadre"]
+MATERIALS = ["céramique", "lin", "laine mérinos", "bois massif", "rotin", "grès",
+             "jonc de mer", "verre recyclé", "coton", "chêne", "cire de soja"]
+ADJECTIVES = ["artisanal", "naturel", "fait main", "tressé", "émaillé", "provençal",
+              "bohème", "intemporel", "doux", "parfumé", "unique"]
+CATEGORIES = ["Décoration", "Textile", "Luminaires", "Vaisselle"]
+STATUSES = ["online", "online", "online", "draft", "out-of-stock"]
+
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN_RE.findall(text.lower())
+
+
+class FakeEmbeddingBackend(EmbeddingBackend):
+    """Embeddings déterministes par hachage des mots (aucun modèle à télécharger)"""
+    
+    name = "fake"
+    
+    def __init__(self, dimension: int, cost_per_text_ms: float = 0.0):
+        """
+        Args:
+            dimension: Dimension des vecteurs
+            cost_per_text_ms: Durée d'inférence simulée par texte (sleep, libère le GIL comme torch)
+        """
+        self._dimension = dimension
+        self.cost_per_text = cost_per_text_ms / 1000
+    
+    @property
+    def dimension(self) -> int:
+        return self._dimension
+    
+    def encode(self, texts: List[str]) -> np.ndarray:
+        if self.cost_per_text:
+            time.sleep(self.cost_per_text * len(texts))
+        
+        vectors = np.zeros((len(texts), self._dimension), dtype=np.float32)
+        for i, text in enumerate(texts):
+            for token in tokenize(text):
+                h = zlib.crc32(token.encode("utf-8"))
+                vectors[i, h % self._dimension] += 1.0 if h & 0x10000 else -1.0
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return vectors / norms
+
+
+def projected_fields(query: str, alias: str) -> Optional[List[str]]:
+    """Propriétés d'une projection Cypher `alias {.a, .b}` (None si le nœud est renvoyé entier)"""
+    match = re.search(rf"\b{alias} \{{([^}}]*)\}}", query)
+    if not match:
+        return None
+    return re.findall(r"\.(\w+)", match.group(1))
+
+
+def project(node: Dict[str, Any], fields: Optional[List[str]]) -> Dict[str, Any]:
+    """Projection Cypher : propriétés absentes = None"""
+    if fields is None:
+        return dict(node)
+    return {field: node.get(field) for field in fields}
+
+
+def matches_filters(product: Dict[str, Any], params: Dict[str, Any]) -> bool:
+    """Filtres de recherche construits par Neo4jProductStore._search_filters"""
+    if "category" in params and product.get("category") != params["category"]:
+        return False
+    if "status" in params and product.get("status") != params["status"]:
+        return False
+    price = product.get("price")
+    if "min_price" in params and (price is None or price < params["min_price"]):
+        return False
+    if "max_price" in params and (price is None or price > params["max_price"]):
+        return False
+    return True
+
+
+class InMemoryNeo4j(Neo4jConnection):
+    """Neo4jConnection simulée en mémoire, requêtes aiguillées par nom"""
+    
+    def __init__(self, embedder: EmbeddingBackend, latency_ms: float = 0.0):
+        """
+        Args:
+            embedder: Backend d'embeddings (FakeEmbeddingBackend en pratique)
+            latency_ms: Aller-retour réseau simulé par requête asynchrone
+        """
+        super().__init__()
+        self._embedding_backend = embedder
+        self.latency = latency_ms / 1000
+        self.dimension = embedder.dimension
+        
+        # Produits : propriétés (sans l'embedding), ligne de la matrice des vecteurs
+        self.products: Dict[str, Dict[str, Any]] = {}
+        self._order: List[Tuple[str, str]] = []  # (created_at, id), croissant
+        self._rows: Dict[str, int] = {}
+        self._row_ids: List[Optional[str]] = []
+        self._vectors = np.zeros((1024, self.dimension), dtype=np.float32)
+        self._has_vector = np.zeros(1024, dtype=bool)
+        self._tokens: Dict[str, Tuple[str, ...]] = {}
+        self._postings: Dict[str, List[int]] = {}
+        self._posting_arrays: Dict[str, np.ndarray] = {}
+        
+        # Utilisateurs et refresh tokens
+        self.users: Dict[str, Dict[str, Any]] = {}
+        self._users_by_email: Dict[str, str] = {}
+        self.tokens: Dict[str, Dict[str, Any]] = {}
+        
+        self._handlers: Dict[str, Callable[[str, Dict[str, Any]], List[Dict[str, Any]]]] = {
+            "product.load_local_index": self._product_load_local_index,
+            "product.create": self._product_create,
+            "product.bulk_create": self._product_bulk_create,
+            "product.get": self._product_get,
+            "product.updated_at": self._product_updated_at,
+            "product.update": self._product_update,
+            "product.delete": self._product_delete,
+            "product.list": self._product_list,
+            "product.list_signature": self._product_list_signature,
+            "product.by_ids": self._product_by_ids,
+            "product.load_catalogue": self._product_load_catalogue,
+            "product.vector_search": self._product_vector_search,
+            "product.fulltext_search": self._product_fulltext_search,
+            "product.embedding_sources": self._product_embedding_sources,
+            "product.write_embeddings": self._product_write_embeddings,
+            "user.create": self._user_create,
+            "user.by_email": self._user_by_email,
+            "user.by_id": self._user_by_id,
+            "user.cached_by_email": self._user_by_email,
+            "user.update": self._user_update,
+            "user.delete": self._user_delete,
+            "refresh_token.issue": self._token_issue,
+            "refresh_token.rotate": self._token_rotate,
+            "refresh_token.revoke": self._token_revoke,
+            "refresh_token.revoke_family": self._token_revoke_family,
+            "refresh_token.revoke_all": self._token_revoke_all,
+        }
+    
+    # Substitution de Neo4jConnection
+    
+    def _handle(self, query: str, parameters: Optional[Dict[str, Any]], name: str) -> List[Dict[str, Any]]:
+        handler = self._handlers.get(name)
+        if handler is None:
+            raise NotImplementedError(f"Requête non simulée par la doublure: {name}")
+        return handler(query, parameters or {})
+    
+    def _run_query(self, query: str, parameters: Optional[Dict[str, Any]], name: str) -> List[Dict[str, Any]]:
+        return self._handle(query, parameters, name)
+    
+    async def _run_query_async(
+        self,
+        query: str,
+        parameters: Optional[Dict[str, Any]],
+        name: str
+    ) -> List[Dict[str, Any]]:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return self._handle(query, parameters, name)
+    
+    def _profile_query(self, name: str, query: str, parameters: Optional[Dict[str, Any]]):
+        slow_query_log.store_profile(name, query, None, error="PROFILE indisponible sur la doublure")
+    
+    async def _profile_query_async(self, name: str, query: str, parameters: Optional[Dict[str, Any]]):
+        self._profile_query(name, query, parameters)
+    
+    async def verify_connection_async(self) -> bool:
+        self.db_ready = True
+        return True
+    
+    async def warmup_async(self, retry_delay: float = 2.0):
+        self.db_ready = True
+        self.embedding_batcher.start()
+    
+    def close(self):
+        self.embedding_batcher.stop()
+    
+    async def close_async(self):
+        await asyncio.to_thread(self.embedding_batcher.stop)
+    
+    # Stockage des produits
+    
+    def _ensure_capacity(self, rows: int):
+        if rows <= len(self._vectors):
+            return
+        capacity = max(rows, 2 * len(self._vectors))
+        vectors = np.zeros((capacity, self.dimension), dtype=np.float32)
+        vectors[:len(self._vectors)] = self._vectors
+        has_vector = np.zeros(capacity, dtype=bool)
+        has_vector[:len(self._has_vector)] = self._has_vector
+        self._vectors, self._has_vector = vectors, has_vector
+    
+    def _index_terms(self, product_id: str, row: int):
+        product = self.products[product_id]
+        text = " ".join(str(product.get(field) or "") for field in PRODUCT_SEARCH_FIELDS)
+        tokens = tuple(dict.fromkeys(tokenize(text)))
+        previous = self._tokens.get(product_id, ())
+        for token in set(previous) - set(tokens):
+            self._postings[token].remove(row)
+            self._posting_arrays.pop(token, None)
+        for token in set(tokens) - set(previous):
+            self._postings.setdefault(token, []).append(row)
+            self._posting_arrays.pop(token, None)
+        self._tokens[product_id] = tokens
+    
+    def _set_vector(self, product_id: str, vector: Iterable[float]):
+        row = self._rows[product_id]
+        self._vectors[row] = np.asarray(vector, dtype=np.float32)
+        self._has_vector[row] = True
+    
+    def _put_product(self, props: Dict[str, Any], sort: bool = True):
+        props = dict(props)
+        vector = props.pop("embedding", None)
+        product_id = props["id"]
+        
+        if product_id in self.products:
+            self._remove_product(product_id)
+        
+        row = len(self._row_ids)
+        self._ensure_capacity(row + 1)
+        self._row_ids.append(product_id)
+        self._rows[product_id] = row
+        self.products[product_id] = props
+        if sort:
+            bisect.insort(self._order, (props["created_at"], product_id))
+        else:
+            self._order.append((props["created_at"], product_id))
+        self._index_terms(product_id, row)
+        if vector is not None:
+            self._set_vector(product_id, vector)
+    
+    def _remove_product(self, product_id: str):
+        product = self.products.pop(product_id)
+        row = self._rows.pop(product_id)
+        for token in self._tokens.pop(product_id, ()):
+            self._postings[token].remove(row)
+            self._posting_arrays.pop(token, None)
+        self._row_ids[row] = None
+        self._has_vector[row] = False
+        index = bisect.bisect_left(self._order, (product["created_at"], product_id))
+        del self._order[index]
+    
+    def seed_products(self, products: List[Dict[str, Any]]):
+        """Charge un catalogue (avec embeddings) en une fois, sans tri intermédiaire"""
+        self._ensure_capacity(len(self._row_ids) + len(products))
+        for product in products:
+            self._put_product(product, sort=False)
+        self._order.sort()
+    
+    def seed_user(self, user: Dict[str, Any]):
+        self.users[user["id"]] = dict(user)
+        self._users_by_email[user["email"]] = user["id"]
+    
+    # Requêtes des produits
+    
+    def _product_load_local_index(self, query, params):
+        return [
+            {
+                "id": product_id,
+                "embedding": self._vectors[self._rows[product_id]].tolist(),
+                "category": product.get("category"),
+                "status": product.get("status"),
+                "price": product.get("price")
+            }
+            for product_id, product in self.products.items()
+            if self._has_vector[self._rows[product_id]]
+        ]
+    
+    def _product_load_catalogue(self, query, params):
+        fields = projected_fields(query, "p")
+        return [
+            {"p": project(product, fields), "embedding_hash": product.get("embedding_hash")}
+            for product in itertools.islice(self.products.values(), params["limit"])
+        ]
+    
+    def _product_create(self, query, params):
+        self._put_product(params["props"])
+        return [{"id": params["props"]["id"]}]
+    
+    def _product_bulk_create(self, query, params):
+        for row in params["rows"]:
+            self._put_product(row)
+        return [{"created": len(params["rows"])}]
+    
+    def _product_get(self, query, params):
+        product = self.products.get(params["product_id"])
+        if product is None:
+            return []
+        return [{"p": project(product, projected_fields(query, "p"))}]
+    
+    def _product_updated_at(self, query, params):
+        product = self.products.get(params["product_id"])
+        return [{"updated_at": product["updated_at"]}] if product else []
+    
+    def _product_update(self, query, params):
+        product = self.products.get(params["product_id"])
+        if product is None:
+            return []
+        product.update(params["props"])
+        self._index_terms(product["id"], self._rows[product["id"]])
+        return [{
+            "p": project(product, projected_fields(query, "p")),
+            "embedding_hash": product.get("embedding_hash")
+        }]
+    
+    def _product_delete(self, query, params):
+        if params["product_id"] not in self.products:
+            return [{"deleted": 0}]
+        self._remove_product(params["product_id"])
+        return [{"deleted": 1}]
+    
+    def _product_list(self, query, params):
+        fields = projected_fields(query, "p")
+        if "cursor_created_at" in params:
+            end = bisect.bisect_left(self._order, (params["cursor_created_at"], params["cursor_id"]))
+        else:
+            end = len(self._order)
+        
+        skip, limit = params.get("skip", 0), params["limit"]
+        rows = []
+        for index in range(end - 1, -1, -1):
+            created_at, product_id = self._order[index]
+            product = self.products[product_id]
+            if "category" in params and product.get("category") != params["category"]:
+                continue
+            if "status" in params and product.get("status") != params["status"]:
+                continue
+            if skip:
+                skip -= 1
+                continue
+            rows.append({"p": project(product, fields), "cursor_created_at": created_at, "cursor_id": product_id})
+            if len(rows) >= limit:
+                break
+        return rows
+    
+    def _product_list_signature(self, query, params):
+        products = [
+            product for product in self.products.values()
+            if ("category" not in params or product.get("category") == params["category"])
+            and ("status" not in params or product.get("status") == params["status"])
+        ]
+        stamps = [product["updated_at"] for product in products if product.get("updated_at") is not None]
+        return [{"total": len(products), "updated_at": max(stamps, default=None)}]
+    
+    def _product_by_ids(self, query, params):
+        fields = projected_fields(query, "p")
+        return [
+            {"p": project(self.products[product_id], fields)}
+            for product_id in params["ids"]
+            if product_id in self.products
+        ]
+    
+    def _product_vector_search(self, query, params):
+        """Index vectoriel exact : `candidates` voisins, puis filtres et min_score (comme Cypher)"""
+        rows = len(self._row_ids)
+        if not rows:
+            return [{"candidate_count": 0, "lowest_score": None, "matches": []}]
+        
+        query_vector = np.asarray(params["query_embedding"], dtype=np.float32)
+        # Score Neo4j pour la similarité cosinus : (1 + cos) / 2
+        scores = (1.0 + self._vectors[:rows] @ query_vector) / 2.0
+        scores[~self._has_vector[:rows]] = -np.inf
+        
+        available = int(self._has_vector[:rows].sum())
+        count = min(params["candidates"], available)
+        if count == 0:
+            return [{"candidate_count": 0, "lowest_score": None, "matches": []}]
+        top = np.argpartition(-scores, count - 1)[:count]
+        top = top[np.argsort(-scores[top])]
+        
+        fields = projected_fields(query, "node")
+        matches = []
+        for row in top:
+            score = float(scores[row])
+            product = self.products[self._row_ids[row]]
+            if score >= params["min_score"] and matches_filters(product, params):
+                matches.append({"node": project(product, fields), "score": score})
+                if len(matches) >= params["top_k"]:
+                    break
+        
+        return [{"candidate_count": count, "lowest_score": float(scores[top[-1]]), "matches": matches}]
+    
+    def _posting_array(self, token: str) -> Optional[np.ndarray]:
+        array = self._posting_arrays.get(token)
+        if array is None and token in self._postings:
+            array = self._posting_arrays[token] = np.asarray(self._postings[token], dtype=np.int64)
+        return array
+    
+    def _product_fulltext_search(self, query, params):
+        """Plein texte approché : somme des IDF des mots trouvés, filtres au fil du classement"""
+        terms = tokenize(params["search_terms"].replace("\\", ""))
+        rows = len(self._row_ids)
+        if not terms or not rows:
+            return []
+        
+        scores = np.zeros(rows, dtype=np.float32)
+        total = max(1, len(self.products))
+        for term in dict.fromkeys(terms):
+            postings = self._posting_array(term)
+            if postings is not None and len(postings):
+                scores[postings] += math.log(1 + total / len(postings))
+        
+        hits = np.flatnonzero(scores)
+        hits = hits[np.argsort(-scores[hits], kind="stable")]
+        
+        fields = projected_fields(query, "node")
+        results = []
+        for row in hits:
+            product = self.products[self._row_ids[row]]
+            if matches_filters(product, params):
+                results.append({"node": project(product, fields), "score": float(scores[row])})
+                if len(results) >= params["top_k"]:
+                    break
+        return results
+    
+    def _product_embedding_sources(self, query, params):
+        fields = ("id", "name", "description", "short_description", "category", "status", "price",
+                  "embedding_hash", "embedding_model")
+        return [
+            {field: self.products[product_id].get(field) for field in fields}
+            for product_id in params["ids"]
+            if product_id in self.products
+        ]
+    
+    def _product_write_embeddings(self, query, params):
+        written = []
+        for row in params["rows"]:
+            product = self.products.get(row["id"])
+            if product is None:
+                continue
+            if [product.get(field) or "" for field in params["source_fields"]] != row["source"]:
+                continue
+            self._set_vector(row["id"], row["embedding"])
+            product["embedding_model"] = row["embedding_model"]
+            product["embedding_hash"] = row["embedding_hash"]
+            written.append({"id": row["id"]})
+        return written
+    
+    # Requêtes des utilisateurs et des refresh tokens
+    
+    def _user_create(self, query, params):
+        self.seed_user(params)
+        return [{"u": dict(params)}]
+    
+    def _user_by_email(self, query, params):
+        user_id = self._users_by_email.get(params["email"])
+        if user_id is None:
+            return []
+        return [{"u": project(self.users[user_id], projected_fields(query, "u"))}]
+    
+    def _user_by_id(self, query, params):
+        user = self.users.get(params["id"])
+        return [{"u": dict(user)}] if user else []
+    
+    def _user_update(self, query, params):
+        user = self.users.get(params["id"])
+        if user is None:
+            return []
+        previous_email = user["email"]
+        user.update({key: value for key, value in params.items() if key != "id"})
+        if user["email"] != previous_email:
+            del self._users_by_email[previous_email]
+            self._users_by_email[user["email"]] = user["id"]
+        return [{"u": dict(user), "previous_email": previous_email}]
+    
+    def _user_delete(self, query, params):
+        user = self.users.pop(params["id"], None)
+        if user is None:
+            return []
+        del self._users_by_email[user["email"]]
+        for token_hash in [h for h, t in self.tokens.items() if t["user_id"] == user["id"]]:
+            del self.tokens[token_hash]
+        return [{"email": user["email"]}]
+    
+    def _token_issue(self, query, params):
+        if params["user_id"] not in self.users:
+            return []
+        self._delete_families(
+            lambda t: t["connected"] and t["user_id"] == params["user_id"] and t["expires_at"] <= params["now"]
+        )
+        self.tokens[params["props"]["token_hash"]] = {**params["props"], "user_id": params["user_id"], "connected": True}
+        return [{"id": params["props"]["id"]}]
+    
+    def _token_rotate(self, query, params):
+        token = self.tokens.get(params["token_hash"])
+        if token is None:
+            return []
+        rotated = token.get("revoked_at") is None and token["connected"] and token["expires_at"] > params["now"]
+        row = {
+            "rotated": rotated,
+            "revoked_at": token.get("revoked_at"),
+            "expires_at": token["expires_at"],
+            "family_id": token["family_id"],
+            "u": None
+        }
+        if rotated:
+            # L'ancien token devient une pierre tombale détachée de l'utilisateur
+            token.update(revoked_at=params["now"], replaced_by=params["props"]["id"], connected=False)
+            self.tokens[params["props"]["token_hash"]] = {
+                **params["props"],
+                "family_id": token["family_id"],
+                "user_id": token["user_id"],
+                "connected": True
+            }
+            row["u"] = project(self.users[token["user_id"]], projected_fields(query, "u"))
+        return [row]
+    
+    def _token_revoke(self, query, params):
+        token = self.tokens.get(params["token_hash"])
+        return [{"family_id": token["family_id"]}] if token else []
+    
+    def _token_revoke_family(self, query, params):
+        self._delete_tokens(lambda t: t["family_id"] == params["family_id"])
+        return []
+    
+    def _token_revoke_all(self, query, params):
+        self._delete_families(lambda t: t["connected"] and t["user_id"] == params["user_id"])
+        return []
+    
+    def _delete_families(self, predicate):
+        families = {t["family_id"] for t in self.tokens.values() if predicate(t)}
+        self._delete_tokens(lambda t: t["family_id"] in families)
+    
+    def _delete_tokens(self, predicate):
+        for token_hash in [h for h, t in self.tokens.items() if predicate(t)]:
+            del self.tokens[token_hash]
+
+
+def synthetic_products(size: int, embedder: EmbeddingBackend, seed: int = 42, batch_size: int = 10000):
+    """
+    Génère un catalogue synthétique déterministe, embeddings compris
+    
+    Yields:
+        Produits (propriétés Neo4j, avec `embedding` sous forme de tableau NumPy)
+    """
+    rng = random.Random(seed)
+    start = datetime(2024, 1, 1)
+    for offset in range(0, size, batch_size):
+        batch = []
+        for i in range(offset, min(offset + batch_size, size)):
+            noun, material, adjective = rng.choice(NOUNS), rng.choice(MATERIALS), rng.choice(ADJECTIVES)
+            created_at = (start + timedelta(seconds=i)).isoformat()
+            batch.append({
+                "id": f"bench-{i:07d}",
+                "name": f"{noun.capitalize()} en {material} {adjective}",
+                "short_description": f"{noun.capitalize()} {adjective}",
+                "description": " ".join(
+                    f"{rng.choice(NOUNS)} {rng.choice(MATERIALS)} {rng.choice(ADJECTIVES)}."
+                    for _ in range(4)
+                ),
+                "category": rng.choice(CATEGORIES),
+                "status": rng.choice(STATUSES),
+                "price": round(rng.uniform(5, 250), 2),
+                "stock": rng.randint(0, 50),
+                "main_image": f"/static/images/products/{noun}.jpg",
+                "additional_images": [],
+                "created_at": created_at,
+                "updated_at": created_at,
+                "embedding_model": settings.embedding_model,
+            })
+        texts = [" ".join(p.get(field) or "" for field in ("name", "description", "category", "short_description"))
+                 for p in batch]
+        vectors = embedder.encode(texts)
+        for product, vector in zip(batch, vectors):
+            product["embedding"] = vector
+            yield product
+
+
+def install(standin: InMemoryNeo4j) -> Neo4jConnection:
+    """
+    Remplace l'instance globale neo4j_db dans tous les modules déjà importés
+    
+    À appeler après l'import des modules concernés (services, routes, main).
+    
+    Returns:
+        Instance d'origine
+    """
+    import app.database
+    
+    original = app.database.neo4j_db
+    for module in list(sys.modules.values()):
+        if getattr(module, "neo4j_db", None) is original:
+            module.neo4j_db = standin
+    return original
+
+
+def new_user(email: str, hashed_password: str, is_admin: bool = False) -> Dict[str, Any]:
+    """Propriétés d'un nœud User prêt à charger dans la doublure"""
+    now = datetime.now().isoformat()
+    return {
+        "id": str(uuid.uuid4()),
+        "email": email,
+        "first_name": "Bench",
+        "last_name": "Mark",
+        "phone": None,
+        "hashed_password": hashed_password,
+        "is_active": True,
+        "is_admin": is_admin,
+        "created_at": now,
+        "updated_at": now
+    }
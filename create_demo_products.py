@@ -9,7 +9,6 @@ from pathlib import Path
 # Ajouter le répertoire parent au path
 sys.path.insert(0, str(Path(__file__).parent))
 
-from app.models.product import ProductCreate
 from app.services.product import product_service
 
 
@@ -125,15 +124,12 @@ async def create_demo_products():
     
     print("🌟 Création des produits de démonstration...\n")
     
-    for i, product_data in enumerate(products, 1):
-        try:
-            product = ProductCreate(**product_data)
-            created = await product_service.create_product(product)
-            print(f"✅ {i}. {created.name} - {created.price}€ (ID: {created.id})")
-        except Exception as e:
-            print(f"❌ Erreur lors de la création de '{product_data['name']}': {e}")
+    # Validation, embeddings et écriture par paquets
+    report = await product_service.bulk_create_products(enumerate(products, 1))
+    for error in report.errors:
+        print(f"❌ Erreur lors de la création de '{products[error.line - 1]['name']}': {error.error}")
     
-    print(f"\n🎉 {len(products)} produits ont été créés avec succès!")
+    print(f"\n🎉 {report.created} produits ont été créés avec succès!")
     print("\n📍 Vous pouvez maintenant:")
     print("   - Voir les produits sur http://localhost:8000/admin/produits")
     print("   - Voir la page d'accueil sur http://localhost:8000/")
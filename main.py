@@ -1,10 +1,49 @@
-from fastapi import FastAPI
+import asyncio
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
 from fastapi.staticfiles import StaticFiles
 from contextlib import asynccontextmanager
 
 # Import des routes
 from app.routes import api_router, pages_router
+from app.auth import PasswordHashingOverloaded
+from app.cache import response_cache
+from app.config import settings
 from app.database import neo4j_db
+from app.metrics import EventLoopMonitor, MetricsMiddleware
+from app.tracing import TracingMiddleware
+from app.services.product import product_service
+
+# Retard de la boucle d'événements, exposé par /metrics
+event_loop_monitor = EventLoopMonitor(settings.event_loop_monitor_interval_ms / 1000)
+
+
+async def warm_up(retry_delay: float = 5.0, max_delay: float = 60.0):
+    """
+    Prépare Neo4j, le modèle d'embeddings, le catalogue en mémoire et l'index vectoriel local
+    
+    Un échec (téléchargement du modèle, création d'index...) est journalisé
+    et exposé par /readyz, puis la préparation est relancée avec un délai
+    croissant : les étapes déjà faites sont sans effet au nouvel essai.
+    """
+    delay = retry_delay
+    while True:
+        try:
+            await neo4j_db.warmup_async()
+            await product_service.store.load()
+            
+            if settings.vector_search_engine == "local":
+                await product_service.load_local_index()
+        except Exception as e:
+            neo4j_db.warmup_error = f"{type(e).__name__}: {e}"
+            print(f"✗ Préparation de l'application échouée: {neo4j_db.warmup_error} (nouvel essai dans {delay:g}s)")
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, max_delay)
+            continue
+        
+        neo4j_db.warmup_error = None
+        print("✓ Application prête")
+        return
 
 
 @asynccontextmanager
@@ -12,15 +51,21 @@ async def lifespan(app: FastAPI):
     """Gestion du cycle de vie de l'application"""
     # Startup
     print("🚀 Démarrage de l'application...")
-    print("✓ Connexion à Neo4j établie")
     
-    # Créer les index utilisateurs
-    neo4j_db.create_user_indexes()
+    # Connexion Neo4j, index et modèle d'embeddings préparés en arrière-plan :
+    # les pages sans recherche sont servies immédiatement (voir /readyz)
+    warmup_task = asyncio.create_task(warm_up())
+    product_service.embedding_refresh.start()
+    event_loop_monitor.start()
     
     yield
     # Shutdown
     print("🛑 Arrêt de l'application...")
-    neo4j_db.close()
+    warmup_task.cancel()
+    await event_loop_monitor.stop()
+    await product_service.embedding_refresh.stop()
+    await response_cache.backend.close()
+    await neo4j_db.close_async()
 
 
 app = FastAPI(
@@ -30,6 +75,20 @@ app = FastAPI(
     lifespan=lifespan
 )
 
+@app.exception_handler(PasswordHashingOverloaded)
+async def password_hashing_overloaded_handler(request: Request, exc: PasswordHashingOverloaded):
+    """Pool de hachage saturé : le client peut réessayer un peu plus tard"""
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Service d'authentification surchargé, réessayez dans un instant"},
+        headers={"Retry-After": "1"}
+    )
+
+# Traces des requêtes échantillonnées (TRACING_SAMPLE_RATE)
+app.add_middleware(TracingMiddleware)
+# Durée des requêtes par route (exposée par /metrics)
+app.add_middleware(MetricsMiddleware)
+
 # Monter les fichiers statiques
 app.mount("/static", StaticFiles(directory="static"), name="static")
 
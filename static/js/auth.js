@@ -7,6 +7,7 @@
 const AUTH_CONFIG = {
   TOKEN_KEY: "maison_manoe_token",
   TOKEN_TYPE_KEY: "maison_manoe_token_type",
+  REFRESH_TOKEN_KEY: "maison_manoe_refresh_token",
   USER_KEY: "maison_manoe_user",
   API_BASE_URL: window.location.origin,
 };
@@ -27,6 +28,14 @@ function getTokenType() {
   return localStorage.getItem(AUTH_CONFIG.TOKEN_TYPE_KEY) || sessionStorage.getItem(AUTH_CONFIG.TOKEN_TYPE_KEY) || "bearer";
 }
 
+/**
+ * Récupère le refresh token
+ * @returns {string|null} Le refresh token ou null
+ */
+function getRefreshToken() {
+  return localStorage.getItem(AUTH_CONFIG.REFRESH_TOKEN_KEY) || sessionStorage.getItem(AUTH_CONFIG.REFRESH_TOKEN_KEY);
+}
+
 /**
  * Récupère les informations de l'utilisateur connecté
  * @returns {Object|null} Les données utilisateur ou null
@@ -49,11 +58,15 @@ function isAuthenticated() {
  * @param {string} token - Le token JWT
  * @param {Object} user - Les données utilisateur
  * @param {boolean} remember - Si true, utilise localStorage, sinon sessionStorage
+ * @param {string|null} refreshToken - Le refresh token (optionnel)
  */
-function setAuth(token, user, remember = false) {
+function setAuth(token, user, remember = false, refreshToken = null) {
   const storage = remember ? localStorage : sessionStorage;
   storage.setItem(AUTH_CONFIG.TOKEN_KEY, token);
   storage.setItem(AUTH_CONFIG.TOKEN_TYPE_KEY, "bearer");
+  if (refreshToken) {
+    storage.setItem(AUTH_CONFIG.REFRESH_TOKEN_KEY, refreshToken);
+  }
   if (user) {
     storage.setItem(AUTH_CONFIG.USER_KEY, JSON.stringify(user));
   }
@@ -65,17 +78,70 @@ function setAuth(token, user, remember = false) {
 function clearAuth() {
   localStorage.removeItem(AUTH_CONFIG.TOKEN_KEY);
   localStorage.removeItem(AUTH_CONFIG.TOKEN_TYPE_KEY);
+  localStorage.removeItem(AUTH_CONFIG.REFRESH_TOKEN_KEY);
   localStorage.removeItem(AUTH_CONFIG.USER_KEY);
   sessionStorage.removeItem(AUTH_CONFIG.TOKEN_KEY);
   sessionStorage.removeItem(AUTH_CONFIG.TOKEN_TYPE_KEY);
+  sessionStorage.removeItem(AUTH_CONFIG.REFRESH_TOKEN_KEY);
   sessionStorage.removeItem(AUTH_CONFIG.USER_KEY);
 }
 
+// Renouvellement en cours, partagé par les requêtes concurrentes
+let refreshPromise = null;
+
+/**
+ * Renouvelle l'access token avec le refresh token (sans mot de passe)
+ * @returns {Promise<boolean>} True si un nouveau token a été obtenu
+ */
+async function refreshAccessToken() {
+  const refreshToken = getRefreshToken();
+  if (!refreshToken) {
+    return false;
+  }
+
+  if (!refreshPromise) {
+    refreshPromise = (async () => {
+      const response = await fetch(`${AUTH_CONFIG.API_BASE_URL}/api/auth/refresh`, {
+        method: "POST",
+        headers: {
+          "Content-Type": "application/json",
+        },
+        body: JSON.stringify({ refresh_token: refreshToken }),
+      });
+
+      if (!response.ok) {
+        return false;
+      }
+
+      const tokenData = await response.json();
+      const remember = !!localStorage.getItem(AUTH_CONFIG.REFRESH_TOKEN_KEY);
+      setAuth(tokenData.access_token, null, remember, tokenData.refresh_token);
+      return true;
+    })().finally(() => {
+      refreshPromise = null;
+    });
+  }
+
+  return refreshPromise;
+}
+
 /**
  * Déconnecte l'utilisateur et redirige vers la page de connexion
  * @param {string} returnUrl - URL de retour après connexion
  */
 function logout(returnUrl = null) {
+  const refreshToken = getRefreshToken();
+  if (refreshToken) {
+    // Fermer la session côté serveur (sans attendre la réponse)
+    fetch(`${AUTH_CONFIG.API_BASE_URL}/api/auth/logout`, {
+      method: "POST",
+      headers: {
+        "Content-Type": "application/json",
+      },
+      body: JSON.stringify({ refresh_token: refreshToken }),
+      keepalive: true,
+    });
+  }
   clearAuth();
   const url = returnUrl ? `/connexion?return=${encodeURIComponent(returnUrl)}` : "/connexion";
   window.location.href = url;
@@ -87,7 +153,7 @@ function logout(returnUrl = null) {
  * @param {Object} options - Options fetch (method, body, etc.)
  * @returns {Promise<Response>} La réponse de l'API
  */
-async function authenticatedFetch(endpoint, options = {}) {
+async function authenticatedFetch(endpoint, options = {}, retry = true) {
   const token = getAuthToken();
 
   if (!token) {
@@ -99,16 +165,23 @@ async function authenticatedFetch(endpoint, options = {}) {
     Authorization: `Bearer ${token}`,
   };
 
-  if (options.body && typeof options.body === "object") {
+  let body = options.body;
+  if (body && typeof body === "object") {
     headers["Content-Type"] = "application/json";
-    options.body = JSON.stringify(options.body);
+    body = JSON.stringify(body);
   }
 
   const response = await fetch(`${AUTH_CONFIG.API_BASE_URL}${endpoint}`, {
     ...options,
+    body,
     headers,
   });
 
+  // Token expiré : renouvellement via le refresh token, puis nouvel essai
+  if (response.status === 401 && retry && (await refreshAccessToken())) {
+    return authenticatedFetch(endpoint, options, false);
+  }
+
   // Si le token est expiré ou invalide
   if (response.status === 401) {
     clearAuth();
@@ -239,7 +312,7 @@ async function login(email, password, remember = false) {
   const user = profileResponse.ok ? await profileResponse.json() : null;
 
   // 3. Stocker les données
-  setAuth(tokenData.access_token, user, remember);
+  setAuth(tokenData.access_token, user, remember, tokenData.refresh_token);
 
   return { token: tokenData, user };
 }
@@ -249,12 +322,14 @@ if (typeof window !== "undefined") {
   window.MaisonManoeAuth = {
     getAuthToken,
     getTokenType,
+    getRefreshToken,
     getCurrentUser,
     isAuthenticated,
     setAuth,
     clearAuth,
     logout,
     authenticatedFetch,
+    refreshAccessToken,
     fetchUserProfile,
     requireAuth,
     updateAuthUI,